@@ -3,39 +3,55 @@ Chat API - AI 질문응답
 """
 import json
 import logging
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from contextlib import aclosing
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.database import get_db
 from app.schemas.chat import (
     ChatSessionCreate, ChatSessionResponse,
-    ChatMessageResponse, AskRequest, AskResponse,
+    ChatMessageResponse, ChatMessageSourcesResponse, AskRequest, AskResponse,
 )
 from app.models.document import ChatSession, ChatMessage
 from app.models.user import User
 from app.core.deps import get_current_user
 from app.services.rag_service import ask_question, ask_question_stream
+from app.services.stream_service import (
+    AnswerStream, start_answer_stream, get_answer_stream, cancel_answer_stream, parse_last_event_id,
+)
+from app.services.generation_queue import (
+    GenerationTicket, QueueRejected, get_scheduler, release_after,
+)
+from app.services.history_cache import get_history_cache, notify_session_changed
 from app.services.llm_service import OllamaConnectionError, OllamaModelError
+from app.rag.scope import SearchScope
+from app.core.deadline import request_deadline
+from app.core.pagination import finish_page, keyset_page
+from app.config import get_settings
 
 logger = logging.getLogger("baikal.chat")
+settings = get_settings()
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
 
 @router.get("/sessions", response_model=List[ChatSessionResponse])
 async def list_sessions(
+    response: Response,
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (X-Next-Cursor 헤더 값)"),
+    limit: int = Query(50, ge=1, le=200),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """채팅 세션 목록"""
+    """채팅 세션 목록 (최신순, 커서 페이지)"""
+    query = select(ChatSession.id, ChatSession.title, ChatSession.created_at).where(
+        ChatSession.user_id == current_user.id
+    )
     result = await db.execute(
-        select(ChatSession)
-        .where(ChatSession.user_id == current_user.id)
-        .order_by(ChatSession.created_at.desc())
+        keyset_page(query, ChatSession.created_at, ChatSession.id, cursor, limit)
     )
-    sessions = result.scalars().all()
-    return sessions
+    return finish_page(result.all(), limit, response)
 
 
 @router.post("/sessions", response_model=ChatSessionResponse, status_code=201)
@@ -58,13 +74,17 @@ async def create_session(
 @router.get("/sessions/{session_id}/messages", response_model=List[ChatMessageResponse])
 async def get_messages(
     session_id: str,
+    response: Response,
+    before: Optional[str] = Query(None, description="이전 메시지 페이지 커서 (X-Next-Cursor 헤더 값)"),
+    limit: int = Query(50, ge=1, le=200),
+    include_sources: bool = Query(False, description="답변 출처(sources) 포함 여부"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """세션 메시지 목록"""
+    """세션 메시지 목록 (최근 메시지부터 커서 페이지, 페이지 안에서는 시간순)"""
     # 세션 소유자 확인
     result = await db.execute(
-        select(ChatSession).where(
+        select(ChatSession.id).where(
             ChatSession.id == session_id,
             ChatSession.user_id == current_user.id,
         )
@@ -72,19 +92,61 @@ async def get_messages(
     if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
 
+    # sources(JSON)는 요청할 때만 조회 - 평소에는 존재 여부만 (NULL 검사는 TOAST 값을 읽지 않음)
+    columns = [
+        ChatMessage.id, ChatMessage.session_id, ChatMessage.role, ChatMessage.content,
+        ChatMessage.interrupted, ChatMessage.created_at,
+        ChatMessage.sources.isnot(None).label("has_sources"),
+    ]
+    if include_sources:
+        columns.append(ChatMessage.sources)
+    query = select(*columns).where(ChatMessage.session_id == session_id)
+    result = await db.execute(
+        keyset_page(query, ChatMessage.created_at, ChatMessage.id, before, limit)
+    )
+    return list(reversed(finish_page(result.all(), limit, response)))
+
+
+@router.get(
+    "/sessions/{session_id}/messages/{message_id}/sources",
+    response_model=ChatMessageSourcesResponse,
+)
+async def get_message_sources(
+    session_id: str,
+    message_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """메시지 하나의 답변 출처 (목록은 sources 없이 조회하고, 출처를 펼칠 때 호출)"""
     result = await db.execute(
-        select(ChatMessage)
-        .where(ChatMessage.session_id == session_id)
-        .order_by(ChatMessage.created_at.asc())
+        select(ChatMessage.id, ChatMessage.sources)
+        .join(ChatSession, ChatSession.id == ChatMessage.session_id)
+        .where(
+            ChatMessage.id == message_id,
+            ChatMessage.session_id == session_id,
+            ChatSession.user_id == current_user.id,
+        )
     )
-    messages = result.scalars().all()
-    return messages
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="메시지를 찾을 수 없습니다")
+    return row
+
+
+def _admit(user: User) -> GenerationTicket:
+    """생성 대기열 입장 (사용자/전체 대기 한도 초과 시 429 + Retry-After)"""
+    try:
+        return get_scheduler().admit(user.id)
+    except QueueRejected as e:
+        logger.warning(f"생성 대기열 거절: user={user.id} ({e})")
+        raise HTTPException(
+            status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)}
+        )
 
 
 @router.post("/ask", response_model=AskResponse)
 async def ask(
     request: AskRequest,
-    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """AI 질문응답 (RAG)"""
@@ -92,13 +154,17 @@ async def ask(
         raise HTTPException(status_code=400, detail="질문을 입력해주세요")
 
     try:
-        result = await ask_question(
-            question=request.question,
-            session_id=request.session_id,
-            user_id=current_user.id,
-            db=db,
-        )
+        with _admit(current_user) as ticket, request_deadline(settings.ASK_DEADLINE):
+            result = await ask_question(
+                question=request.question,
+                session_id=request.session_id,
+                user_id=current_user.id,
+                scope=SearchScope.for_user(current_user, request.document_ids),
+                ticket=ticket,
+            )
         return result
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except OllamaConnectionError as e:
@@ -110,34 +176,88 @@ async def ask(
         raise HTTPException(status_code=500, detail="AI 답변 생성 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.")
 
 
+def _sse_response(stream: AnswerStream, after_seq: int, http_request: Request) -> StreamingResponse:
+    """답변 스트림 구독 SSE 응답 (이벤트 id = `{stream_id}:{seq}`)
+
+    클라이언트 연결이 끊기면 구독만 해제합니다. 재연결 유예 시간 안에
+    다시 구독하지 않으면 스트림이 Ollama 생성을 취소합니다.
+    """
+    async def event_generator():
+        events = stream.subscribe(after_seq)
+        async with aclosing(events):
+            async for seq, event in events:
+                if await http_request.is_disconnected():
+                    logger.info(f"SSE 클라이언트 연결 끊김: stream={stream.stream_id}")
+                    break
+                yield (
+                    f"id: {stream.stream_id}:{seq}\n"
+                    f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+                )
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/ask/stream")
 async def ask_stream(
     request: AskRequest,
-    db: AsyncSession = Depends(get_db),
+    http_request: Request,
     current_user: User = Depends(get_current_user),
 ):
-    """AI 질문응답 스트리밍 (SSE)"""
+    """AI 질문응답 스트리밍 (SSE)
+
+    요청 세션(get_db)을 스트림에 넘기지 않습니다. 스트림은 조회/저장 시에만
+    짧은 세션을 열어, 토큰 생성 중에는 커넥션 풀을 점유하지 않습니다.
+    첫 이벤트로 stream_id를 보내며, 연결이 끊기면 GET /ask/stream/{stream_id}로 이어받습니다.
+    """
     if not request.question.strip():
         raise HTTPException(status_code=400, detail="질문을 입력해주세요")
 
-    async def event_generator():
-        try:
-            async for event in ask_question_stream(
+    ticket = _admit(current_user)
+    # 생성 태스크가 컨텍스트를 복사하므로 기한은 연결이 아닌 생성 전체에 적용됩니다
+    with request_deadline(settings.ASK_STREAM_DEADLINE):
+        stream = start_answer_stream(
+            current_user.id,
+            release_after(ticket, ask_question_stream(
                 question=request.question,
                 session_id=request.session_id,
                 user_id=current_user.id,
-                db=db,
-            ):
-                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
-        except Exception as e:
-            error_data = {"type": "error", "content": str(e)}
-            yield f"data: {json.dumps(error_data, ensure_ascii=False)}\n\n"
+                scope=SearchScope.for_user(current_user, request.document_ids),
+                ticket=ticket,
+            )),
+        )
+    return _sse_response(stream, 0, http_request)
 
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
-    )
+
+@router.get("/ask/stream/{stream_id}")
+async def resume_stream(
+    stream_id: str,
+    http_request: Request,
+    last_event_id: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user),
+):
+    """끊긴 답변 스트림 재연결 (Last-Event-ID 이후 이벤트부터 재전송)"""
+    stream = get_answer_stream(stream_id, current_user.id)
+    if stream is None:
+        raise HTTPException(status_code=404, detail="스트림을 찾을 수 없거나 만료되었습니다")
+
+    last_stream_id, after_seq = parse_last_event_id(last_event_id)
+    if last_stream_id not in (None, stream_id):
+        after_seq = 0
+    return _sse_response(stream, after_seq, http_request)
+
+
+@router.delete("/ask/stream/{stream_id}", status_code=204)
+async def cancel_stream(
+    stream_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    """답변 생성 중지 (재연결 유예 없이 즉시 취소, 부분 답변은 중단 표시로 저장)"""
+    if not cancel_answer_stream(stream_id, current_user.id):
+        raise HTTPException(status_code=404, detail="스트림을 찾을 수 없거나 만료되었습니다")
 
 
 @router.delete("/sessions/{session_id}", status_code=204)
@@ -158,4 +278,6 @@ async def delete_session(
         raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
 
     await db.delete(session)
+    await notify_session_changed(db, session_id)
     await db.commit()
+    get_history_cache().invalidate(session_id)
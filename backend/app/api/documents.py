@@ -2,49 +2,87 @@
 Documents API - 문서 관리
 """
 import asyncio
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, BackgroundTasks
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks, Query, Response
 from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select
 from app.database import get_db
 from app.schemas.document import DocumentResponse, DocumentStatusResponse
 from app.models.document import Document
 from app.models.user import User
 from app.core.deps import get_current_user, require_admin
+from app.core.pagination import (
+    TOTAL_COUNT_HEADER, TOTAL_ESTIMATED_HEADER, count_rows, finish_page, keyset_page,
+)
 from app.services.document_service import save_uploaded_file, process_document_async, delete_document
 
 router = APIRouter(prefix="/api/documents", tags=["documents"])
 
 
+# 목록 응답 컬럼만 조회 (filepath, 대표 벡터 등 제외)
+_LIST_COLUMNS = (
+    Document.id, Document.filename, Document.file_type, Document.file_size, Document.status,
+    Document.uploaded_by, Document.visibility, Document.error_message, Document.created_at,
+)
+
+
 @router.get("", response_model=List[DocumentResponse])
 async def list_documents(
+    response: Response,
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (X-Next-Cursor 헤더 값)"),
+    limit: int = Query(50, ge=1, le=500),
+    status: Optional[str] = Query(None, description="처리 상태: uploading, processing, completed, failed"),
+    file_type: Optional[str] = Query(None, description="파일 형식: pdf, docx, xlsx ..."),
+    uploaded_by: Optional[str] = Query(None, description="업로더 ID (관리자만)"),
+    filename_prefix: Optional[str] = Query(None, description="파일명 접두어 (대소문자 무시)"),
+    include_total: bool = Query(False, description="X-Total-Count 헤더로 전체 건수 반환 (큰 값은 추정치)"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """문서 목록 조회"""
-    if current_user.role == "admin":
-        result = await db.execute(select(Document).order_by(Document.created_at.desc()))
-    else:
-        result = await db.execute(
-            select(Document)
-            .where(Document.uploaded_by == current_user.id)
-            .order_by(Document.created_at.desc())
-        )
-    documents = result.scalars().all()
-    return documents
+    """문서 목록 조회 (최신순, 커서 페이지 + 필터)
+
+    일반 사용자는 본인 업로드 문서만 조회합니다.
+    """
+    query = select(*_LIST_COLUMNS)
+    if current_user.role != "admin":
+        query = query.where(Document.uploaded_by == current_user.id)
+    elif uploaded_by:
+        query = query.where(Document.uploaded_by == uploaded_by)
+    if status:
+        query = query.where(Document.status == status)
+    if file_type:
+        query = query.where(Document.file_type == file_type.lower())
+    if filename_prefix:
+        # lower(filename) text_pattern_ops 인덱스를 쓰는 접두어 LIKE
+        pattern = filename_prefix.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        query = query.where(func.lower(Document.filename).like(f"{pattern}%", escape="\\"))
+
+    if include_total:
+        total, estimated = await count_rows(db, query)
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
+        if estimated:
+            response.headers[TOTAL_ESTIMATED_HEADER] = "true"
+    result = await db.execute(
+        keyset_page(query, Document.created_at, Document.id, cursor, limit)
+    )
+    return finish_page(result.all(), limit, response)
 
 
 @router.post("/upload", response_model=DocumentResponse, status_code=201)
 async def upload_document(
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
+    visibility: str = Form("public", description="공개 범위: public, department, private"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """문서 업로드 (비동기 처리)"""
     try:
-        doc = await save_uploaded_file(file, current_user.id, db)
+        doc = await save_uploaded_file(
+            file, current_user.id, db,
+            visibility=visibility, department=current_user.department,
+        )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
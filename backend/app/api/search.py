@@ -1,15 +1,17 @@
 """
 Search API - 문서 검색
 """
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
 from app.schemas.document import SearchResult
 from app.models.user import User
 from app.core.deps import get_current_user
 from app.services.rag_service import search_documents
+from app.rag.scope import SearchScope
+from app.core.deadline import request_deadline
+from app.config import get_settings
 
+settings = get_settings()
 router = APIRouter(prefix="/api/search", tags=["search"])
 
 
@@ -17,11 +19,14 @@ router = APIRouter(prefix="/api/search", tags=["search"])
 async def search(
     q: str = Query(..., min_length=1, description="검색어"),
     mode: str = Query("hybrid", description="검색 모드: keyword, vector, hybrid"),
-    db: AsyncSession = Depends(get_db),
-    _user: User = Depends(get_current_user),
+    document_ids: Optional[List[str]] = Query(None, description="검색 대상 문서 ID (생략 시 전체)"),
+    current_user: User = Depends(get_current_user),
 ):
-    """문서 검색 (키워드 + 벡터 하이브리드)"""
+    """문서 검색 (키워드 + 벡터 하이브리드, 열람 가능한 문서만)"""
     if mode not in ("keyword", "vector", "hybrid"):
         mode = "hybrid"
-    results = await search_documents(q, db, mode=mode)
+    with request_deadline(settings.SEARCH_DEADLINE):
+        results = await search_documents(
+            q, mode=mode, scope=SearchScope.for_user(current_user, document_ids)
+        )
     return results
@@ -0,0 +1,93 @@
+"""
+Request Deadline - 요청 단위 처리 기한
+
+엔드포인트에서 기한을 설정하면 contextvar로 하위 단계(임베딩, 벡터 검색, LLM)에
+전파됩니다. asyncio.gather / create_task로 만든 태스크도 컨텍스트를 복사하므로 같은
+기한을 봅니다. 각 단계는 고정 타임아웃 대신 남은 시간으로 줄인 타임아웃을 사용합니다.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import text as sql_text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+MIN_STAGE_TIMEOUT = 0.05  # 남은 시간이 이보다 작으면 기한 초과로 처리 (초)
+QUERY_CANCELED = "57014"  # statement_timeout으로 취소된 쿼리의 SQLSTATE
+
+
+class DeadlineExceeded(Exception):
+    """요청 처리 기한 초과"""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        super().__init__(f"요청 처리 기한 초과 ({stage})")
+
+
+class Deadline:
+    def __init__(self, seconds: float):
+        self.budget = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() < MIN_STAGE_TIMEOUT
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("request_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+@contextmanager
+def request_deadline(seconds: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """블록(및 블록 안에서 만든 태스크)에 처리 기한 설정 (None/0 이하는 기한 없음)"""
+    deadline = Deadline(seconds) if seconds and seconds > 0 else None
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def deadline_expired() -> bool:
+    deadline = current_deadline()
+    return deadline is not None and deadline.expired
+
+
+def check_deadline(stage: str) -> None:
+    """기한이 지났으면 DeadlineExceeded"""
+    if deadline_expired():
+        raise DeadlineExceeded(stage)
+
+
+def stage_timeout(stage: str, default: float) -> float:
+    """단계 타임아웃 = min(단계 기본값, 남은 기한). 기한이 지났으면 DeadlineExceeded"""
+    deadline = current_deadline()
+    if deadline is None:
+        return default
+    check_deadline(stage)
+    return min(default, deadline.remaining())
+
+
+async def apply_statement_timeout(db: AsyncSession, stage: str = "search") -> None:
+    """현재 트랜잭션에 남은 기한만큼 Postgres statement_timeout 적용 (SET LOCAL)"""
+    deadline = current_deadline()
+    if deadline is None:
+        return
+    check_deadline(stage)
+    await db.execute(
+        sql_text("SELECT set_config('statement_timeout', :timeout, true)"),
+        {"timeout": str(max(int(deadline.remaining() * 1000), 1))},
+    )
+
+
+def is_statement_timeout(exc: BaseException) -> bool:
+    """apply_statement_timeout()의 statement_timeout으로 취소된 쿼리 오류인지"""
+    return getattr(getattr(exc, "orig", None), "sqlstate", None) == QUERY_CANCELED
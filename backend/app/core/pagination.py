@@ -0,0 +1,88 @@
+"""
+Keyset Pagination - (created_at, id) 커서 기반 페이지 조회
+
+OFFSET 대신 마지막 행의 (created_at, id)를 커서로 넘겨, 페이지가 깊어져도
+(정렬 키, id) 복합 인덱스에서 바로 이어서 읽습니다. 다음 페이지 커서는
+응답 본문 대신 X-Next-Cursor 헤더로 전달해 기존 목록 응답 형식을 유지합니다.
+전체 건수가 필요하면 X-Total-Count 헤더로 보냅니다. 먼저 플래너 추정치를 보고
+EXACT_COUNT_LIMIT 이하일 때만 정확히 세며, 추정치를 보낼 때는 X-Total-Count-Estimated 헤더로 표시합니다.
+"""
+import json
+import base64
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+from fastapi import Response
+from sqlalchemy import Select, func, literal_column, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_ESTIMATED_HEADER = "X-Total-Count-Estimated"
+EXACT_COUNT_LIMIT = 10000  # 추정치가 이 이하일 때만 COUNT(*)로 정확히 셈 (이 행 수까지만 스캔)
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """커서 해석 (형식이 잘못되면 ValueError → 400)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), row_id
+    except Exception:
+        raise ValueError("잘못된 페이지 커서입니다")
+
+
+def keyset_page(query: Select, created_col, id_col, cursor: Optional[str], limit: int) -> Select:
+    """최신순 (created_at DESC, id DESC) 으로 커서 이후 limit+1행 조회 (다음 페이지 존재 확인용 1행 추가)"""
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(created_col, id_col) < tuple_(created_at, row_id))
+    return query.order_by(created_col.desc(), id_col.desc()).limit(limit + 1)
+
+
+def finish_page(rows: Sequence, limit: int, response: Response) -> list:
+    """limit+1행 결과를 페이지로 자르고, 다음 페이지가 있으면 커서 헤더 설정"""
+    page = list(rows[:limit])
+    if len(rows) > limit:
+        last = page[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+    return page
+
+
+async def estimate_count(db: AsyncSession, query: Select) -> int:
+    """조건에 맞는 행 수 추정 (플래너 통계 기반, 실제 스캔 없음)
+
+    필터 값은 SQL에 인라인하지 않고 바인드 파라미터로 전달해 EXPLAIN 합니다.
+    """
+    conn = await db.connection()
+    compiled = query.compile(dialect=conn.dialect)
+    params = compiled.construct_params()
+    result = await conn.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}",
+        tuple(params[name] for name in compiled.positiontup),
+    )
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_rows(db: AsyncSession, query: Select) -> Tuple[int, bool]:
+    """(건수, 추정치 여부) - 플래너 추정치가 작을 때만 정확히 셈
+
+    통계가 오래되어 추정치가 작게 나와도 EXACT_COUNT_LIMIT 행까지만 스캔합니다.
+    """
+    estimated = await estimate_count(db, query)
+    if estimated > EXACT_COUNT_LIMIT:
+        return estimated, True
+    capped = query.with_only_columns(literal_column("1"), maintain_column_froms=True)
+    capped = capped.limit(EXACT_COUNT_LIMIT).subquery()
+    exact = (await db.execute(select(func.count()).select_from(capped))).scalar()
+    if exact < EXACT_COUNT_LIMIT:
+        return exact, False
+    return max(estimated, exact), True
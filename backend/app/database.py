@@ -2,6 +2,8 @@
 BAIKAL Private AI - Database Configuration
 """
 import logging
+from pgvector.asyncpg import register_vector
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from app.config import get_settings
@@ -16,8 +18,23 @@ engine = create_async_engine(
     max_overflow=10,
     pool_pre_ping=True,  # 연결 유효성 사전 체크
     pool_recycle=3600,    # 1시간마다 연결 재활용
+    connect_args={
+        # 동일 SQL은 연결별로 한 번만 prepare (검색 쿼리 파싱/계획 재사용)
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    },
 )
 
+
+@event.listens_for(engine.sync_engine, "connect")
+def _register_vector_codec(dbapi_connection, connection_record):
+    """연결마다 pgvector 바이너리 코덱 등록 (벡터를 문자열 대신 바이너리로 송수신)"""
+    try:
+        dbapi_connection.run_async(register_vector)
+    except ValueError:
+        # vector 확장 생성 전 (최초 init_db) - init_db 후 풀을 비워 재연결 시 등록
+        logger.info("pgvector 타입 없음 - 코덱 등록 생략")
+
+
 async_session = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -41,6 +58,63 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+def chunk_partition_tables() -> list[str]:
+    """document_chunks 해시 파티션 테이블 이름 (CHUNK_PARTITIONS=0 이면 빈 리스트)"""
+    return [f"document_chunks_p{i}" for i in range(settings.CHUNK_PARTITIONS)]
+
+
+async def _partition_document_chunks(conn) -> None:
+    """document_chunks를 document_id 해시 파티션 테이블로 전환 (최초 1회)
+
+    HNSW 등 인덱스는 이후 부모 테이블에 생성하면 파티션별 로컬 인덱스로 만들어지므로,
+    파티션 단위로 REINDEX / VACUUM 해도 다른 파티션의 적재는 막히지 않습니다.
+    """
+    from sqlalchemy import text
+    partitions = settings.CHUNK_PARTITIONS
+    relkind = (await conn.execute(text(
+        "SELECT relkind FROM pg_class WHERE oid = 'document_chunks'::regclass"
+    ))).scalar()
+    if relkind == "p":
+        existing = (await conn.execute(text(
+            "SELECT count(*) FROM pg_inherits WHERE inhparent = 'document_chunks'::regclass"
+        ))).scalar()
+        if existing != partitions:
+            logger.warning(
+                f"document_chunks 파티션 수({existing})가 CHUNK_PARTITIONS({partitions})와 다릅니다 "
+                "(재분할은 수동 작업 필요)"
+            )
+        return
+
+    logger.info(f"document_chunks 해시 파티션 전환 중 ({partitions}개)...")
+    # 파티션 테이블의 PK는 파티션 키를 포함해야 하므로 chunk_terms의 FK는 제거
+    # (posting은 unindex_document에서 직접 삭제)
+    fk_names = (await conn.execute(text("""
+        SELECT conname FROM pg_constraint
+        WHERE conrelid = 'chunk_terms'::regclass AND contype = 'f'
+    """))).scalars().all()
+    for name in fk_names:
+        await conn.execute(text(f'ALTER TABLE chunk_terms DROP CONSTRAINT "{name}"'))
+
+    await conn.execute(text("ALTER TABLE document_chunks RENAME TO document_chunks_unpartitioned"))
+    await conn.execute(text("""
+        CREATE TABLE document_chunks (
+            LIKE document_chunks_unpartitioned INCLUDING DEFAULTS,
+            PRIMARY KEY (id, document_id),
+            FOREIGN KEY (document_id) REFERENCES documents (id) ON DELETE CASCADE
+        ) PARTITION BY HASH (document_id)
+    """))
+    for i, table in enumerate(chunk_partition_tables()):
+        await conn.execute(text(f"""
+            CREATE TABLE {table} PARTITION OF document_chunks
+            FOR VALUES WITH (MODULUS {partitions}, REMAINDER {i})
+        """))
+    await conn.execute(text(
+        "INSERT INTO document_chunks SELECT * FROM document_chunks_unpartitioned"
+    ))
+    await conn.execute(text("DROP TABLE document_chunks_unpartitioned"))
+    logger.info("document_chunks 해시 파티션 전환 완료")
+
+
 async def init_db():
     """DB 초기화: 테이블 생성 + pgvector 확장 + 인덱스"""
     from sqlalchemy import text
@@ -49,34 +123,206 @@ async def init_db():
         await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
         logger.info("pgvector 확장 활성화")
 
+        # pg_trgm 확장 (키워드 검색용 trigram 인덱스)
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
         # 테이블 생성
         await conn.run_sync(Base.metadata.create_all)
         logger.info("테이블 생성 완료")
 
+        # 기존 테이블 컬럼 보강 (create_all은 신규 컬럼을 추가하지 않음)
+        await conn.execute(text("""
+            ALTER TABLE document_chunks ADD COLUMN IF NOT EXISTS token_count INTEGER
+        """))
+        await conn.execute(text("""
+            ALTER TABLE document_chunks ADD COLUMN IF NOT EXISTS term_freqs JSON
+        """))
+        await conn.execute(text("""
+            ALTER TABLE document_chunks
+            ADD COLUMN IF NOT EXISTS searchable BOOLEAN NOT NULL DEFAULT true,
+            ADD COLUMN IF NOT EXISTS owner_id VARCHAR(36)
+        """))
+        # 문서 공개 범위 (부서 / 공개 여부)
+        await conn.execute(text("""
+            ALTER TABLE users ADD COLUMN IF NOT EXISTS department VARCHAR(100)
+        """))
+        await conn.execute(text("""
+            ALTER TABLE documents
+            ADD COLUMN IF NOT EXISTS visibility VARCHAR(20) NOT NULL DEFAULT 'public',
+            ADD COLUMN IF NOT EXISTS department VARCHAR(100)
+        """))
+        await conn.execute(text("""
+            ALTER TABLE document_chunks
+            ADD COLUMN IF NOT EXISTS visibility VARCHAR(20) NOT NULL DEFAULT 'public',
+            ADD COLUMN IF NOT EXISTS department VARCHAR(100)
+        """))
+        await conn.execute(text("""
+            ALTER TABLE chat_messages
+            ADD COLUMN IF NOT EXISTS interrupted BOOLEAN NOT NULL DEFAULT false
+        """))
+        # 롤링 대화 요약
+        await conn.execute(text("""
+            ALTER TABLE chat_sessions
+            ADD COLUMN IF NOT EXISTS summary TEXT,
+            ADD COLUMN IF NOT EXISTS summarized_until TIMESTAMPTZ
+        """))
+        # 문서 대표 벡터 (coarse-to-fine 검색)
+        await conn.execute(text(f"""
+            ALTER TABLE documents
+            ADD COLUMN IF NOT EXISTS embedding vector({settings.EMBEDDING_DIMENSION})
+        """))
+        # 비정규화 컬럼 백필 (컬럼 도입 이전 청크)
+        await conn.execute(text("""
+            UPDATE document_chunks dc
+            SET searchable = (d.status = 'completed'), owner_id = d.uploaded_by,
+                visibility = d.visibility, department = d.department
+            FROM documents d
+            WHERE d.id = dc.document_id AND dc.owner_id IS NULL
+        """))
+
+        # 문서 대표 벡터 백필 (청크 임베딩 평균)
+        await conn.execute(text("""
+            UPDATE documents d
+            SET embedding = c.embedding
+            FROM (
+                SELECT document_id, avg(embedding) AS embedding
+                FROM document_chunks
+                WHERE embedding IS NOT NULL
+                GROUP BY document_id
+            ) c
+            WHERE c.document_id = d.id AND d.embedding IS NULL AND d.status = 'completed'
+        """))
+
+        # BM25 코퍼스 통계 행
+        await conn.execute(text("""
+            INSERT INTO lexical_stats (id, chunk_count, total_tokens)
+            VALUES (1, 0, 0)
+            ON CONFLICT (id) DO NOTHING
+        """))
+
+        # 해시 파티션 전환 (CHUNK_PARTITIONS > 0, 인덱스 생성 전에 수행)
+        if settings.CHUNK_PARTITIONS > 0:
+            await _partition_document_chunks(conn)
+
         # Vector 검색 인덱스 (HNSW - 데이터 없이도 생성 가능, 높은 정확도)
+        # 검색 가능 청크만 담는 부분 인덱스로, 필터 때문에 LIMIT보다 적게 반환되지 않음
         await conn.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_chunk_embedding 
-            ON document_chunks 
+            CREATE INDEX IF NOT EXISTS idx_chunk_embedding_searchable
+            ON document_chunks
             USING hnsw (embedding vector_cosine_ops)
             WITH (m = 16, ef_construction = 64)
+            WHERE searchable
+        """))
+        await conn.execute(text("DROP INDEX IF EXISTS idx_chunk_embedding"))
+
+        await conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_documents_embedding
+            ON documents
+            USING hnsw (embedding vector_cosine_ops)
+            WITH (m = 16, ef_construction = 64)
+            WHERE status = 'completed'
+        """))
+
+        # 범위 필터 인덱스 (작은 범위는 이 인덱스로 찾은 뒤 정확 거리 계산)
+        await conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_chunks_document
+            ON document_chunks (document_id)
+        """))
+        await conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_chunks_owner
+            ON document_chunks (owner_id)
+            WHERE searchable
+        """))
+        await conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_chunks_department
+            ON document_chunks (department)
+            WHERE searchable AND visibility = 'department'
         """))
 
-        # 추가 인덱스
+        # 문서 목록 커서 페이지 (필터 + 최신순을 정렬 없이 인덱스 순서로 읽음)
+        await conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_documents_created
+            ON documents (created_at, id)
+        """))
+        await conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_documents_status_created
+            ON documents (status, created_at, id)
+        """))
+        await conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_documents_uploaded_by_created
+            ON documents (uploaded_by, created_at, id)
+        """))
+        await conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_documents_file_type_created
+            ON documents (file_type, created_at, id)
+        """))
         await conn.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_documents_status 
-            ON documents (status)
+            CREATE INDEX IF NOT EXISTS idx_documents_filename_prefix
+            ON documents (lower(filename) text_pattern_ops)
         """))
+        # 복합 인덱스가 앞 컬럼 조회를 대신하므로 단일 컬럼 인덱스 제거
+        await conn.execute(text("DROP INDEX IF EXISTS idx_documents_status"))
+        await conn.execute(text("DROP INDEX IF EXISTS idx_documents_uploaded_by"))
+        # 키워드 검색 (ILIKE + 유사도 정렬) trigram GIN 인덱스
         await conn.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_documents_uploaded_by 
-            ON documents (uploaded_by)
+            CREATE INDEX IF NOT EXISTS idx_chunk_content_trgm
+            ON document_chunks
+            USING gin (content gin_trgm_ops)
         """))
         await conn.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_chat_sessions_user 
-            ON chat_sessions (user_id)
+            CREATE INDEX IF NOT EXISTS idx_documents_filename_trgm
+            ON documents
+            USING gin (filename gin_trgm_ops)
         """))
+        # 세션/메시지 커서 페이지 + 히스토리 조회 (정렬 없이 인덱스 순서로 읽음)
         await conn.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_chat_messages_session 
-            ON chat_messages (session_id)
+            CREATE INDEX IF NOT EXISTS idx_chat_sessions_user_created
+            ON chat_sessions (user_id, created_at, id)
         """))
+        await conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_chat_messages_session_created
+            ON chat_messages (session_id, created_at, id)
+        """))
+        # 복합 인덱스가 앞 컬럼 조회를 대신하므로 단일 컬럼 인덱스 제거
+        await conn.execute(text("DROP INDEX IF EXISTS idx_chat_sessions_user"))
+        await conn.execute(text("DROP INDEX IF EXISTS idx_chat_messages_session"))
+
+        # 청크 변경 피드 (프로세스 내 벡터 세그먼트 동기화용)
+        await conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS chunk_changes (
+                id BIGSERIAL PRIMARY KEY,
+                chunk_id VARCHAR(36) NOT NULL,
+                op VARCHAR(10) NOT NULL,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            )
+        """))
+        await conn.execute(text("""
+            CREATE OR REPLACE FUNCTION record_chunk_change() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP = 'DELETE' THEN
+                    INSERT INTO chunk_changes (chunk_id, op) VALUES (OLD.id, 'delete');
+                    RETURN OLD;
+                END IF;
+                INSERT INTO chunk_changes (chunk_id, op) VALUES (NEW.id, 'insert');
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql
+        """))
+        # 트리거는 없을 때만 생성 - 트리거 oid가 세그먼트의 피드 식별자이므로, 비활성 기간을 거쳐
+        # 다시 만들어지면 oid가 바뀌어 세그먼트가 처음부터 재적재됨 (놓친 변경 반영)
+        if settings.VECTOR_SEGMENT_ENABLED:
+            await conn.execute(text("""
+                DO $$ BEGIN
+                    CREATE TRIGGER trg_chunk_changes
+                    AFTER INSERT OR DELETE ON document_chunks
+                    FOR EACH ROW EXECUTE FUNCTION record_chunk_change();
+                EXCEPTION WHEN duplicate_object THEN NULL;
+                END $$
+            """))
+        else:
+            await conn.execute(text("DROP TRIGGER IF EXISTS trg_chunk_changes ON document_chunks"))
 
         logger.info("인덱스 생성 완료")
+
+    # 확장 생성 이전에 열린 연결은 pgvector 코덱이 없으므로 풀 재생성
+    await engine.dispose()
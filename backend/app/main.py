@@ -11,6 +11,11 @@ from app.config import get_settings
 from app.database import init_db, async_session
 from app.api import auth, users, documents, chat, search
 from app.services.auth_service import create_default_admin
+from app.core.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, TOTAL_ESTIMATED_HEADER
+from app.rag.lexical_index import backfill_lexical_index
+from app.rag.retriever import check_vector_index_usage
+from app.rag.vector_segment import start_vector_segment, stop_vector_segment
+from app.services.history_cache import start_history_cache, stop_history_cache
 
 settings = get_settings()
 
@@ -49,8 +54,33 @@ async def lifespan(app: FastAPI):
             settings.DEFAULT_ADMIN_PASSWORD,
         )
 
+    # BM25 역색인 백필 (색인 도입 이전에 저장된 청크)
+    async with async_session() as db:
+        await backfill_lexical_index(db)
+
+    # 벡터 검색 실행 계획 점검 (HNSW 인덱스 사용 여부)
+    try:
+        async with async_session() as db:
+            if await check_vector_index_usage(db):
+                logger.info("벡터 검색: HNSW 인덱스 사용 확인")
+            else:
+                logger.warning(
+                    "벡터 검색이 HNSW 인덱스를 사용하지 않습니다 "
+                    "(데이터가 적으면 순차 스캔이 선택될 수 있음)"
+                )
+    except Exception as e:
+        logger.warning(f"벡터 검색 실행 계획 점검 실패: {e}")
+
+    # 프로세스 내 벡터 세그먼트 동기화 (VECTOR_SEGMENT_ENABLED)
+    start_vector_segment()
+
+    # 대화 히스토리 캐시 (다른 워커의 세션 변경 LISTEN)
+    start_history_cache()
+
     logger.info("시스템 준비 완료")
     yield
+    await stop_history_cache()
+    await stop_vector_segment()
     logger.info("시스템 종료")
 
 
@@ -84,6 +114,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, TOTAL_ESTIMATED_HEADER],
 )
 
 # 라우터 등록
@@ -98,6 +129,7 @@ app.include_router(search.router)
 async def health_check():
     """헬스체크 - 서비스 상태 확인"""
     from app.services.llm_service import check_ollama_health
+    from app.services.generation_queue import get_scheduler
     from app.database import engine
     from sqlalchemy import text
 
@@ -125,4 +157,5 @@ async def health_check():
             "database": "connected" if db_ok else "disconnected",
             "ollama": "connected" if ollama_ok else "disconnected",
         },
+        "generation_queue": get_scheduler().stats(),
     }
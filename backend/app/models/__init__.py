@@ -1,4 +1,9 @@
 from app.models.user import User
-from app.models.document import Document, DocumentChunk, ChatSession, ChatMessage
+from app.models.document import (
+    Document, DocumentChunk, ChunkTerm, LexicalStats, ChatSession, ChatMessage,
+)
 
-__all__ = ["User", "Document", "DocumentChunk", "ChatSession", "ChatMessage"]
+__all__ = [
+    "User", "Document", "DocumentChunk", "ChunkTerm", "LexicalStats",
+    "ChatSession", "ChatMessage",
+]
@@ -3,9 +3,9 @@ Document, Chunk, Chat Models
 """
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import String, Integer, BigInteger, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import String, Integer, BigInteger, Boolean, Text, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from pgvector.sqlalchemy import Vector
+from app.models.types import Vector
 from app.database import Base
 from app.config import get_settings
 
@@ -30,7 +30,13 @@ class Document(Base):
     uploaded_by: Mapped[str] = mapped_column(
         String(36), ForeignKey("users.id"), nullable=False
     )
+    visibility: Mapped[str] = mapped_column(
+        String(20), default="public", nullable=False
+    )  # public, department, private
+    department: Mapped[str] = mapped_column(String(100), nullable=True)  # 업로더 부서
     error_message: Mapped[str] = mapped_column(Text, nullable=True)
+    # 문서 대표 벡터 (청크 임베딩 평균, coarse-to-fine 검색 1단계). 목록 조회 시 로드하지 않음
+    embedding = mapped_column(Vector(settings.EMBEDDING_DIMENSION), nullable=True, deferred=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=_utcnow, nullable=False
     )
@@ -50,6 +56,13 @@ class DocumentChunk(Base):
     chunk_index: Mapped[int] = mapped_column(Integer, nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
     embedding = mapped_column(Vector(settings.EMBEDDING_DIMENSION), nullable=True)
+    token_count: Mapped[int] = mapped_column(Integer, nullable=True)  # BM25 문서 길이 (NULL = 미색인)
+    term_freqs: Mapped[dict] = mapped_column(JSON, nullable=True)  # 저장 시 계산한 term frequency
+    # 검색 필터용 비정규화 컬럼 (HNSW 부분 인덱스가 문서 JOIN 없이 필터링)
+    searchable: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    owner_id: Mapped[str] = mapped_column(String(36), nullable=True)  # documents.uploaded_by
+    visibility: Mapped[str] = mapped_column(String(20), default="public", nullable=False)
+    department: Mapped[str] = mapped_column(String(100), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=_utcnow, nullable=False
     )
@@ -57,6 +70,29 @@ class DocumentChunk(Base):
     document = relationship("Document", back_populates="chunks")
 
 
+class ChunkTerm(Base):
+    """BM25 역색인 (term → chunk posting)"""
+    __tablename__ = "chunk_terms"
+    __table_args__ = (
+        Index("idx_chunk_terms_chunk", "chunk_id"),
+    )
+
+    term: Mapped[str] = mapped_column(String(64), primary_key=True)
+    chunk_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("document_chunks.id", ondelete="CASCADE"), primary_key=True
+    )
+    tf: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class LexicalStats(Base):
+    """BM25 코퍼스 통계 (단일 행: id = 1)"""
+    __tablename__ = "lexical_stats"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    chunk_count: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    total_tokens: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+
+
 class ChatSession(Base):
     __tablename__ = "chat_sessions"
 
@@ -70,6 +106,10 @@ class ChatSession(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=_utcnow, nullable=False
     )
+    summary: Mapped[str] = mapped_column(Text, nullable=True)  # 롤링 대화 요약
+    summarized_until: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )  # 요약에 반영된 마지막 메시지 시각
 
     messages = relationship("ChatMessage", back_populates="session", cascade="all, delete-orphan")
 
@@ -86,6 +126,9 @@ class ChatMessage(Base):
     role: Mapped[str] = mapped_column(String(20), nullable=False)  # user / assistant
     content: Mapped[str] = mapped_column(Text, nullable=False)
     sources: Mapped[dict] = mapped_column(JSON, nullable=True)  # 참고 문서 목록
+    interrupted: Mapped[bool] = mapped_column(
+        Boolean, default=False, nullable=False
+    )  # 스트리밍 중 클라이언트 연결 끊김으로 생성이 중단된 답변
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=_utcnow, nullable=False
     )
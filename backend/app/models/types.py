@@ -0,0 +1,19 @@
+"""
+Column Types - pgvector 바이너리 전송용 SQLAlchemy 타입
+"""
+from pgvector.sqlalchemy import Vector as _TextVector
+
+
+class Vector(_TextVector):
+    """pgvector 컬럼 타입 (asyncpg 바이너리 코덱 사용)
+
+    database.py에서 연결마다 pgvector asyncpg 코덱을 등록하므로, asyncpg에서는
+    값을 문자열('[0.1,0.2,...]')로 직렬화하지 않고 그대로 넘겨 바이너리로 전송합니다.
+    결과도 코덱이 numpy 배열로 디코딩합니다.
+    """
+    cache_ok = True
+
+    def bind_processor(self, dialect):
+        if dialect.driver == "asyncpg":
+            return None
+        return super().bind_processor(dialect)
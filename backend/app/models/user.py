@@ -18,6 +18,7 @@ class User(Base):
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
     role: Mapped[str] = mapped_column(String(20), default="user", nullable=False)  # admin / user
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    department: Mapped[str] = mapped_column(String(100), nullable=True)  # 부서 (문서 공개 범위)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False
     )
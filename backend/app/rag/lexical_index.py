@@ -0,0 +1,192 @@
+"""
+Lexical Index - 코퍼스 전체 BM25 역색인
+
+청크 저장 시 term → chunk posting(chunk_terms)과 코퍼스 통계(lexical_stats)를
+함께 갱신하여, 쿼리 시 실제 IDF와 평균 문서 길이(avgdl)로 BM25 점수를 계산합니다.
+벡터 검색이 놓친 청크(조항 번호, 제품 코드, 이름 등)도 어휘 검색으로 찾을 수 있습니다.
+"""
+import logging
+from typing import List, Optional, Sequence, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import String, insert, select, update, bindparam, text as sql_text
+from sqlalchemy.dialects.postgresql import ARRAY
+from app.models.document import DocumentChunk, ChunkTerm, LexicalStats
+from app.rag.tokenizer import term_frequencies, MAX_TERM_LENGTH
+from app.rag.scope import SearchScope, scope_filter
+
+logger = logging.getLogger("baikal.lexical")
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+STATS_ROW_ID = 1
+
+_BM25_SQL = f"""
+    WITH stats AS (
+        SELECT GREATEST(chunk_count, 1) AS n,
+               GREATEST(total_tokens::float8 / GREATEST(chunk_count, 1), 1) AS avgdl
+        FROM lexical_stats
+        WHERE id = {STATS_ROW_ID}
+    ),
+    df AS (
+        SELECT term, count(*) AS df
+        FROM chunk_terms
+        WHERE term = ANY(:terms)
+        GROUP BY term
+    )
+    SELECT ct.chunk_id,
+           SUM(
+               ln(1 + (s.n - df.df + 0.5) / (df.df + 0.5))
+               * ct.tf * ({BM25_K1} + 1)
+               / (ct.tf + {BM25_K1} * (1 - {BM25_B} + {BM25_B} * dc.token_count / s.avgdl))
+           ) AS score
+    FROM chunk_terms ct
+    JOIN df ON df.term = ct.term
+    JOIN document_chunks dc ON dc.id = ct.chunk_id
+    CROSS JOIN stats s
+    WHERE ct.term = ANY(:terms)
+      AND dc.searchable
+      {{chunk_filter}}
+    GROUP BY ct.chunk_id
+    ORDER BY score DESC
+    {{limit}}
+"""
+
+
+def _query_terms(query_tokens: Sequence[str]) -> List[str]:
+    return sorted({t[:MAX_TERM_LENGTH] for t in query_tokens})
+
+
+async def index_chunks(db: AsyncSession, chunks: Sequence[DocumentChunk]) -> None:
+    """청크 posting 저장 + 코퍼스 통계 갱신 (커밋은 호출자가 수행)
+
+    청크는 이미 flush되어 id가 확정된 상태여야 합니다.
+    term_freqs가 비어 있으면 여기서 계산해 청크에 함께 저장합니다.
+    """
+    postings = []
+    total_tokens = 0
+    for chunk in chunks:
+        if chunk.term_freqs is None:
+            chunk.term_freqs = term_frequencies(chunk.content)
+        chunk.token_count = sum(chunk.term_freqs.values())
+        total_tokens += chunk.token_count
+        for term, tf in chunk.term_freqs.items():
+            postings.append({"term": term, "chunk_id": chunk.id, "tf": tf})
+
+    if postings:
+        await db.execute(insert(ChunkTerm), postings)
+    await db.execute(
+        update(LexicalStats)
+        .where(LexicalStats.id == STATS_ROW_ID)
+        .values(
+            chunk_count=LexicalStats.chunk_count + len(chunks),
+            total_tokens=LexicalStats.total_tokens + total_tokens,
+        )
+    )
+
+
+async def unindex_document(db: AsyncSession, document_id: str) -> None:
+    """문서 삭제 전 posting 삭제 + 코퍼스 통계 차감
+
+    document_chunks가 파티션 테이블이면 chunk_terms FK가 없으므로 posting을 직접 삭제합니다.
+    """
+    await db.execute(
+        sql_text("""
+            DELETE FROM chunk_terms
+            WHERE chunk_id IN (SELECT id FROM document_chunks WHERE document_id = :document_id)
+        """),
+        {"document_id": document_id},
+    )
+    result = await db.execute(
+        sql_text("""
+            SELECT count(*), COALESCE(sum(token_count), 0)
+            FROM document_chunks
+            WHERE document_id = :document_id AND token_count IS NOT NULL
+        """),
+        {"document_id": document_id},
+    )
+    chunk_count, total_tokens = result.one()
+    if chunk_count == 0:
+        return
+    await db.execute(
+        update(LexicalStats)
+        .where(LexicalStats.id == STATS_ROW_ID)
+        .values(
+            chunk_count=LexicalStats.chunk_count - chunk_count,
+            total_tokens=LexicalStats.total_tokens - total_tokens,
+        )
+    )
+
+
+async def search_lexical(
+    query_tokens: Sequence[str],
+    db: AsyncSession,
+    top_k: Optional[int] = None,
+    chunk_ids: Optional[Sequence[str]] = None,
+    scope: Optional[SearchScope] = None,
+) -> List[Tuple[str, float]]:
+    """BM25 어휘 검색
+
+    Args:
+        query_tokens: 질의 토큰
+        top_k: 상위 k개 (None이면 제한 없음)
+        chunk_ids: 지정 시 해당 청크만 점수 계산
+        scope: 검색 범위 (문서 공개 범위)
+
+    Returns:
+        (chunk_id, bm25_score) 리스트 (점수 내림차순)
+    """
+    terms = _query_terms(query_tokens)
+    if not terms:
+        return []
+
+    chunk_filter, params = scope_filter(scope)
+    params["terms"] = terms
+    binds = [bindparam("terms", type_=ARRAY(String))]
+    limit = ""
+    if chunk_ids is not None:
+        if not chunk_ids:
+            return []
+        chunk_filter += " AND ct.chunk_id = ANY(:chunk_ids)"
+        params["chunk_ids"] = list(chunk_ids)
+        binds.append(bindparam("chunk_ids", type_=ARRAY(String)))
+    if top_k is not None:
+        limit = "LIMIT :top_k"
+        params["top_k"] = top_k
+
+    query = sql_text(
+        _BM25_SQL.format(chunk_filter=chunk_filter, limit=limit)
+    ).bindparams(*binds)
+    result = await db.execute(query, params)
+    return [(chunk_id, float(score)) for chunk_id, score in result.fetchall()]
+
+
+async def backfill_lexical_index(db: AsyncSession, batch_size: int = 500) -> int:
+    """색인되지 않은 기존 청크 색인
+
+    token_count IS NULL 이면 posting까지 색인하고, term_freqs만 비어 있으면
+    term frequency 맵만 채웁니다.
+    """
+    total = 0
+    while True:
+        result = await db.execute(
+            select(DocumentChunk)
+            .where(
+                DocumentChunk.token_count.is_(None)
+                | DocumentChunk.term_freqs.is_(None)
+            )
+            .limit(batch_size)
+        )
+        chunks = result.scalars().all()
+        if not chunks:
+            break
+        unindexed = [c for c in chunks if c.token_count is None]
+        for chunk in chunks:
+            if chunk.term_freqs is None:
+                chunk.term_freqs = term_frequencies(chunk.content)
+        await index_chunks(db, unindexed)
+        await db.commit()
+        total += len(chunks)
+
+    if total:
+        logger.info(f"BM25 색인 백필 완료: {total} chunks")
+    return total
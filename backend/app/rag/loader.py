@@ -1,125 +1,197 @@
 """
 Document Loader - 텍스트 추출
+
+포맷별 추출기는 `register_extractor` 로 등록하며, 파일 전체를 하나의 문자열로
+만들지 않고 구조화된 세그먼트(Segment)를 순차적으로 생성(yield)합니다.
+새 포맷은 이 모듈에 추출기를 등록하는 것만으로 업로드/처리 파이프라인에 반영됩니다.
 """
 import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, Optional, Tuple
 
 logger = logging.getLogger("baikal.loader")
 
+SEGMENT_KINDS = ("paragraph", "table", "header")
 
-def extract_text(filepath: str, file_type: str) -> str:
-    """파일에서 텍스트 추출"""
-    extractors = {
-        "pdf": extract_pdf,
-        "docx": extract_docx,
-        "xlsx": extract_xlsx,
-        "hwp": extract_hwp,
-        "hwpx": extract_hwpx,
-    }
-
-    extractor = extractors.get(file_type)
+
+@dataclass
+class Segment:
+    """추출 단위 (문단 / 표 행 / 제목)"""
+    text: str
+    kind: str = "paragraph"         # paragraph, table, header
+    page: Optional[int] = None      # PDF 페이지 번호 (1부터)
+    section: Optional[str] = None   # 시트명, HWP 섹션 등
+
+
+Extractor = Callable[[str], Iterator[Segment]]
+
+_EXTRACTORS: Dict[str, Extractor] = {}
+_MIME_TYPES: Dict[str, str] = {}
+
+
+def register_extractor(file_type: str, mime_types: Tuple[str, ...] = ()):
+    """추출기 등록 데코레이터
+
+    Args:
+        file_type: 확장자 (소문자, 점 제외)
+        mime_types: 이 형식으로 인식할 MIME 타입 목록
+    """
+    def decorator(func: Extractor) -> Extractor:
+        _EXTRACTORS[file_type] = func
+        for mime in mime_types:
+            _MIME_TYPES[mime] = file_type
+        return func
+    return decorator
+
+
+def get_supported_types() -> set:
+    """등록된 파일 형식 목록"""
+    return set(_EXTRACTORS)
+
+
+def get_mime_map() -> Dict[str, str]:
+    """MIME 타입 → 확장자 매핑"""
+    return dict(_MIME_TYPES)
+
+
+def iter_segments(filepath: str, file_type: str) -> Iterator[Segment]:
+    """파일에서 세그먼트를 순차적으로 추출"""
+    extractor = _EXTRACTORS.get(file_type)
     if extractor is None:
         raise ValueError(f"지원하지 않는 파일 형식: {file_type}")
 
+    count = 0
     try:
-        text = extractor(filepath)
-        logger.info(f"텍스트 추출 완료: {filepath} ({len(text)} chars)")
-        return text
+        for segment in extractor(filepath):
+            if segment.text and segment.text.strip():
+                count += 1
+                yield segment
     except Exception as e:
         logger.error(f"텍스트 추출 실패: {filepath} - {e}")
         raise
+    logger.info(f"세그먼트 추출 완료: {filepath} ({count} segments)")
 
 
-def extract_pdf(filepath: str) -> str:
-    """PDF에서 텍스트 추출"""
+def extract_text(filepath: str, file_type: str) -> str:
+    """파일에서 텍스트 추출 (세그먼트를 하나의 문자열로 결합)"""
+    parts = []
+    prev_page = None
+    for segment in iter_segments(filepath, file_type):
+        # 페이지가 바뀌면 빈 줄로 구분
+        if parts and segment.page is not None and segment.page != prev_page:
+            parts.append("")
+        parts.append(segment.text)
+        prev_page = segment.page
+
+    text = "\n".join(parts)
+    logger.info(f"텍스트 추출 완료: {filepath} ({len(text)} chars)")
+    return text
+
+
+@register_extractor("pdf", mime_types=("application/pdf",))
+def extract_pdf(filepath: str) -> Iterator[Segment]:
+    """PDF에서 페이지 단위 세그먼트 추출"""
     try:
         from PyPDF2 import PdfReader
     except ImportError:
         raise ImportError("PyPDF2가 설치되지 않았습니다: pip install PyPDF2")
 
     reader = PdfReader(filepath)
-    text_parts = []
+    extracted = False
     for i, page in enumerate(reader.pages):
         try:
             page_text = page.extract_text()
-            if page_text:
-                text_parts.append(page_text)
         except Exception as e:
             logger.warning(f"PDF 페이지 {i + 1} 추출 실패: {e}")
             continue
+        if page_text:
+            extracted = True
+            yield Segment(text=page_text, kind="paragraph", page=i + 1)
 
-    if not text_parts:
+    if not extracted:
         logger.warning(f"PDF에서 텍스트를 추출할 수 없습니다 (이미지 PDF일 수 있음): {filepath}")
 
-    return "\n\n".join(text_parts)
 
-
-def extract_docx(filepath: str) -> str:
-    """DOCX에서 텍스트 추출"""
+@register_extractor(
+    "docx",
+    mime_types=("application/vnd.openxmlformats-officedocument.wordprocessingml.document",),
+)
+def extract_docx(filepath: str) -> Iterator[Segment]:
+    """DOCX에서 세그먼트 추출 (머리글 → 본문 → 표)"""
     try:
         from docx import Document
     except ImportError:
         raise ImportError("python-docx가 설치되지 않았습니다: pip install python-docx")
 
     doc = Document(filepath)
-    text_parts = []
 
-    # 본문 텍스트
+    # 머리글
+    for section in doc.sections:
+        header = section.header
+        if header and header.paragraphs:
+            for p in header.paragraphs:
+                if p.text.strip():
+                    yield Segment(text=p.text, kind="header")
+
+    # 본문 텍스트 (제목 스타일은 header로 구분)
     for paragraph in doc.paragraphs:
         if paragraph.text.strip():
-            text_parts.append(paragraph.text)
+            style_name = paragraph.style.name if paragraph.style is not None else ""
+            kind = "header" if style_name.startswith(("Heading", "Title")) else "paragraph"
+            yield Segment(text=paragraph.text, kind=kind)
 
     # 테이블 내용
-    for table in doc.tables:
+    for t_idx, table in enumerate(doc.tables):
         for row in table.rows:
             row_text = "\t".join(cell.text.strip() for cell in row.cells if cell.text.strip())
             if row_text:
-                text_parts.append(row_text)
-
-    # 헤더/푸터
-    for section in doc.sections:
-        header = section.header
-        if header and header.paragraphs:
-            for p in header.paragraphs:
-                if p.text.strip():
-                    text_parts.insert(0, p.text)
+                yield Segment(text=row_text, kind="table", section=f"표 {t_idx + 1}")
 
-    return "\n".join(text_parts)
 
-
-def extract_xlsx(filepath: str) -> str:
-    """XLSX에서 텍스트 추출"""
+@register_extractor(
+    "xlsx",
+    mime_types=("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",),
+)
+def extract_xlsx(filepath: str) -> Iterator[Segment]:
+    """XLSX에서 시트별 세그먼트 추출"""
     try:
         from openpyxl import load_workbook
     except ImportError:
         raise ImportError("openpyxl이 설치되지 않았습니다: pip install openpyxl")
 
     wb = load_workbook(filepath, read_only=True, data_only=True)
-    text_parts = []
-
-    for sheet_name in wb.sheetnames:
-        ws = wb[sheet_name]
-        text_parts.append(f"[시트: {sheet_name}]")
-
-        row_count = 0
-        for row in ws.iter_rows(values_only=True):
-            row_text = "\t".join(
-                str(cell) if cell is not None else "" for cell in row
-            )
-            if row_text.strip():
-                text_parts.append(row_text)
-                row_count += 1
-
-            # 대용량 시트 제한 (10000행)
-            if row_count > 10000:
-                text_parts.append(f"... ({sheet_name} 시트: 10000행까지만 처리)")
-                break
-
-    wb.close()
-    return "\n".join(text_parts)
-
-
-def extract_hwp(filepath: str) -> str:
-    """HWP 파일에서 텍스트 추출 (OLE 바이너리 포맷)"""
+    try:
+        for sheet_name in wb.sheetnames:
+            ws = wb[sheet_name]
+            yield Segment(text=f"[시트: {sheet_name}]", kind="header", section=sheet_name)
+
+            row_count = 0
+            for row in ws.iter_rows(values_only=True):
+                row_text = "\t".join(
+                    str(cell) if cell is not None else "" for cell in row
+                )
+                if row_text.strip():
+                    yield Segment(text=row_text, kind="table", section=sheet_name)
+                    row_count += 1
+
+                # 대용량 시트 제한 (10000행)
+                if row_count > 10000:
+                    yield Segment(
+                        text=f"... ({sheet_name} 시트: 10000행까지만 처리)",
+                        kind="paragraph",
+                        section=sheet_name,
+                    )
+                    break
+    finally:
+        wb.close()
+
+
+@register_extractor(
+    "hwp",
+    mime_types=("application/x-hwp", "application/haansofthwp", "application/vnd.hancom.hwp"),
+)
+def extract_hwp(filepath: str) -> Iterator[Segment]:
+    """HWP 파일에서 세그먼트 추출 (OLE 바이너리 포맷)"""
     try:
         import olefile
         import zlib
@@ -131,75 +203,74 @@ def extract_hwp(filepath: str) -> str:
         raise ValueError("유효하지 않은 HWP 파일입니다")
 
     ole = olefile.OleFileIO(filepath)
-    text_parts = []
-
-    i = 1
-    while True:
-        stream_name = f'BodyText/Section{i:04d}'
-        if not ole.exists(stream_name):
-            break
-        try:
-            data = ole.openstream(stream_name).read()
-            # zlib 압축 해제 시도
+    extracted = False
+    try:
+        i = 1
+        while True:
+            stream_name = f'BodyText/Section{i:04d}'
+            if not ole.exists(stream_name):
+                break
+            section = f"Section{i}"
             try:
-                data = zlib.decompress(data, -15)
-            except Exception:
-                pass
-
-            # HWP 레코드 구조 파싱
-            pos = 0
-            while pos + 4 <= len(data):
-                header = struct.unpack_from('<I', data, pos)[0]
-                rec_type = header & 0x3FF
-                size = (header >> 20) & 0xFFF
-                if size == 0xFFF:
-                    if pos + 8 > len(data):
-                        break
-                    size = struct.unpack_from('<I', data, pos + 4)[0]
-                    pos += 8
-                else:
-                    pos += 4
-
-                # HWPTAG_PARA_TEXT (rec_type 67 = 0x43)
-                if rec_type == 67:
-                    try:
+                data = ole.openstream(stream_name).read()
+                # zlib 압축 해제 시도
+                try:
+                    data = zlib.decompress(data, -15)
+                except Exception:
+                    pass
+
+                # HWP 레코드 구조 파싱
+                pos = 0
+                while pos + 4 <= len(data):
+                    header = struct.unpack_from('<I', data, pos)[0]
+                    rec_type = header & 0x3FF
+                    size = (header >> 20) & 0xFFF
+                    if size == 0xFFF:
+                        if pos + 8 > len(data):
+                            break
+                        size = struct.unpack_from('<I', data, pos + 4)[0]
+                        pos += 8
+                    else:
+                        pos += 4
+
+                    # HWPTAG_PARA_TEXT (rec_type 67 = 0x43)
+                    if rec_type == 67:
                         text = data[pos:pos + size].decode('utf-16-le', errors='ignore')
                         text = ''.join(c for c in text if ord(c) >= 32 or c in '\n\t')
                         if text.strip():
-                            text_parts.append(text)
-                    except Exception:
-                        pass
-                pos += size
-        except Exception as e:
-            logger.warning(f"HWP Section{i} 처리 실패: {e}")
-        i += 1
+                            extracted = True
+                            yield Segment(text=text, kind="paragraph", section=section)
+                    pos += size
+            except Exception as e:
+                logger.warning(f"HWP {section} 처리 실패: {e}")
+            i += 1
+    finally:
+        ole.close()
 
-    ole.close()
-    if not text_parts:
+    if not extracted:
         logger.warning(f"HWP에서 텍스트를 추출하지 못했습니다: {filepath}")
-    return "\n".join(text_parts)
 
 
-def extract_hwpx(filepath: str) -> str:
-    """HWPX 파일에서 텍스트 추출 (ZIP+XML 포맷)"""
+@register_extractor("hwpx", mime_types=("application/vnd.hancom.hwpx",))
+def extract_hwpx(filepath: str) -> Iterator[Segment]:
+    """HWPX 파일에서 세그먼트 추출 (ZIP+XML 포맷)"""
     import zipfile
     import xml.etree.ElementTree as ET
 
-    text_parts = []
     with zipfile.ZipFile(filepath, 'r') as z:
         section_files = sorted([
             f for f in z.namelist()
             if 'section' in f.lower() and f.endswith('.xml')
         ])
-        for section_file in section_files:
+        for idx, section_file in enumerate(section_files):
             try:
-                xml_data = z.read(section_file)
-                root = ET.fromstring(xml_data)
-                for elem in root.iter():
-                    if elem.text and elem.text.strip():
-                        tag = elem.tag.split('}')[-1] if '}' in elem.tag else elem.tag
-                        if tag in ('t', 'run', 'text', 'para'):
-                            text_parts.append(elem.text.strip())
+                root = ET.fromstring(z.read(section_file))
             except Exception as e:
                 logger.warning(f"HWPX 섹션 파싱 실패 {section_file}: {e}")
-    return "\n".join(text_parts)
+                continue
+            section = f"Section{idx + 1}"
+            for elem in root.iter():
+                if elem.text and elem.text.strip():
+                    tag = elem.tag.split('}')[-1] if '}' in elem.tag else elem.tag
+                    if tag in ('t', 'run', 'text', 'para'):
+                        yield Segment(text=elem.text.strip(), kind="paragraph", section=section)
@@ -2,75 +2,155 @@
 Retriever - 하이브리드 검색 (Vector + BM25) + MMR Reranking
 """
 import math
+import time
+import asyncio
 import logging
-from typing import List
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from app.models.types import Vector
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text as sql_text
+from sqlalchemy import JSON, String, bindparam, text as sql_text
+from sqlalchemy.dialects.postgresql import ARRAY
+from app.database import async_session, chunk_partition_tables
+from app.rag.lexical_index import search_lexical
+from app.rag.tokenizer import tokenize, term_frequencies
+from app.rag.scope import SearchScope, scope_filter
+from app.rag.vector_segment import get_segment
 from app.services.llm_service import call_ollama_embedding
 from app.config import get_settings
+from app.core.deadline import apply_statement_timeout
 
 settings = get_settings()
 logger = logging.getLogger("baikal.retriever")
 
+SEGMENT_OVERFETCH = 4  # 세그먼트 검색 시 범위 필터 탈락분을 고려한 배수
 
-def _bm25_score(query_tokens: List[str], doc_tokens: List[str],
-                avgdl: float, k1: float = 1.5, b: float = 0.75) -> float:
-    """BM25 점수 계산 (단일 문서)"""
-    score = 0.0
-    doc_len = len(doc_tokens)
-    tf_map: dict = {}
-    for t in doc_tokens:
-        tf_map[t] = tf_map.get(t, 0) + 1
+# 파티션 검색은 파티션마다 세션을 열므로, 요청 수와 무관하게 워커 전체의 동시 연결 수를 제한
+_partition_slots = asyncio.Semaphore(max(settings.PARTITION_SEARCH_CONCURRENCY, 1))
 
+
+class _CandidateSet:
+    """후보 집합 (병렬 배열 표현)
+
+    후보별 dict를 만들지 않고 점수 계산은 NumPy 배열 연산으로 수행하며,
+    최종 선택된 top_k만 결과 dict로 변환합니다.
+    """
+    __slots__ = (
+        "chunk_ids", "contents", "document_ids", "chunk_indexes", "filenames",
+        "vector_scores", "embeddings", "term_freqs", "doc_lens",
+    )
+
+    def __init__(self, rows: list):
+        n = len(rows)
+        self.chunk_ids: List[str] = [None] * n
+        self.contents: List[str] = [None] * n
+        self.document_ids: List[str] = [None] * n
+        self.chunk_indexes: List[int] = [None] * n
+        self.filenames: List[str] = [None] * n
+        self.term_freqs: List[Dict[str, int]] = [None] * n
+        self.vector_scores = np.empty(n, dtype=np.float32)
+        self.doc_lens = np.empty(n, dtype=np.float32)
+        embeddings = [None] * n
+
+        for i, (chunk_id, content, doc_id, chunk_index, filename, distance,
+                embedding, term_freqs, token_count) in enumerate(rows):
+            if term_freqs is None:
+                # 색인 백필 이전 청크만 쿼리 시 토큰화
+                term_freqs = term_frequencies(content)
+                token_count = sum(term_freqs.values())
+            self.chunk_ids[i] = chunk_id
+            self.contents[i] = content
+            self.document_ids[i] = doc_id
+            self.chunk_indexes[i] = chunk_index
+            self.filenames[i] = filename
+            self.term_freqs[i] = term_freqs
+            self.vector_scores[i] = 1 - distance
+            self.doc_lens[i] = token_count
+            embeddings[i] = embedding
+
+        # 임베딩이 없는 후보가 있으면 None (Jaccard MMR로 폴백)
+        self.embeddings = (
+            np.vstack(embeddings).astype(np.float32, copy=False)
+            if n and all(e is not None for e in embeddings) else None
+        )
+
+    def __len__(self) -> int:
+        return len(self.chunk_ids)
+
+    def select(self, mask: np.ndarray) -> "_CandidateSet":
+        """마스크에 해당하는 후보만 남긴 새 집합"""
+        idx = np.flatnonzero(mask)
+        subset = _CandidateSet.__new__(_CandidateSet)
+        for name in ("chunk_ids", "contents", "document_ids", "chunk_indexes",
+                     "filenames", "term_freqs"):
+            values = getattr(self, name)
+            setattr(subset, name, [values[i] for i in idx])
+        subset.vector_scores = self.vector_scores[idx]
+        subset.doc_lens = self.doc_lens[idx]
+        subset.embeddings = self.embeddings[idx] if self.embeddings is not None else None
+        return subset
+
+    def to_result(self, i: int, bm25_score: float, hybrid_score: float) -> dict:
+        return {
+            "chunk_id": self.chunk_ids[i],
+            "content": self.contents[i],
+            "document_id": self.document_ids[i],
+            "chunk_index": self.chunk_indexes[i],
+            "filename": self.filenames[i],
+            "vector_score": round(float(self.vector_scores[i]), 4),
+            "bm25_score": round(float(bm25_score), 4),
+            "hybrid_score": round(float(hybrid_score), 4),
+        }
+
+
+def _bm25_scores(query_tokens: List[str], cands: _CandidateSet,
+                 k1: float = 1.5, b: float = 0.75) -> np.ndarray:
+    """후보 집합 BM25 점수 (역색인 사용 불가 시 폴백)
+
+    저장된 term frequency 맵에서 질의 term별 tf 벡터를 모아 한 번에 계산합니다.
+    """
+    scores = np.zeros(len(cands), dtype=np.float32)
+    if not len(cands):
+        return scores
+
+    avgdl = max(float(cands.doc_lens.mean()), 1.0)
+    length_norm = k1 * (1 - b + b * cands.doc_lens / avgdl)
+    idf = math.log(1 + 1)  # 단순화된 IDF (전체 코퍼스 없이)
     for token in query_tokens:
-        tf = tf_map.get(token, 0)
-        if tf == 0:
-            continue
-        idf = math.log(1 + 1)  # 단순화된 IDF (전체 코퍼스 없이)
-        numerator = tf * (k1 + 1)
-        denominator = tf + k1 * (1 - b + b * doc_len / max(avgdl, 1))
-        score += idf * (numerator / denominator)
-    return score
-
-
-def _tokenize(text: str) -> List[str]:
-    """간단한 한국어/영어 토크나이저"""
-    import re
-    text = text.lower()
-    # 한국어 2-gram + 영어 단어 분리
-    tokens = re.findall(r'[가-힣]{2,}|[a-z0-9]+', text)
-    # 한국어 2-gram 추가
-    korean = re.findall(r'[가-힣]+', text)
-    for word in korean:
-        tokens += [word[i:i+2] for i in range(len(word) - 1)]
-    return tokens
-
-
-def _mmr_rerank(candidates: List[dict], top_k: int, lambda_val: float = 0.6) -> List[dict]:
-    """MMR (Maximal Marginal Relevance) - 관련성과 다양성 균형"""
-    if not candidates:
-        return []
+        tf = np.fromiter(
+            (tf_map.get(token, 0) for tf_map in cands.term_freqs),
+            dtype=np.float32, count=len(cands),
+        )
+        scores += idf * (tf * (k1 + 1)) / (tf + length_norm)
+    return scores
 
-    selected = []
-    remaining = list(candidates)
+
+def _mmr_rerank(
+    relevance: np.ndarray, term_sets: List[set], top_k: int, lambda_val: float = 0.6
+) -> List[int]:
+    """MMR (Maximal Marginal Relevance) - 관련성과 다양성 균형 (토큰 Jaccard, 폴백용)
+
+    Returns:
+        선택된 후보 인덱스 (선택 순)
+    """
+    selected: List[int] = []
+    remaining = list(range(len(relevance)))
 
     while remaining and len(selected) < top_k:
         if not selected:
             # 첫 번째는 가장 높은 점수 선택
-            best = max(remaining, key=lambda x: x["hybrid_score"])
+            best = max(remaining, key=lambda i: relevance[i])
         else:
             # MMR: 관련성 - 이미 선택된 것과의 텍스트 중복도
-            def mmr_score(cand):
-                relevance = cand["hybrid_score"]
+            def mmr_score(i):
                 max_sim = 0.0
-                cand_tokens = set(_tokenize(cand["content"]))
-                for sel in selected:
-                    sel_tokens = set(_tokenize(sel["content"]))
-                    union = len(cand_tokens | sel_tokens)
+                cand_tokens = term_sets[i]
+                for j in selected:
+                    union = len(cand_tokens | term_sets[j])
                     if union > 0:
-                        overlap = len(cand_tokens & sel_tokens) / union
+                        overlap = len(cand_tokens & term_sets[j]) / union
                         max_sim = max(max_sim, overlap)
-                return lambda_val * relevance - (1 - lambda_val) * max_sim
+                return lambda_val * relevance[i] - (1 - lambda_val) * max_sim
 
             best = max(remaining, key=mmr_score)
 
@@ -80,90 +160,477 @@ def _mmr_rerank(candidates: List[dict], top_k: int, lambda_val: float = 0.6) ->
     return selected
 
 
-async def retrieve_relevant_chunks(
-    query: str, db: AsyncSession, top_k: int = None
-) -> List[dict]:
-    """하이브리드 검색 (Vector + BM25) + MMR Reranking"""
-    if top_k is None:
-        top_k = settings.TOP_K
+def _mmr_rerank_vectors(
+    relevance: np.ndarray, embeddings: np.ndarray, top_k: int, lambda_val: float = 0.6
+) -> List[int]:
+    """MMR (임베딩 공간) - 후보 간 코사인 유사도 행렬을 한 번만 계산
 
-    # 1단계: 질문 임베딩
-    embeddings = await call_ollama_embedding([query])
-    query_embedding = embeddings[0]
-    embedding_str = "[" + ",".join(str(x) for x in query_embedding) + "]"
-
-    # 2단계: 벡터 검색 - 후보 더 많이 가져오기 (top_k * 3)
-    candidate_k = min(top_k * 3, 20)
-    search_query = sql_text("""
-        SELECT dc.id, dc.content, dc.document_id, dc.chunk_index,
-               d.filename,
-               dc.embedding <=> CAST(:embedding AS vector) AS distance
-        FROM document_chunks dc
-        JOIN documents d ON d.id = dc.document_id
-        WHERE d.status = 'completed'
-        ORDER BY dc.embedding <=> CAST(:embedding AS vector)
+    선택 단계마다 후보별 최대 유사도 벡터만 갱신하므로 O(후보 수 × top_k) 벡터 연산입니다.
+
+    Returns:
+        선택된 후보 인덱스 (선택 순)
+    """
+    n = len(relevance)
+    if n == 0:
+        return []
+
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    vectors = embeddings / np.maximum(norms, 1e-12)
+    sim_matrix = vectors @ vectors.T
+
+    max_sim = np.zeros(n, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+    selected: List[int] = []
+
+    while len(selected) < min(top_k, n):
+        if not selected:
+            # 첫 번째는 가장 높은 점수 선택
+            mmr = relevance.astype(np.float32, copy=True)
+        else:
+            mmr = lambda_val * relevance - (1 - lambda_val) * max_sim
+        mmr[~available] = -np.inf
+        best = int(np.argmax(mmr))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_sim, sim_matrix[best], out=max_sim)
+
+    return selected
+
+
+_CANDIDATE_COLUMNS = """
+    SELECT dc.id, dc.content, dc.document_id, dc.chunk_index,
+           d.filename,
+           dc.embedding <=> CAST(:embedding AS vector) AS distance,
+           dc.embedding, dc.term_freqs, dc.token_count
+    FROM {table} dc
+    JOIN documents d ON d.id = dc.document_id
+"""
+
+
+def _candidate_query(sql: str, table: str = "document_chunks"):
+    """후보 조회 SQL (embedding은 numpy 배열, term_freqs는 dict로 변환)
+
+    table에 파티션 테이블을 지정하면 해당 파티션만 조회합니다.
+    """
+    return sql_text(_CANDIDATE_COLUMNS.format(table=table) + sql).columns(
+        embedding=Vector(settings.EMBEDDING_DIMENSION),
+        term_freqs=JSON,
+    )
+
+
+def _vector_search_sql(filter_sql: str = "", exact: bool = False) -> str:
+    """벡터 검색 WHERE / ORDER BY 절
+
+    HNSW 부분 인덱스(WHERE searchable)와 같은 조건을 포함해야 인덱스가 사용됩니다.
+    exact=True 이면 정렬식을 인덱스 연산자와 다르게(+ 0) 만들어 HNSW를 우회하고,
+    범위 필터 인덱스로 찾은 청크에 대해 정확한 거리로 정렬합니다.
+    """
+    distance = "dc.embedding <=> CAST(:embedding AS vector)"
+    order_by = f"({distance}) + 0" if exact else distance
+    return f"""
+        WHERE dc.searchable {filter_sql}
+        ORDER BY {order_by}
         LIMIT :top_k
-    """)
+    """
+
+
+_iterative_scan_supported: Optional[bool] = None
+
+
+async def _iterative_scan_available(db: AsyncSession) -> bool:
+    """hnsw.iterative_scan 사용 가능 여부 (pgvector 0.8+, 워커당 한 번 확인)
+
+    이전 버전에서는 hnsw.* 설정 이름이 예약되어 있어 set_config가 오류를 내므로 설정하지 않습니다.
+    """
+    global _iterative_scan_supported
+    if settings.HNSW_ITERATIVE_SCAN == "off":
+        return False
+    if _iterative_scan_supported is None:
+        version = (await db.execute(
+            sql_text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        )).scalar() or "0"
+        parts = [int(p) if p.isdigit() else 0 for p in version.split(".")[:2]]
+        _iterative_scan_supported = tuple(parts) >= (0, 8)
+        if not _iterative_scan_supported:
+            logger.warning(
+                f"pgvector {version}: hnsw.iterative_scan 미지원 (0.8 이상 필요) - "
+                f"HNSW_ITERATIVE_SCAN={settings.HNSW_ITERATIVE_SCAN} 설정 무시"
+            )
+    return _iterative_scan_supported
+
+
+async def _apply_hnsw_settings(db: AsyncSession, candidate_k: int) -> None:
+    """현재 트랜잭션에 HNSW 검색 파라미터 적용 (SET LOCAL)"""
+    ef_search = max(settings.HNSW_EF_SEARCH, candidate_k)
+    if not await _iterative_scan_available(db):
+        await db.execute(
+            sql_text("SELECT set_config('hnsw.ef_search', :ef_search, true)"),
+            {"ef_search": str(ef_search)},
+        )
+    else:
+        await db.execute(
+            sql_text("""
+                SELECT set_config('hnsw.ef_search', :ef_search, true),
+                       set_config('hnsw.iterative_scan', :iterative_scan, true)
+            """),
+            {"ef_search": str(ef_search), "iterative_scan": settings.HNSW_ITERATIVE_SCAN},
+        )
+
+
+async def check_vector_index_usage(db: AsyncSession) -> bool:
+    """벡터 검색 쿼리가 HNSW 인덱스를 사용하는지 EXPLAIN으로 확인"""
+    import json
+
+    zero_vector = np.zeros(settings.EMBEDDING_DIMENSION, dtype=np.float32)
+    await _apply_hnsw_settings(db, settings.MAX_CANDIDATE_K)
+    result = await db.execute(
+        sql_text(
+            "EXPLAIN (FORMAT JSON) "
+            + _CANDIDATE_COLUMNS.format(table="document_chunks")
+            + _vector_search_sql()
+        ),
+        {"embedding": zero_vector, "top_k": settings.MAX_CANDIDATE_K},
+    )
+    plan = result.scalar()
+    plan_text = plan if isinstance(plan, str) else json.dumps(plan)
+    # 파티션 테이블은 파티션별 로컬 인덱스(document_chunks_pN_embedding_idx)를 사용
+    return "idx_chunk_embedding_searchable" in plan_text or "_embedding_idx" in plan_text
+
+
+async def _estimate_scope_rows(db: AsyncSession, filter_sql: str, params: dict) -> int:
+    """검색 범위 내 청크 수 추정 (플래너 통계 기반, 실제 스캔 없음)"""
+    import json
 
+    result = await db.execute(
+        sql_text(
+            "EXPLAIN (FORMAT JSON) SELECT 1 FROM document_chunks dc "
+            f"WHERE dc.searchable {filter_sql}"
+        ),
+        params,
+    )
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def _vector_search(
+    query: str, db: AsyncSession, top_k: int, scope: Optional[SearchScope] = None
+) -> tuple[np.ndarray, list]:
+    """벡터 검색 (질문 임베딩 + 적응형 후보 확장)
+
+    첫 페이지(top_k * 3, 최대 MAX_CANDIDATE_K)에서 임계값을 넘는 후보가 부족하면
+    직전 페이지의 마지막 거리 이후부터(keyset) 두 배 크기 페이지를 이어서 가져옵니다.
+    다음 조건 중 하나에 도달하면 중단합니다.
+    - 임계값 통과 후보가 top_k * ADAPTIVE_TARGET_FACTOR 개 이상
+    - 페이지에서 가장 먼 후보가 임계값 미만 (이후 후보도 통과 불가)
+    - 검색 범위 소진 / ADAPTIVE_MAX_CANDIDATES / ADAPTIVE_SEARCH_BUDGET_MS 초과
+    """
+    embed_started = time.perf_counter()
+    embeddings = await call_ollama_embedding([query])
+    # pgvector asyncpg 코덱이 바이너리로 전송 (문자열 직렬화 없음)
+    query_embedding = np.asarray(embeddings[0], dtype=np.float32)
+
+    started = time.perf_counter()
+    embed_ms = (started - embed_started) * 1000
+    budget = settings.ADAPTIVE_SEARCH_BUDGET_MS / 1000
+    target = top_k * settings.ADAPTIVE_TARGET_FACTOR
+    page_size = min(top_k * 3, settings.MAX_CANDIDATE_K)
+
+    # 문서 단위 1단계 검색은 페이지마다 반복하지 않고 한 번만 수행
+    coarse_document_ids = await _coarse_candidates(query_embedding, db, scope)
+
+    rows: list = []
+    passing = 0
+    pages = 0
+    after = None
+    while True:
+        page = await search_by_embedding(
+            query_embedding, db, page_size, scope, after=after,
+            coarse_document_ids=coarse_document_ids,
+        )
+        pages += 1
+        rows.extend(page)
+        passing += sum(1 for row in page if 1 - row.distance >= settings.SIMILARITY_THRESHOLD)
+        if len(page) < page_size:
+            break
+        # iterative_scan=relaxed_order는 페이지 안 순서가 조금 어긋날 수 있으므로 최대 거리 기준
+        page_max_distance = max(row.distance for row in page)
+
+        if (
+            passing >= target
+            or 1 - page_max_distance < settings.SIMILARITY_THRESHOLD
+            or len(rows) >= settings.ADAPTIVE_MAX_CANDIDATES
+            or time.perf_counter() - started >= budget
+        ):
+            break
+        after = (page_max_distance, [row[0] for row in rows])
+        page_size = min(page_size * 2, settings.ADAPTIVE_MAX_CANDIDATES - len(rows))
+
+    logger.info(
+        f"벡터 후보 확장: {pages}페이지, 후보 {len(rows)}개 (임계값 통과 {passing}개, "
+        f"임베딩 {embed_ms:.0f}ms, 검색 {(time.perf_counter() - started) * 1000:.0f}ms)"
+    )
+    return query_embedding, rows
+
+
+async def search_by_embedding(
+    query_embedding: np.ndarray,
+    db: AsyncSession,
+    candidate_k: int,
+    scope: Optional[SearchScope] = None,
+    after: Optional[Tuple[float, Sequence[str]]] = None,
+    coarse_document_ids: Optional[Sequence[str]] = None,
+) -> list:
+    """임베딩으로 후보 청크 조회
+
+    검색 범위가 제한된 경우 플래너 추정 행 수로 전략을 고릅니다.
+    작은 범위는 필터 인덱스 + 정확 거리 계산, 큰 범위는 HNSW + iterative scan.
+
+    after=(거리, 이미 가져온 청크 id)를 주면 그 거리 이후의 다음 페이지를 조회합니다.
+    coarse_document_ids는 미리 구한 1단계 문서 후보입니다 (None이면 여기서 조회).
+    """
+    scope_sql, scope_params = scope_filter(scope)
+    filter_sql, params = scope_sql, dict(scope_params)
+    if after is not None:
+        filter_sql += (
+            " AND (dc.embedding <=> CAST(:embedding AS vector)) >= :after_distance"
+            " AND dc.id <> ALL(:seen_ids)"
+        )
+        params["after_distance"] = after[0]
+        params["seen_ids"] = list(after[1])
+
+    exact = False
+    if coarse_document_ids is None:
+        coarse_document_ids = await _coarse_candidates(query_embedding, db, scope)
+    if coarse_document_ids:
+        filter_sql += " AND dc.document_id = ANY(:coarse_document_ids)"
+        params["coarse_document_ids"] = list(coarse_document_ids)
+        exact = settings.COARSE_FINE_EXACT
+        if not exact:
+            await _apply_hnsw_settings(db, candidate_k)
+        return await _execute_vector_search(query_embedding, db, candidate_k, filter_sql, params, exact)
+
+    if scope_sql:
+        estimated = await _estimate_scope_rows(db, scope_sql, scope_params)
+        exact = estimated <= settings.EXACT_SEARCH_MAX_ROWS
+        logger.debug(f"검색 범위 추정 {estimated}행 → {'정확 검색' if exact else 'HNSW'}")
+
+    if not exact:
+        if after is None:
+            rows = await _segment_search(query_embedding, db, candidate_k, filter_sql, params)
+            if rows is not None:
+                return rows
+        partitions = chunk_partition_tables()
+        if partitions:
+            return await _partitioned_search(query_embedding, partitions, candidate_k, filter_sql, params)
+        await _apply_hnsw_settings(db, candidate_k)
+    return await _execute_vector_search(query_embedding, db, candidate_k, filter_sql, params, exact)
+
+
+async def _execute_vector_search(
+    query_embedding: np.ndarray, db: AsyncSession, candidate_k: int,
+    filter_sql: str, params: dict, exact: bool,
+) -> list:
+    search_query = _candidate_query(_vector_search_sql(filter_sql, exact=exact))
     result = await db.execute(
         search_query,
-        {"embedding": embedding_str, "top_k": candidate_k},
+        {"embedding": query_embedding, "top_k": candidate_k, **params},
+    )
+    return result.fetchall()
+
+
+async def _coarse_candidates(
+    query_embedding: np.ndarray, db: AsyncSession, scope: Optional[SearchScope] = None
+) -> List[str]:
+    """coarse-to-fine 1단계 문서 후보 (비활성/문서 지정 범위면 빈 리스트 = 좁히지 않음)"""
+    if not settings.COARSE_TO_FINE_ENABLED or (scope and scope.document_ids):
+        return []
+    return await _coarse_document_search(query_embedding, db, scope)
+
+
+async def _coarse_document_search(
+    query_embedding: np.ndarray, db: AsyncSession, scope: Optional[SearchScope] = None
+) -> List[str]:
+    """1단계: 문서 대표 벡터로 상위 문서 선별 (documents HNSW 인덱스)"""
+    filter_sql, params = scope_filter(scope, alias="d", owner_column="uploaded_by", document_column="id")
+    await _apply_hnsw_settings(db, settings.COARSE_TOP_DOCUMENTS)
+    result = await db.execute(
+        sql_text(f"""
+            SELECT d.id FROM documents d
+            WHERE d.status = 'completed' {filter_sql}
+            ORDER BY d.embedding <=> CAST(:embedding AS vector)
+            LIMIT :top_n
+        """),
+        {"embedding": query_embedding, "top_n": settings.COARSE_TOP_DOCUMENTS, **params},
+    )
+    return list(result.scalars().all())
+
+
+async def _search_partition(
+    table: str, query_embedding: np.ndarray, candidate_k: int, filter_sql: str, params: dict
+) -> list:
+    """단일 파티션 HNSW 검색 (파티션별 별도 세션, 동시 연결 수는 _partition_slots로 제한)"""
+    async with _partition_slots, async_session() as part_db:
+        await apply_statement_timeout(part_db)
+        await _apply_hnsw_settings(part_db, candidate_k)
+        result = await part_db.execute(
+            _candidate_query(_vector_search_sql(filter_sql), table=table),
+            {"embedding": query_embedding, "top_k": candidate_k, **params},
+        )
+        return result.fetchall()
+
+
+async def _partitioned_search(
+    query_embedding: np.ndarray, partitions: List[str], candidate_k: int, filter_sql: str, params: dict
+) -> list:
+    """파티션별 top-k를 동시에 조회한 뒤 거리 순으로 병합 (최대 PARTITION_SEARCH_CONCURRENCY개씩)"""
+    results = await asyncio.gather(*(
+        _search_partition(table, query_embedding, candidate_k, filter_sql, params)
+        for table in partitions
+    ))
+    rows = [row for part_rows in results for row in part_rows]
+    rows.sort(key=lambda row: row.distance)
+    return rows[:candidate_k]
+
+
+async def _segment_search(
+    query_embedding: np.ndarray, db: AsyncSession, candidate_k: int, filter_sql: str, params: dict
+) -> Optional[list]:
+    """프로세스 내 벡터 세그먼트로 후보 id를 찾고 DB에서는 id 조회만 수행
+
+    세그먼트에는 공개 범위 정보가 없으므로 여유 있게 가져와 SQL에서 범위를 거르고,
+    걸러진 결과가 부족하면 None을 반환하여 pgvector 검색으로 폴백합니다.
+    """
+    segment = get_segment()
+    if segment is None:
+        return None
+
+    fetch_k = candidate_k * SEGMENT_OVERFETCH if filter_sql else candidate_k
+    try:
+        chunk_ids = await asyncio.to_thread(segment.search, query_embedding, fetch_k)
+    except Exception as e:
+        logger.warning(f"벡터 세그먼트 검색 실패 (pgvector로 폴백): {e}")
+        return None
+
+    search_query = _candidate_query(f"""
+        WHERE dc.id = ANY(:chunk_ids) AND dc.searchable {filter_sql}
+        ORDER BY distance
+        LIMIT :top_k
+    """).bindparams(bindparam("chunk_ids", type_=ARRAY(String)))
+    result = await db.execute(
+        search_query,
+        {"embedding": query_embedding, "chunk_ids": chunk_ids, "top_k": candidate_k, **params},
     )
     rows = result.fetchall()
+    if len(rows) < candidate_k and len(chunk_ids) >= fetch_k:
+        return None
+    return rows
+
+
+async def _lexical_search(
+    query_tokens: List[str], top_k: int, scope: Optional[SearchScope] = None
+) -> Optional[List[tuple]]:
+    """BM25 역색인 검색 (별도 세션에서 벡터 검색과 병렬 실행)
+
+    색인 조회 실패 시 None을 반환하여 후보 내 BM25로 폴백합니다.
+    """
+    try:
+        async with async_session() as lex_db:
+            await apply_statement_timeout(lex_db)
+            return await search_lexical(query_tokens, lex_db, top_k=top_k, scope=scope)
+    except Exception as e:
+        logger.warning(f"BM25 색인 검색 실패 (후보 내 BM25로 폴백): {e}")
+        return None
+
+
+async def retrieve_relevant_chunks(
+    query: str, db: AsyncSession, top_k: int = None, scope: Optional[SearchScope] = None
+) -> List[dict]:
+    """하이브리드 검색 (Vector + BM25) + MMR Reranking
+
+    scope가 주어지면 해당 사용자가 볼 수 있는 문서의 청크만 검색합니다.
+    """
+    if top_k is None:
+        top_k = settings.TOP_K
+
+    # 요청 처리 기한이 있으면 남은 시간만큼 statement_timeout 적용
+    await apply_statement_timeout(db)
+    query_tokens = tokenize(query)
+
+    # 1~2단계: 벡터 검색(임베딩 + 적응형 후보 확장)과 BM25 역색인 검색을 병렬 실행
+    (query_embedding, rows), lexical_hits = await asyncio.gather(
+        _vector_search(query, db, top_k, scope),
+        _lexical_search(query_tokens, settings.LEXICAL_TOP_K, scope),
+    )
+
+    # 어휘 검색에서만 나온 청크는 벡터 거리와 함께 추가 조회
+    lexical_scores = dict(lexical_hits or [])
+    vector_ids = {row[0] for row in rows}
+    lexical_only = [cid for cid in lexical_scores if cid not in vector_ids]
+    if lexical_only:
+        result = await db.execute(
+            _candidate_query("WHERE dc.id = ANY(:ids)").bindparams(
+                bindparam("ids", type_=ARRAY(String))
+            ),
+            {"embedding": query_embedding, "ids": lexical_only},
+        )
+        rows = list(rows) + result.fetchall()
 
     if not rows:
         return []
 
-    # 3단계: 유사도 임계값 필터링
-    candidates = []
-    for row in rows:
-        chunk_id, content, doc_id, chunk_index, filename, distance = row
-        vector_score = round(1 - distance, 4)
-        if vector_score >= settings.SIMILARITY_THRESHOLD:
-            candidates.append({
-                "chunk_id": chunk_id,
-                "content": content,
-                "document_id": doc_id,
-                "chunk_index": chunk_index,
-                "filename": filename,
-                "vector_score": vector_score,
-            })
-
-    if not candidates:
+    # 3단계: 유사도 임계값 필터링 (BM25 상위 청크는 임계값과 무관하게 유지)
+    cands = _CandidateSet(rows)
+    is_lexical = np.fromiter(
+        (cid in lexical_scores for cid in cands.chunk_ids), dtype=bool, count=len(cands)
+    )
+    cands = cands.select((cands.vector_scores >= settings.SIMILARITY_THRESHOLD) | is_lexical)
+
+    if not len(cands):
         return []
 
     # 4단계: BM25 점수 계산
-    query_tokens = _tokenize(query)
-    all_tokens = [_tokenize(c["content"]) for c in candidates]
-    avgdl = sum(len(t) for t in all_tokens) / max(len(all_tokens), 1)
-
-    bm25_scores = [
-        _bm25_score(query_tokens, doc_tokens, avgdl)
-        for doc_tokens in all_tokens
-    ]
+    if lexical_hits is not None:
+        # 코퍼스 IDF 기반 점수 (역색인 상위에 없는 벡터 후보는 추가 계산)
+        missing = [cid for cid in cands.chunk_ids if cid not in lexical_scores]
+        if missing:
+            lexical_scores.update(await search_lexical(query_tokens, db, chunk_ids=missing))
+        bm25 = np.fromiter(
+            (lexical_scores.get(cid, 0.0) for cid in cands.chunk_ids),
+            dtype=np.float32, count=len(cands),
+        )
+    else:
+        bm25 = _bm25_scores(query_tokens, cands)
 
     # BM25 정규화 (0~1)
-    max_bm25 = max(bm25_scores) if bm25_scores else 1.0
+    max_bm25 = float(bm25.max())
     if max_bm25 > 0:
-        bm25_scores = [s / max_bm25 for s in bm25_scores]
+        bm25 = bm25 / max_bm25
 
-    # 5단계: 하이브리드 점수 합산 (벡터 70% + BM25 30%)
-    for i, cand in enumerate(candidates):
-        cand["bm25_score"] = round(bm25_scores[i], 4)
-        cand["hybrid_score"] = round(
-            0.7 * cand["vector_score"] + 0.3 * cand["bm25_score"], 4
-        )
+    # 5단계: 하이브리드 점수 합산 (기본 벡터 70% + BM25 30%)
+    hybrid = (
+        settings.HYBRID_VECTOR_WEIGHT * cands.vector_scores
+        + settings.HYBRID_BM25_WEIGHT * bm25
+    )
 
     # 6단계: MMR Reranking으로 다양하고 관련성 높은 top_k 선택
-    final_results = _mmr_rerank(candidates, top_k)
+    # (임베딩 공간 MMR, 임베딩이 없는 후보가 있으면 토큰 Jaccard MMR로 폴백)
+    if cands.embeddings is not None:
+        selected = _mmr_rerank_vectors(hybrid, cands.embeddings, top_k)
+    else:
+        selected = _mmr_rerank(hybrid, [set(tf) for tf in cands.term_freqs], top_k)
 
-    # 노출용 점수는 hybrid_score 사용
-    for r in final_results:
-        r["score"] = r["hybrid_score"]
+    final_results = []
+    for i in selected:
+        result = cands.to_result(i, bm25[i], hybrid[i])
+        # 노출용 점수는 hybrid_score 사용
+        result["score"] = result["hybrid_score"]
+        final_results.append(result)
 
     logger.info(
-        f"검색 완료: 후보 {len(candidates)}개 → MMR 선택 {len(final_results)}개 "
-        f"(벡터70%+BM25 30%)"
+        f"검색 완료: 후보 {len(cands)}개 (BM25 색인 {len(lexical_only)}개 추가) "
+        f"→ MMR 선택 {len(final_results)}개 "
+        f"(벡터 {settings.HYBRID_VECTOR_WEIGHT:.0%} + BM25 {settings.HYBRID_BM25_WEIGHT:.0%})"
     )
     return final_results
-
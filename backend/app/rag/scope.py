@@ -0,0 +1,73 @@
+"""
+Search Scope - 검색 대상 청크 범위 (문서 공개 범위 ACL + 문서 지정)
+
+문서 공개 범위는 청크에 비정규화(visibility, department, owner_id)되어 있어
+문서 JOIN 없이 document_chunks 만으로 필터링합니다.
+"""
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple
+
+VISIBILITY_PUBLIC = "public"          # 전체 사용자
+VISIBILITY_DEPARTMENT = "department"  # 업로더와 같은 부서
+VISIBILITY_PRIVATE = "private"        # 업로더 본인
+VISIBILITIES = (VISIBILITY_PUBLIC, VISIBILITY_DEPARTMENT, VISIBILITY_PRIVATE)
+
+
+@dataclass(frozen=True)
+class SearchScope:
+    """검색 범위 (None 이면 전체 청크)
+
+    document_ids가 있으면 공개 범위 조건에 더해 해당 문서로만 검색을 제한합니다.
+    """
+    user_id: Optional[str] = None
+    department: Optional[str] = None
+    is_admin: bool = False
+    document_ids: Optional[Tuple[str, ...]] = None
+
+    @classmethod
+    def for_user(cls, user, document_ids: Optional[Iterable[str]] = None) -> "SearchScope":
+        return cls(
+            user_id=user.id,
+            department=getattr(user, "department", None),
+            is_admin=user.role == "admin",
+            document_ids=tuple(dict.fromkeys(document_ids)) if document_ids else None,
+        )
+
+    @property
+    def unrestricted(self) -> bool:
+        """공개 범위 제한 없음 (관리자 / 사용자 미지정)"""
+        return self.is_admin or self.user_id is None
+
+
+def scope_filter(
+    scope: Optional[SearchScope],
+    alias: str = "dc",
+    owner_column: str = "owner_id",
+    document_column: str = "document_id",
+) -> Tuple[str, dict]:
+    """검색 범위 SQL 조건 (`AND ...` 형태) 및 바인드 파라미터
+
+    documents 테이블에 적용할 때는 owner_column="uploaded_by", document_column="id".
+    """
+    if scope is None:
+        return "", {}
+
+    sql, params = "", {}
+    if scope.document_ids:
+        sql = f"AND {alias}.{document_column} = ANY(:scope_document_ids)"
+        params["scope_document_ids"] = list(scope.document_ids)
+    if scope.unrestricted:
+        return sql, params
+
+    conditions = [
+        f"{alias}.visibility = '{VISIBILITY_PUBLIC}'",
+        f"{alias}.{owner_column} = :scope_user_id",
+    ]
+    params["scope_user_id"] = scope.user_id
+    if scope.department:
+        conditions.append(
+            f"({alias}.visibility = '{VISIBILITY_DEPARTMENT}' "
+            f"AND {alias}.department = :scope_department)"
+        )
+        params["scope_department"] = scope.department
+    return f"{sql} AND ({' OR '.join(conditions)})".lstrip(), params
@@ -0,0 +1,36 @@
+"""
+Tokenizer - 한국어/영어 어휘 토크나이저
+
+정규식은 모듈 로드 시 한 번만 컴파일합니다. 청크의 term frequency는 저장 시
+한 번 계산해 document_chunks.term_freqs 에 보관하므로, 쿼리 시에는 질의문만 토큰화합니다.
+"""
+import re
+from collections import Counter
+from operator import add
+from typing import Dict, List
+
+MAX_TERM_LENGTH = 64  # 역색인 term 최대 길이
+
+# 한국어 2글자 이상 단어 + 영어/숫자 단어
+_WORD_PATTERN = re.compile(r'[가-힣]{2,}|[a-z0-9]+')
+# 2-gram 대상 한국어 연속 구간 (1글자 구간은 2-gram이 없으므로 제외)
+_HANGUL_RUN_PATTERN = re.compile(r'[가-힣]{2,}')
+
+
+def _bigrams(word: str) -> List[str]:
+    """문자 2-gram (map/add로 한 번에 생성)"""
+    return list(map(add, word[:-1], word[1:]))
+
+
+def tokenize(text: str) -> List[str]:
+    """간단한 한국어/영어 토크나이저 (단어 + 한국어 2-gram)"""
+    text = text.lower()
+    tokens = _WORD_PATTERN.findall(text)
+    for word in _HANGUL_RUN_PATTERN.findall(text):
+        tokens.extend(_bigrams(word))
+    return [t[:MAX_TERM_LENGTH] for t in tokens]
+
+
+def term_frequencies(text: str) -> Dict[str, int]:
+    """텍스트 → term frequency 맵"""
+    return dict(Counter(tokenize(text)))
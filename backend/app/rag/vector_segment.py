@@ -0,0 +1,602 @@
+"""
+Vector Segment - 프로세스 내 벡터 검색 엔진 (선택 기능)
+
+청크 id와 float16 임베딩을 append-only 세그먼트 파일에 저장하고,
+모든 uvicorn 워커가 이를 읽기 전용 mmap으로 공유합니다.
+
+- 파일 잠금(flock)을 얻은 워커 하나만 writer가 되어 chunk_changes 변경 피드로 동기화
+- 나머지 워커는 meta.json 변경을 감지해 mmap을 다시 엽니다
+- 검색은 블록 단위 NumPy 행렬-벡터 곱 (임베딩은 저장 시 정규화 → 내적 = 코사인)
+- 세그먼트를 사용할 수 없으면 호출자가 pgvector로 폴백합니다
+
+변경 피드의 id(BIGSERIAL)는 커밋 순서와 다를 수 있으므로, 읽은 id 사이의 빈 구간(gap)을
+기억해 두었다가 그 시점에 진행 중이던 트랜잭션이 모두 끝날 때까지 다시 확인합니다.
+트리거가 다시 만들어지면(oid 변경) 그 사이 변경을 놓쳤을 수 있으므로 새 세대로 재적재합니다.
+
+추가/삭제 모두 meta.json 교체 시점에만 readers에게 보입니다. 추가 행은 파일 끝(count 이후)에
+쓰고, 삭제 표시는 커밋된 alive 파일을 건드리지 않고 새 버전 alive 파일에 씁니다. 삭제 행
+비율이 VECTOR_SEGMENT_COMPACT_RATIO 이상이면 유효 행만 새 세대 파일로 다시 써서 압축합니다.
+
+파일 구성 (VECTOR_SEGMENT_DIR, {gen} = 세대, {ver} = alive 버전):
+    vectors-{gen}.f16     N × D float16
+    ids-{gen}.bin         N × 36 bytes (청크 UUID)
+    alive-{gen}.{ver}.u8  N bytes (1 = 유효, 0 = 삭제됨)
+    meta.json             {"count", "dimension", "feed", "generation", "alive_version", "watermark"}
+"""
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import re
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import String, bindparam, text as sql_text
+from sqlalchemy.dialects.postgresql import ARRAY
+from app.config import get_settings
+from app.database import async_session
+from app.models.types import Vector
+
+settings = get_settings()
+logger = logging.getLogger("baikal.segment")
+
+ID_WIDTH = 36
+SEARCH_BLOCK_ROWS = 65536
+SYNC_BATCH_SIZE = 1000
+DATA_FILES = ("vectors.f16", "ids.bin")
+_SEGMENT_FILE = re.compile(r"^(vectors|ids|alive)-[0-9.]+\.(f16|bin|u8)$")
+
+
+class _View(NamedTuple):
+    """커밋된 세그먼트 스냅샷 (검색 스레드는 이 튜플 하나만 읽음)"""
+    count: int
+    vectors: Optional[np.ndarray]
+    ids: Optional[np.ndarray]
+    alive: Optional[np.ndarray]
+
+
+_EMPTY_VIEW = _View(0, None, None, None)
+
+
+class VectorSegment:
+    """mmap 기반 append-only 벡터 세그먼트"""
+
+    def __init__(self, directory: str, dimension: int):
+        self.directory = directory
+        self.dimension = dimension
+        self.feed: Optional[int] = None  # 커밋된 세그먼트의 변경 피드 (None = 미준비)
+        self.generation: Optional[int] = None  # 커밋된 데이터 파일 세대
+        self.alive_version = 0  # 커밋된 alive 파일 버전
+        self.watermark = 0  # 이 id 이하의 변경은 모두 반영됨
+        self.is_writer = False
+        self._view = _EMPTY_VIEW
+        self._view_lock = threading.Lock()
+        self._meta_mtime = 0
+        self._lock_fd: Optional[int] = None
+        # writer 전용 (commit 전까지 readers에게 보이지 않음)
+        self._writing_feed: Optional[int] = None
+        self._writing_gen: Optional[int] = None
+        self._writing_alive = 0  # 추가 행의 alive 값을 쓰는 파일 버전
+        self._rows = 0  # 파일에 기록된 행 수
+        self._row_of: Dict[str, int] = {}  # chunk_id → 행 번호 (유효 행만)
+        self._tombstones: List[int] = []  # 다음 commit에 삭제 표시할 행
+        self._dead = 0  # 삭제 표시된 행 수 (커밋 대기 포함)
+        self._frontier = 0  # 반영한 가장 큰 변경 id
+        self._gaps: List[List[int]] = []  # [시작 id, 끝 id, horizon xid] 아직 보이지 않은 변경 id 구간
+
+    @property
+    def count(self) -> int:
+        return self._view.count
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _data_path(self, name: str, generation: int) -> str:
+        stem, ext = os.path.splitext(name)
+        return self._path(f"{stem}-{generation}{ext}")
+
+    def _alive_path(self, generation: int, version: int) -> str:
+        return self._path(f"alive-{generation}.{version}.u8")
+
+    # ---- 읽기 ----
+
+    def refresh(self) -> None:
+        """meta.json 이 바뀌었으면 mmap을 다시 연다 (다른 워커의 commit 반영)"""
+        meta_path = self._path("meta.json")
+        try:
+            mtime = os.stat(meta_path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        with self._view_lock:
+            if mtime == self._meta_mtime:
+                return
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta["dimension"] != self.dimension:
+                raise ValueError(
+                    f"세그먼트 차원 불일치: {meta['dimension']} != {self.dimension}"
+                )
+            self._meta_mtime = mtime
+            self._load(meta)
+
+    def _load(self, meta: dict) -> None:
+        # 피드/세대 정보가 없는 이전 형식은 미준비로 취급 (재적재)
+        generation = meta.get("generation")
+        self.feed = meta.get("feed") if generation is not None else None
+        self.generation = generation
+        self.alive_version = meta.get("alive_version", 0)
+        self.watermark = meta["watermark"]
+        if self.feed is None or meta["count"] == 0:
+            self._view = _EMPTY_VIEW
+            return
+        count = meta["count"]
+        self._view = _View(
+            count,
+            np.memmap(
+                self._data_path("vectors.f16", generation), dtype=np.float16, mode="r",
+                shape=(count, self.dimension),
+            ),
+            np.memmap(
+                self._data_path("ids.bin", generation), dtype=f"S{ID_WIDTH}", mode="r", shape=(count,)
+            ),
+            np.memmap(
+                self._alive_path(generation, self.alive_version), dtype=np.uint8, mode="r",
+                shape=(count,),
+            ),
+        )
+
+    def search(self, query: np.ndarray, k: int) -> List[str]:
+        """코사인 유사도 상위 k개 청크 id (블록 단위 행렬-벡터 곱)"""
+        self.refresh()
+        view = self._view
+        if view.vectors is None or k <= 0:
+            return []
+
+        q = np.asarray(query, dtype=np.float32)
+        q = q / max(float(np.linalg.norm(q)), 1e-12)
+
+        best_scores = np.empty(0, dtype=np.float32)
+        best_rows = np.empty(0, dtype=np.int64)
+        for start in range(0, view.count, SEARCH_BLOCK_ROWS):
+            end = min(start + SEARCH_BLOCK_ROWS, view.count)
+            scores = view.vectors[start:end].astype(np.float32) @ q
+            scores[view.alive[start:end] == 0] = -np.inf
+            if end - start > k:
+                top = np.argpartition(scores, -k)[-k:]
+            else:
+                top = np.arange(end - start)
+            best_scores = np.concatenate([best_scores, scores[top]])
+            best_rows = np.concatenate([best_rows, top + start])
+            if len(best_scores) > k:
+                keep = np.argpartition(best_scores, -k)[-k:]
+                best_scores, best_rows = best_scores[keep], best_rows[keep]
+
+        order = np.argsort(-best_scores)
+        rows = best_rows[order][np.isfinite(best_scores[order])]
+        return [view.ids[r].decode() for r in rows]
+
+    # ---- 쓰기 (writer 워커 전용) ----
+
+    def try_acquire_writer(self) -> bool:
+        """세그먼트 writer 잠금 시도 (non-blocking)"""
+        if self.is_writer:
+            return True
+        os.makedirs(self.directory, exist_ok=True)
+        fd = os.open(self._path("segment.lock"), os.O_CREAT | os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        self.is_writer = True
+        self._meta_mtime = 0
+        self.refresh()
+        self._recover()
+        logger.info(f"벡터 세그먼트 writer 획득 (pid={os.getpid()}, {self.count} rows)")
+        return True
+
+    def release_writer(self) -> None:
+        if self._lock_fd is not None:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+            os.close(self._lock_fd)
+        self._lock_fd = None
+        self.is_writer = False
+
+    def _recover(self) -> None:
+        """writer 상태를 커밋된 meta 기준으로 맞춤
+
+        이전 writer가 commit 전에 남긴 꼬리 행과, 커밋되지 못한 세대/alive 버전 파일을 지웁니다.
+        meta 이후의 gap 정보는 저장하지 않으므로 watermark 이후 변경을 다시 읽습니다 (반영은 멱등).
+        """
+        self._writing_feed = self.feed
+        self._writing_gen = self.generation
+        self._writing_alive = self.alive_version
+        self._rows = self.count
+        self._row_of = {}
+        self._tombstones = []
+        self._dead = 0
+        self._frontier = self.watermark
+        self._gaps = []
+        committed = set()
+        if self.generation is not None:
+            committed = {
+                os.path.basename(self._data_path(name, self.generation)) for name in DATA_FILES
+            } | {os.path.basename(self._alive_path(self.generation, self.alive_version))}
+        for name in os.listdir(self.directory):
+            if _SEGMENT_FILE.match(name) and name not in committed:
+                os.remove(self._path(name))
+        if self.feed is None:
+            return
+        widths = {
+            self._data_path("vectors.f16", self.generation): self.dimension * 2,
+            self._data_path("ids.bin", self.generation): ID_WIDTH,
+            self._alive_path(self.generation, self.alive_version): 1,
+        }
+        for path, width in widths.items():
+            if os.path.exists(path) and os.path.getsize(path) > self._rows * width:
+                os.truncate(path, self._rows * width)
+        if self._rows:
+            ids = np.fromfile(
+                self._data_path("ids.bin", self.generation), dtype=f"S{ID_WIDTH}", count=self._rows
+            )
+            alive = np.fromfile(
+                self._alive_path(self.generation, self.alive_version), dtype=np.uint8, count=self._rows
+            )
+            self._row_of = {ids[i].decode(): int(i) for i in np.flatnonzero(alive)}
+            self._dead = self._rows - len(self._row_of)
+
+    def _next_generation(self) -> int:
+        return max(self.generation or 0, self._writing_gen or 0) + 1
+
+    def reset(self, feed: int) -> None:
+        """새 변경 피드용 빈 세대로 다시 시작 (commit 전까지 readers는 이전 파일을 계속 사용)"""
+        self._writing_feed = feed
+        self._writing_gen = self._next_generation()
+        self._writing_alive = 0
+        for name in DATA_FILES:
+            open(self._data_path(name, self._writing_gen), "wb").close()
+        open(self._alive_path(self._writing_gen, 0), "wb").close()
+        self._rows = 0
+        self._row_of = {}
+        self._tombstones = []
+        self._dead = 0
+        self._frontier = 0
+        self._gaps = []
+
+    def contains(self, chunk_id: str) -> bool:
+        return chunk_id in self._row_of
+
+    def append(self, chunk_ids: List[str], embeddings: np.ndarray) -> None:
+        """청크 추가 (이미 있는 id는 무시)"""
+        new = [i for i, cid in enumerate(chunk_ids) if cid not in self._row_of]
+        if not new:
+            return
+        vectors = embeddings[new].astype(np.float32)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+        generation = self._writing_gen
+        with open(self._data_path("vectors.f16", generation), "ab") as f:
+            f.write(vectors.astype(np.float16).tobytes())
+        with open(self._data_path("ids.bin", generation), "ab") as f:
+            f.write(np.array([chunk_ids[i] for i in new], dtype=f"S{ID_WIDTH}").tobytes())
+        with open(self._alive_path(generation, self._writing_alive), "ab") as f:
+            f.write(np.ones(len(new), dtype=np.uint8).tobytes())
+
+        for offset, i in enumerate(new):
+            self._row_of[chunk_ids[i]] = self._rows + offset
+        self._rows += len(new)
+
+    def remove(self, chunk_ids: List[str]) -> None:
+        """청크 삭제 표시 (tombstone, commit 시점에 반영)"""
+        rows = [self._row_of.pop(cid) for cid in chunk_ids if cid in self._row_of]
+        self._tombstones.extend(rows)
+        self._dead += len(rows)
+
+    def needs_compaction(self) -> bool:
+        return self._dead > 0 and self._dead >= self._rows * settings.VECTOR_SEGMENT_COMPACT_RATIO
+
+    def compact(self) -> None:
+        """유효 행만 새 세대 파일로 다시 쓰고 commit (readers는 commit 시점에 새 세대로 전환)"""
+        generation = self._writing_gen
+        alive = np.fromfile(
+            self._alive_path(generation, self._writing_alive), dtype=np.uint8, count=self._rows
+        )
+        alive[self._tombstones] = 0
+        keep = np.flatnonzero(alive)
+        vectors = np.memmap(
+            self._data_path("vectors.f16", generation), dtype=np.float16, mode="r",
+            shape=(self._rows, self.dimension),
+        ) if self._rows else np.empty((0, self.dimension), dtype=np.float16)
+        ids = np.fromfile(self._data_path("ids.bin", generation), dtype=f"S{ID_WIDTH}", count=self._rows)
+
+        target = self._next_generation()
+        with open(self._data_path("vectors.f16", target), "wb") as vf, \
+                open(self._data_path("ids.bin", target), "wb") as idf:
+            for start in range(0, len(keep), SEARCH_BLOCK_ROWS):
+                rows = keep[start:start + SEARCH_BLOCK_ROWS]
+                vf.write(np.ascontiguousarray(vectors[rows]).tobytes())
+                idf.write(ids[rows].tobytes())
+        with open(self._alive_path(target, 0), "wb") as f:
+            f.write(np.ones(len(keep), dtype=np.uint8).tobytes())
+        del vectors
+
+        removed = self._rows - len(keep)
+        self._writing_gen = target
+        self._writing_alive = 0
+        self._rows = len(keep)
+        self._row_of = {ids[r].decode(): i for i, r in enumerate(keep)}
+        self._tombstones = []
+        self._dead = 0
+        self.commit()
+        logger.info(f"벡터 세그먼트 압축: 삭제 행 {removed}개 제거, {self._rows} rows (gen={target})")
+
+    def seek(self, frontier: int, gaps: List[Tuple[int, int]], horizon: int) -> None:
+        """초기 적재 스냅샷 기준 피드 위치 설정 (그 스냅샷에 보이지 않던 id 구간은 gap)"""
+        self._frontier = frontier
+        self._gaps = [[lo, hi, horizon] for lo, hi in gaps]
+
+    def gap_ranges(self) -> List[Tuple[int, int]]:
+        return [(lo, hi) for lo, hi, _ in self._gaps]
+
+    @property
+    def frontier(self) -> int:
+        return self._frontier
+
+    def advance(self, change_ids: List[int], xmin: int, xmax: int, covered: Optional[int]) -> None:
+        """읽은 변경 id로 frontier/gap 갱신
+
+        gap은 그 id를 받은 트랜잭션이 아직 커밋되지 않았거나 롤백된 경우입니다. gap을 처음 본
+        스냅샷의 xmax(horizon)보다 현재 스냅샷 xmin이 크면 당시 진행 중이던 트랜잭션이 모두
+        끝난 것이므로, 이번에도 보이지 않은 id는 롤백된 것으로 보고 gap을 닫습니다.
+        covered: 배치가 LIMIT에 걸렸으면 마지막으로 읽은 id (그 이후 구간은 아직 확인하지 않음)
+        """
+        seen = sorted(change_ids)
+        gaps = []
+        for lo, hi, horizon in self._gaps:
+            start = lo
+            for cid in seen:
+                if lo <= cid <= hi:
+                    if cid > start:
+                        gaps.append([start, cid - 1, horizon])
+                    start = cid + 1
+            if start <= hi:
+                gaps.append([start, hi, horizon])
+        limit = covered if covered is not None else self._frontier
+        kept = []
+        for gap in gaps:
+            if xmin >= gap[2] and gap[0] <= limit:
+                if gap[1] <= limit:
+                    continue
+                gap[0] = limit + 1
+            kept.append(gap)
+        gaps = kept
+        for cid in seen:
+            if cid > self._frontier:
+                if cid > self._frontier + 1:
+                    gaps.append([self._frontier + 1, cid - 1, xmax])
+                self._frontier = cid
+        self._gaps = gaps
+
+    def commit(self) -> None:
+        """meta.json 원자적 갱신 (readers는 이 시점부터 새 행/삭제 표시를 본다)"""
+        if self._tombstones:
+            # 커밋된 alive 파일은 readers가 mmap 중이므로 복사본에 표시한 새 버전으로 교체
+            alive = np.fromfile(
+                self._alive_path(self._writing_gen, self._writing_alive), dtype=np.uint8,
+                count=self._rows,
+            )
+            alive[self._tombstones] = 0
+            self._writing_alive += 1
+            with open(self._alive_path(self._writing_gen, self._writing_alive), "wb") as f:
+                f.write(alive.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            self._tombstones = []
+        meta = {
+            "count": self._rows,
+            "dimension": self.dimension,
+            "feed": self._writing_feed,
+            "generation": self._writing_gen,
+            "alive_version": self._writing_alive,
+            "watermark": self._gaps[0][0] - 1 if self._gaps else self._frontier,
+        }
+        meta_path = self._path("meta.json")
+        tmp_path = self._path("meta.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, meta_path)
+
+        previous = (self.generation, self.alive_version)
+        with self._view_lock:
+            self._meta_mtime = os.stat(meta_path).st_mtime_ns
+            self._load(meta)
+        # 이전 파일을 mmap 중인 워커는 다음 refresh까지 열린 inode를 그대로 사용
+        obsolete = []
+        if previous[0] is not None and previous != (self.generation, self.alive_version):
+            obsolete.append(self._alive_path(*previous))
+            if previous[0] != self.generation:
+                obsolete += [self._data_path(name, previous[0]) for name in DATA_FILES]
+        for path in obsolete:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+_segment: Optional[VectorSegment] = None
+_sync_task: Optional[asyncio.Task] = None
+
+
+def get_segment() -> Optional[VectorSegment]:
+    """활성화된 세그먼트 (비활성/미준비 시 None)"""
+    if _segment is None:
+        return None
+    _segment.refresh()
+    return _segment if _segment.feed is not None and _segment.count else None
+
+
+async def _fetch_embeddings(db, chunk_ids: List[str]) -> tuple[List[str], np.ndarray]:
+    result = await db.execute(
+        sql_text("""
+            SELECT id, embedding FROM document_chunks
+            WHERE id = ANY(:ids) AND searchable AND embedding IS NOT NULL
+        """).bindparams(bindparam("ids", type_=ARRAY(String))).columns(
+            embedding=Vector(settings.EMBEDDING_DIMENSION)
+        ),
+        {"ids": chunk_ids},
+    )
+    rows = result.fetchall()
+    if not rows:
+        return [], np.empty((0, settings.EMBEDDING_DIMENSION), dtype=np.float32)
+    return [r[0] for r in rows], np.vstack([r[1] for r in rows])
+
+
+async def _snapshot_bounds(db) -> Tuple[int, int]:
+    """현재 트랜잭션 스냅샷의 (xmin, xmax) - REPEATABLE READ 에서 이후 조회와 같은 스냅샷"""
+    await db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    row = (await db.execute(sql_text("""
+        SELECT pg_snapshot_xmin(s)::text::bigint, pg_snapshot_xmax(s)::text::bigint
+        FROM pg_current_snapshot() AS s
+    """))).one()
+    return row[0], row[1]
+
+
+async def _current_feed() -> Optional[int]:
+    """변경 피드 트리거 oid (트리거가 없으면 None)"""
+    async with async_session() as db:
+        return (await db.execute(sql_text("""
+            SELECT oid::bigint FROM pg_trigger
+            WHERE tgname = 'trg_chunk_changes' AND tgrelid = 'document_chunks'::regclass
+        """))).scalar()
+
+
+async def _bootstrap(segment: VectorSegment, feed: int) -> None:
+    """새 피드 기준 초기 적재
+
+    청크 목록과 변경 피드 위치를 같은 스냅샷에서 읽고, 그 스냅샷에 보이지 않던 변경 id
+    (진행 중이거나 롤백된 트랜잭션)는 gap으로 남겨 이후 동기화에서 다시 확인합니다.
+    """
+    segment.reset(feed)
+    async with async_session() as db:
+        _, xmax = await _snapshot_bounds(db)
+        frontier, first = (await db.execute(
+            sql_text("SELECT COALESCE(max(id), 0), COALESCE(min(id), 1) FROM chunk_changes")
+        )).one()
+        gaps = [(1, first - 1)] if first > 1 else []
+        gaps += [tuple(row) for row in (await db.execute(sql_text("""
+            SELECT id + 1, next_id - 1 FROM (
+                SELECT id, lead(id) OVER (ORDER BY id) AS next_id FROM chunk_changes
+            ) t
+            WHERE next_id > id + 1
+            ORDER BY id
+        """))).fetchall()]
+        last_id = ""
+        while True:
+            ids = (await db.execute(
+                sql_text("""
+                    SELECT id FROM document_chunks
+                    WHERE searchable AND id > :last_id
+                    ORDER BY id
+                    LIMIT :limit
+                """),
+                {"last_id": last_id, "limit": SYNC_BATCH_SIZE},
+            )).scalars().all()
+            if not ids:
+                break
+            chunk_ids, embeddings = await _fetch_embeddings(db, list(ids))
+            segment.append(chunk_ids, embeddings)
+            last_id = ids[-1]
+    segment.seek(frontier, gaps, xmax)
+    segment.commit()
+    logger.info(f"벡터 세그먼트 초기 적재 완료: {segment.count} rows (feed={feed})")
+
+
+async def _sync_once(segment: VectorSegment) -> int:
+    """변경 피드(chunk_changes) 반영 - frontier 이후 변경과 아직 열려 있는 gap을 함께 조회"""
+    async with async_session() as db:
+        xmin, xmax = await _snapshot_bounds(db)
+        gaps = segment.gap_ranges()
+        gap_sql = "".join(
+            f" OR id BETWEEN :gap_lo_{i} AND :gap_hi_{i}" for i in range(len(gaps))
+        )
+        params = {"frontier": segment.frontier, "limit": SYNC_BATCH_SIZE}
+        for i, (lo, hi) in enumerate(gaps):
+            params[f"gap_lo_{i}"], params[f"gap_hi_{i}"] = lo, hi
+        changes = (await db.execute(
+            sql_text(f"""
+                SELECT id, chunk_id, op FROM chunk_changes
+                WHERE id > :frontier{gap_sql}
+                ORDER BY id
+                LIMIT :limit
+            """),
+            params,
+        )).fetchall()
+
+        # 다시 읽은 변경은 건너뛰도록 이미 있는 청크는 임베딩 조회 생략 (반영은 멱등)
+        inserted = [cid for _, cid, op in changes if op == "insert" and not segment.contains(cid)]
+        deleted = [cid for _, cid, op in changes if op == "delete"]
+        if inserted:
+            chunk_ids, embeddings = await _fetch_embeddings(db, inserted)
+            segment.append(chunk_ids, embeddings)
+        if deleted:
+            segment.remove(deleted)
+        covered = changes[-1][0] if len(changes) == SYNC_BATCH_SIZE else None
+        segment.advance([row[0] for row in changes], xmin, xmax, covered)
+        if changes or segment.gap_ranges() != gaps:
+            segment.commit()
+
+        # 오래된 변경 피드 정리
+        await db.execute(sql_text(
+            "DELETE FROM chunk_changes WHERE created_at < now() - interval '1 day'"
+        ))
+        await db.commit()
+        return len(changes)
+
+
+async def _sync_loop(segment: VectorSegment) -> None:
+    while True:
+        try:
+            if segment.try_acquire_writer():
+                feed = await _current_feed()
+                if feed is not None:
+                    if feed != segment.feed:
+                        await _bootstrap(segment, feed)
+                    while await _sync_once(segment) == SYNC_BATCH_SIZE:
+                        pass
+                    if segment.needs_compaction():
+                        await asyncio.to_thread(segment.compact)
+            else:
+                segment.refresh()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"벡터 세그먼트 동기화 실패: {e}")
+        await asyncio.sleep(settings.VECTOR_SEGMENT_SYNC_INTERVAL)
+
+
+def start_vector_segment() -> None:
+    """세그먼트 동기화 시작 (VECTOR_SEGMENT_ENABLED 일 때만)"""
+    global _segment, _sync_task
+    if not settings.VECTOR_SEGMENT_ENABLED:
+        return
+    _segment = VectorSegment(settings.VECTOR_SEGMENT_DIR, settings.EMBEDDING_DIMENSION)
+    _sync_task = asyncio.create_task(_sync_loop(_segment))
+    logger.info(f"벡터 세그먼트 활성화: {settings.VECTOR_SEGMENT_DIR}")
+
+
+async def stop_vector_segment() -> None:
+    global _sync_task
+    if _sync_task is not None:
+        _sync_task.cancel()
+        try:
+            await _sync_task
+        except asyncio.CancelledError:
+            pass
+        _sync_task = None
+    if _segment is not None:
+        _segment.release_writer()
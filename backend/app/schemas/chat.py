@@ -25,18 +25,27 @@ class ChatMessageResponse(BaseModel):
     role: str
     content: str
     sources: Optional[dict] = None
+    has_sources: bool = False  # sources 없이 조회했을 때 출처 존재 여부 (펼칠 때 따로 조회)
+    interrupted: bool = False
     created_at: datetime
 
     class Config:
         from_attributes = True
 
 
+class ChatMessageSourcesResponse(BaseModel):
+    id: str
+    sources: Optional[dict] = None
+
+
 class AskRequest(BaseModel):
     session_id: str
     question: str
+    document_ids: Optional[List[str]] = None  # 지정 시 해당 문서 범위에서만 검색
 
 
 class AskResponse(BaseModel):
     answer: str
     sources: List[dict]
-    message_id: str
+    message_id: Optional[str] = None  # 기한 초과(degraded) 응답은 저장하지 않으므로 None
+    degraded: bool = False
@@ -13,6 +13,7 @@ class DocumentResponse(BaseModel):
     file_size: int
     status: str
     uploaded_by: str
+    visibility: str = "public"
     error_message: Optional[str] = None
     created_at: datetime
 
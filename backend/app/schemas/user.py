@@ -10,12 +10,14 @@ class UserCreate(BaseModel):
     username: str
     password: str
     role: str = "user"
+    department: Optional[str] = None
 
 
 class UserUpdate(BaseModel):
     role: Optional[str] = None
     is_active: Optional[bool] = None
     password: Optional[str] = None
+    department: Optional[str] = None
 
 
 class UserResponse(BaseModel):
@@ -23,6 +25,7 @@ class UserResponse(BaseModel):
     username: str
     role: str
     is_active: bool
+    department: Optional[str] = None
     created_at: datetime
 
     class Config:
@@ -4,26 +4,19 @@ Document Service - 파일 업로드, 관리, 비동기 처리
 import os
 import uuid
 import logging
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 from app.models.document import Document, DocumentChunk
 from app.config import get_settings
 from app.database import async_session
+from app.rag.loader import get_supported_types, get_mime_map
+from app.rag.lexical_index import index_chunks, unindex_document
+from app.rag.scope import VISIBILITIES, VISIBILITY_DEPARTMENT, VISIBILITY_PUBLIC
 
 settings = get_settings()
 logger = logging.getLogger("baikal.document")
 
-ALLOWED_EXTENSIONS = {"pdf", "docx", "xlsx", "hwp", "hwpx"}
-MIME_TO_EXT = {
-    "application/pdf": "pdf",
-    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
-    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": "xlsx",
-    "application/x-hwp": "hwp",
-    "application/haansofthwp": "hwp",
-    "application/vnd.hancom.hwp": "hwp",
-    "application/vnd.hancom.hwpx": "hwpx",
-}
-
 
 def get_file_extension(filename: str) -> str:
     return filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
@@ -32,17 +25,19 @@ def get_file_extension(filename: str) -> str:
 def validate_file(filename: str, content_type: str | None, file_size: int) -> str:
     """파일 유효성 검사. 확장자 반환"""
     ext = get_file_extension(filename)
+    allowed_extensions = get_supported_types()
+    mime_to_ext = get_mime_map()
 
     # MIME 타입으로도 체크
-    if content_type and content_type in MIME_TO_EXT:
-        mime_ext = MIME_TO_EXT[content_type]
+    if content_type and content_type in mime_to_ext:
+        mime_ext = mime_to_ext[content_type]
         if ext != mime_ext:
             ext = mime_ext  # MIME 타입 우선
 
-    if ext not in ALLOWED_EXTENSIONS:
+    if ext not in allowed_extensions:
         raise ValueError(
             f"지원하지 않는 파일 형식입니다: .{ext}\n"
-            f"지원 형식: PDF, DOCX, XLSX, HWP, HWPX"
+            f"지원 형식: {', '.join(sorted(e.upper() for e in allowed_extensions))}"
         )
 
     if file_size > settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024:
@@ -57,8 +52,16 @@ def validate_file(filename: str, content_type: str | None, file_size: int) -> st
     return ext
 
 
-async def save_uploaded_file(file, user_id: str, db: AsyncSession) -> Document:
+async def save_uploaded_file(
+    file, user_id: str, db: AsyncSession,
+    visibility: str = VISIBILITY_PUBLIC, department: str | None = None,
+) -> Document:
     """파일 저장 및 Document 레코드 생성"""
+    if visibility not in VISIBILITIES:
+        raise ValueError(f"지원하지 않는 공개 범위입니다: {visibility}")
+    if visibility == VISIBILITY_DEPARTMENT and not department:
+        raise ValueError("부서가 지정되지 않은 사용자는 부서 공개로 업로드할 수 없습니다.")
+
     # 파일 크기 사전 검증 (청크 단위 읽기로 메모리 보호)
     max_size = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
     chunks = []
@@ -102,6 +105,8 @@ async def save_uploaded_file(file, user_id: str, db: AsyncSession) -> Document:
         file_size=file_size,
         status="uploading",
         uploaded_by=user_id,
+        visibility=visibility,
+        department=department,
     )
     db.add(doc)
     await db.commit()
@@ -169,14 +174,27 @@ async def process_document_async(document_id: str):
                 return
 
             # 4. DB 저장
+            chunk_rows = []
             for i, (chunk_content, embedding) in enumerate(zip(chunks, embeddings)):
                 chunk = DocumentChunk(
                     document_id=document_id,
                     chunk_index=i,
                     content=chunk_content,
                     embedding=embedding,
+                    searchable=True,
+                    owner_id=doc.uploaded_by,
+                    visibility=doc.visibility,
+                    department=doc.department,
                 )
                 db.add(chunk)
+                chunk_rows.append(chunk)
+            await db.flush()
+
+            # 5. BM25 역색인 갱신
+            await index_chunks(db, chunk_rows)
+
+            # 6. 문서 대표 벡터 (청크 임베딩 평균)
+            doc.embedding = np.mean(np.asarray(embeddings, dtype=np.float32), axis=0)
 
             doc.status = "completed"
             await db.commit()
@@ -185,8 +203,13 @@ async def process_document_async(document_id: str):
         except Exception as e:
             logger.error(f"문서 처리 실패: {document_id} - {e}", exc_info=True)
             try:
-                doc.status = "failed"
-                doc.error_message = f"처리 중 오류: {str(e)[:300]}"
+                # flush된 청크/색인은 버리고 (실패 문서의 청크가 검색되지 않도록) 상태만 갱신
+                await db.rollback()
+                await db.execute(
+                    update(Document)
+                    .where(Document.id == document_id)
+                    .values(status="failed", error_message=f"처리 중 오류: {str(e)[:300]}")
+                )
                 await db.commit()
             except Exception:
                 logger.error("상태 업데이트 실패")
@@ -206,7 +229,8 @@ async def delete_document(document_id: str, db: AsyncSession) -> bool:
     except OSError as e:
         logger.warning(f"파일 삭제 실패: {doc.filepath} - {e}")
 
-    # DB 삭제 (cascade로 chunks도 삭제)
+    # BM25 코퍼스 통계 차감 후 DB 삭제 (cascade로 chunks, postings도 삭제)
+    await unindex_document(db, document_id)
     await db.delete(doc)
     await db.commit()
     logger.info(f"문서 삭제: {doc.filename}")
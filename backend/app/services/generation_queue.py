@@ -0,0 +1,242 @@
+"""
+Generation Queue - 사용자별 공정 큐잉 + 과부하 차단 (워커 프로세스 단위)
+
+Ollama 생성 슬롯(GENERATION_CONCURRENCY)을 사용자별 대기열에 deficit round-robin으로
+배분합니다. 요청 비용은 실제 생성 시간(초)이며 완료 시 사용자 deficit에서 차감되므로,
+긴 생성을 연달아 보내는 사용자는 다른 사용자가 한 바퀴씩 처리될 때까지 뒤로 밀립니다.
+
+- 사용자별 동시 생성 USER_MAX_CONCURRENT, 대기 USER_MAX_QUEUED 초과 시 즉시 거절
+- 전체 대기 요청이 GENERATION_MAX_QUEUE 이상이면 즉시 거절 (429 + Retry-After)
+- 대기 시간 추정은 최근 생성 시간의 지수 이동 평균 기반
+"""
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import aclosing
+from typing import AsyncGenerator, AsyncIterator, Deque, Dict, Optional, Tuple
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger("baikal.queue")
+
+SERVICE_TIME_ALPHA = 0.2  # 생성 시간 이동 평균 가중치
+INITIAL_SERVICE_TIME = 10.0  # 측정값이 없을 때 가정하는 생성 시간 (초)
+
+
+class QueueRejected(Exception):
+    """대기열 초과로 요청 거절 (retry_after: 재시도 권장 시간, 초)"""
+
+    def __init__(self, message: str, retry_after: int):
+        self.retry_after = retry_after
+        super().__init__(message)
+
+
+class GenerationTicket:
+    """생성 요청 1건의 대기/실행 상태
+
+    admit() 시점에 대기열 자리를 잡아 한도 계산과 순번 안내에 포함되지만, 슬롯은 검색(RAG)이
+    끝나고 wait_turn()/acquire()를 호출한 뒤에만 배정됩니다 (검색 중에는 슬롯을 점유하지 않고,
+    생성 시간 측정도 배정 시점부터). 생성이 끝나면 release()로 슬롯을 반환합니다
+    (`with ticket:` 블록 종료 시 자동 반환).
+    """
+
+    def __init__(self, scheduler: "FairScheduler", user_id: str):
+        self.scheduler = scheduler
+        self.user_id = user_id
+        self.ready = False  # 생성 준비 완료 (wait_turn 호출) - 이때부터 슬롯 배정 대상
+        self.granted = False
+        self.released = False
+        self.started_at: Optional[float] = None
+        self._changed = asyncio.Event()  # 슬롯 배정 또는 대기 순번 변경
+
+    def __enter__(self) -> "GenerationTicket":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+    def position(self) -> Tuple[int, int]:
+        """(앞 대기 건수, 예상 대기 초), 슬롯을 얻었으면 (0, 0)"""
+        return self.scheduler.position(self)
+
+    async def wait_turn(self) -> AsyncGenerator[Tuple[int, int], None]:
+        """슬롯을 얻을 때까지 대기 순번이 바뀔 때마다 (앞 대기 건수, 예상 대기 초) 전달"""
+        if not self.ready and not self.released:
+            self.ready = True
+            self.scheduler._dispatch()
+        last = None
+        while True:
+            self._changed.clear()
+            if self.granted:
+                return
+            status = self.position()
+            if status != last:
+                last = status
+                yield status
+            await self._changed.wait()
+
+    async def acquire(self) -> None:
+        """순번 알림 없이 슬롯 대기"""
+        async for _ in self.wait_turn():
+            pass
+
+    def release(self) -> None:
+        if not self.released:
+            self.released = True
+            self.scheduler._release(self)
+
+
+class FairScheduler:
+    def __init__(self, concurrency: int, quantum: float):
+        self.concurrency = max(concurrency, 1)
+        self.quantum = max(quantum, 0.1)
+        self.service_time = INITIAL_SERVICE_TIME
+        self._queues: Dict[str, Deque[GenerationTicket]] = {}
+        self._rotation: Deque[str] = deque()  # 대기 요청이 있는 사용자 순서
+        self._deficit: Dict[str, float] = {}  # 음수 = 이전 생성 시간 초과분 (다음 차례에서 상환)
+        self._running: Dict[str, int] = {}
+        self._active = 0
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    # ---- 입장 제어 ----
+
+    def admit(self, user_id: str) -> GenerationTicket:
+        """대기열 여유 확인 후 티켓 발급 + 대기열 등록 (초과 시 QueueRejected)"""
+        waiting = self.waiting
+        if waiting >= settings.GENERATION_MAX_QUEUE:
+            wait = self.estimated_wait(waiting)
+            raise QueueRejected(
+                f"요청이 많아 대기열이 가득 찼습니다. 약 {wait}초 후 다시 시도해주세요.", wait
+            )
+        queued = len(self._queues.get(user_id, ()))
+        if self._running.get(user_id, 0) + queued >= \
+                settings.USER_MAX_CONCURRENT + settings.USER_MAX_QUEUED:
+            wait = self.estimated_wait(queued)
+            raise QueueRejected(
+                f"진행 중인 질문이 너무 많습니다. 약 {wait}초 후 다시 시도해주세요.", wait
+            )
+
+        ticket = GenerationTicket(self, user_id)
+        queue = self._queues.get(user_id)
+        if queue is None:
+            queue = self._queues[user_id] = deque()
+            self._rotation.append(user_id)
+        queue.append(ticket)
+        return ticket
+
+    def estimated_wait(self, ahead: int) -> int:
+        """앞선 요청 수 기준 예상 대기 시간 (초, 최소 1)"""
+        return max(math.ceil((ahead + 1) * self.service_time / self.concurrency), 1)
+
+    def position(self, ticket: GenerationTicket) -> Tuple[int, int]:
+        """라운드 로빈 기준 앞 대기 건수와 예상 대기 시간 (빈 슬롯으로 바로 처리될 몫은 제외)"""
+        if ticket.granted or ticket.released:
+            return 0, 0
+        index = self._queues[ticket.user_id].index(ticket)
+        ahead = index + sum(
+            min(len(queue), index + 1)
+            for user_id, queue in self._queues.items() if user_id != ticket.user_id
+        ) - (self.concurrency - self._active)
+        if ahead < 0:
+            return 0, 0
+        return ahead, self.estimated_wait(ahead)
+
+    # ---- 스케줄링 ----
+
+    def _dispatch(self) -> None:
+        """빈 슬롯을 deficit round-robin 순서로 배분하고 대기 중인 티켓에 변경 알림"""
+        while self._active < self.concurrency:
+            user_id = self._next_user()
+            if user_id is None:
+                break
+            queue = self._queues[user_id]
+            ticket = next(t for t in queue if t.ready)
+            queue.remove(ticket)
+            if not queue:
+                self._drop_queue(user_id)
+            self._running[user_id] = self._running.get(user_id, 0) + 1
+            self._active += 1
+            ticket.granted = True
+            ticket.started_at = time.monotonic()
+            ticket._changed.set()
+        for queue in self._queues.values():
+            for ticket in queue:
+                ticket._changed.set()
+
+    def _next_user(self) -> Optional[str]:
+        """다음 차례 사용자 (동시 실행 한도에 걸렸거나 준비된 요청이 없는 사용자는 건너뜀)
+
+        deficit이 음수인 사용자는 차례마다 quantum을 받으며 순서를 넘깁니다.
+        """
+        eligible = {
+            user_id for user_id in self._rotation
+            if self._running.get(user_id, 0) < settings.USER_MAX_CONCURRENT
+            and any(ticket.ready for ticket in self._queues[user_id])
+        }
+        if not eligible:
+            return None
+        while True:
+            user_id = self._rotation[0]
+            self._rotation.rotate(-1)
+            if user_id not in eligible:
+                continue
+            if self._deficit.get(user_id, 0.0) >= 0:
+                return user_id
+            self._deficit[user_id] += self.quantum
+
+    def _drop_queue(self, user_id: str) -> None:
+        del self._queues[user_id]
+        self._rotation.remove(user_id)
+
+    def _release(self, ticket: GenerationTicket) -> None:
+        user_id = ticket.user_id
+        if not ticket.granted:
+            queue = self._queues[user_id]
+            queue.remove(ticket)
+            if not queue:
+                self._drop_queue(user_id)
+        else:
+            elapsed = time.monotonic() - ticket.started_at
+            self.service_time += SERVICE_TIME_ALPHA * (elapsed - self.service_time)
+            # 비용 = 실제 생성 시간. quantum을 넘긴 만큼 deficit 차감 (남은 몫은 이월하지 않음)
+            deficit = min(self._deficit.get(user_id, 0.0) + self.quantum - elapsed, 0.0)
+            if deficit < 0:
+                self._deficit[user_id] = deficit
+            else:
+                self._deficit.pop(user_id, None)
+            self._running[user_id] -= 1
+            if not self._running[user_id]:
+                del self._running[user_id]
+            self._active -= 1
+        self._dispatch()
+
+    def stats(self) -> dict:
+        return {
+            "active": self._active,
+            "waiting": self.waiting,
+            "users_waiting": len(self._queues),
+            "service_time": round(self.service_time, 2),
+        }
+
+
+async def release_after(ticket: GenerationTicket, events: AsyncIterator[dict]) -> AsyncGenerator[dict, None]:
+    """이벤트 스트림이 끝나면 (오류/취소 포함) 티켓 반환"""
+    with ticket:
+        async with aclosing(events):
+            async for event in events:
+                yield event
+
+
+_scheduler: Optional[FairScheduler] = None
+
+
+def get_scheduler() -> FairScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = FairScheduler(settings.GENERATION_CONCURRENCY, settings.GENERATION_QUANTUM)
+    return _scheduler
@@ -0,0 +1,187 @@
+"""
+History Cache - 세션별 최근 대화 캐시 (워커 메모리 LRU + write-through)
+
+질문마다 같은 워커가 방금 저장한 대화를 DB에서 다시 읽지 않도록, 세션 소유자/롤링 요약/
+요약 이후 최근 메시지를 캐시합니다.
+
+- 메시지 저장 시 write-through로 캐시에 추가, 요약 갱신/세션 삭제 시 무효화
+- 세션을 변경하는 트랜잭션은 `chat_history` 채널로 NOTIFY를 보내고, 각 워커는
+  LISTEN 전용 연결로 받아 자기 캐시에서 해당 세션을 제거 (다중 워커 정합성)
+- LISTEN 연결이 끊긴 동안에는 캐시를 비우고 사용하지 않음 (재연결 후 재개)
+"""
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Deque, Dict, Optional, Tuple
+
+from sqlalchemy import text as sql_text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger("baikal.history_cache")
+
+CHANNEL = "chat_history"
+RECONNECT_INTERVAL = 5.0  # LISTEN 연결 재시도 간격 (초)
+
+_WORKER_ID = uuid.uuid4().hex  # 자기 NOTIFY 무시용
+
+
+@dataclass
+class CachedHistory:
+    user_id: str
+    summary: Optional[str]
+    summarized_until: Optional[datetime]
+    messages: Deque[Tuple[str, str]] = field(default_factory=deque)  # (role, content) 시간순, maxlen = 조회 한도
+    has_older: bool = False  # 조회 한도 밖에 요약되지 않은 더 오래된 메시지가 있음
+    version: int = 0  # 저장 시점의 조회 순번 (store()가 설정)
+
+
+class HistoryCache:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.available = False  # LISTEN 연결이 살아 있을 때만 사용
+        self._entries: "OrderedDict[str, CachedHistory]" = OrderedDict()
+        # 조회 도중 변경 감지: 변경마다 증가하는 순번과 세션별 마지막 변경 순번
+        self._seq = 0
+        self._changed: Dict[str, int] = {}
+        self._floor = 0  # 정리된 변경 기록 중 가장 큰 순번
+
+    def get(self, session_id: str) -> Optional[CachedHistory]:
+        if not self.available:
+            return None
+        entry = self._entries.get(session_id)
+        if entry is not None:
+            self._entries.move_to_end(session_id)
+        return entry
+
+    def version(self, session_id: str) -> int:
+        """DB 조회 직전에 받아 두었다가 store()에 전달"""
+        return self._seq
+
+    def store(self, session_id: str, version: int, entry: CachedHistory) -> None:
+        """조회 도중 세션이 변경되지 않았을 때만 저장"""
+        if not self.available or self._changed.get(session_id, self._floor) > version:
+            return
+        entry.version = version
+        self._entries[session_id] = entry
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def mark_changed(self, session_id: str) -> int:
+        """메시지 저장 트랜잭션 커밋 직전 호출 - 반환값을 커밋 후 append()에 전달"""
+        self._bump(session_id)
+        return self._seq
+
+    def append(self, session_id: str, since: int, *messages: Tuple[str, str]) -> None:
+        """write-through: mark_changed() 이전에 저장된 캐시 항목에만 메시지 추가
+
+        그 이후 저장된 항목은 커밋 전/후 중 어느 시점을 읽었는지 알 수 없으므로
+        (이미 새 메시지를 포함했을 수 있음) 추가하지 않고 제거합니다.
+        """
+        self._bump(session_id)
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return
+        if entry.version >= since:
+            del self._entries[session_id]
+            return
+        limit = entry.messages.maxlen
+        if limit is not None and len(entry.messages) + len(messages) > limit:
+            entry.has_older = True  # 한도를 넘어 밀려난 메시지는 요약 대상
+        entry.messages.extend(messages)
+
+    def invalidate(self, session_id: str) -> None:
+        self._bump(session_id)
+        self._entries.pop(session_id, None)
+
+    def clear(self) -> None:
+        self._seq += 1
+        self._changed.clear()
+        self._floor = self._seq
+        self._entries.clear()
+
+    def _bump(self, session_id: str) -> None:
+        # 캐시에 없는 세션도 조회 중일 수 있으므로 항상 기록
+        self._seq += 1
+        self._changed.pop(session_id, None)
+        self._changed[session_id] = self._seq
+        if len(self._changed) > self.capacity * 2:
+            for stale in list(self._changed)[: self.capacity]:
+                self._floor = max(self._floor, self._changed.pop(stale))
+
+
+_cache = HistoryCache(settings.HISTORY_CACHE_SESSIONS)
+_listener_task: Optional[asyncio.Task] = None
+
+
+def get_history_cache() -> HistoryCache:
+    return _cache
+
+
+async def notify_session_changed(db: AsyncSession, session_id: str) -> None:
+    """세션 변경 알림 (트랜잭션 커밋 시 다른 워커로 전달)"""
+    if settings.HISTORY_CACHE_SESSIONS <= 0:
+        return
+    await db.execute(
+        sql_text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": CHANNEL, "payload": f"{_WORKER_ID}:{session_id}"},
+    )
+
+
+def _on_notify(connection, pid, channel, payload: str) -> None:
+    worker_id, _, session_id = payload.partition(":")
+    if worker_id != _WORKER_ID:
+        _cache.invalidate(session_id)
+
+
+async def _listen_loop() -> None:
+    import asyncpg
+
+    dsn = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+    dsn = dsn.render_as_string(hide_password=False)
+    while True:
+        closed = asyncio.Event()
+        conn = None
+        try:
+            conn = await asyncpg.connect(dsn)
+            conn.add_termination_listener(lambda _: closed.set())
+            await conn.add_listener(CHANNEL, _on_notify)
+            _cache.available = True
+            logger.info("히스토리 캐시 활성화 (LISTEN chat_history)")
+            await closed.wait()
+            logger.warning("히스토리 캐시 LISTEN 연결 끊김 - 재연결까지 캐시 비활성화")
+        except Exception as e:
+            logger.warning(f"히스토리 캐시 LISTEN 연결 실패: {e}")
+        finally:
+            # 연결이 없는 동안의 알림은 받을 수 없으므로 캐시를 비움
+            _cache.available = False
+            _cache.clear()
+            if conn is not None and not conn.is_closed():
+                await conn.close()
+        await asyncio.sleep(RECONNECT_INTERVAL)
+
+
+def start_history_cache() -> None:
+    """LISTEN 연결 시작 (HISTORY_CACHE_SESSIONS > 0 일 때만)"""
+    global _listener_task
+    if settings.HISTORY_CACHE_SESSIONS <= 0:
+        return
+    _listener_task = asyncio.create_task(_listen_loop())
+
+
+async def stop_history_cache() -> None:
+    global _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
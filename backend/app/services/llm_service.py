@@ -7,6 +7,7 @@ import asyncio
 import httpx
 from typing import List, AsyncGenerator
 from app.config import get_settings
+from app.core.deadline import DeadlineExceeded, check_deadline, deadline_expired, stage_timeout
 
 settings = get_settings()
 logger = logging.getLogger("baikal.llm")
@@ -23,10 +24,14 @@ class OllamaModelError(Exception):
 
 
 async def _ollama_request(method: str, path: str, **kwargs) -> httpx.Response:
-    """Ollama API 요청 (공통 에러 처리)"""
+    """Ollama API 요청 (공통 에러 처리)
+
+    요청 처리 기한이 설정되어 있으면 타임아웃을 남은 시간으로 줄입니다.
+    """
     url = f"{settings.OLLAMA_BASE_URL}{path}"
+    timeout = stage_timeout(path, kwargs.pop("timeout", 300.0))
     try:
-        async with httpx.AsyncClient(timeout=kwargs.pop("timeout", 300.0)) as client:
+        async with httpx.AsyncClient(timeout=timeout) as client:
             response = await getattr(client, method)(url, **kwargs)
             response.raise_for_status()
             return response
@@ -37,6 +42,8 @@ async def _ollama_request(method: str, path: str, **kwargs) -> httpx.Response:
             "Ollama가 실행 중인지 확인하세요."
         )
     except httpx.TimeoutException:
+        if deadline_expired():
+            raise DeadlineExceeded(path)
         logger.error(f"Ollama 요청 타임아웃: {path}")
         raise OllamaConnectionError("Ollama 서버 응답 시간 초과. LLM 모델 로딩에 시간이 걸릴 수 있습니다.")
     except httpx.HTTPStatusError as e:
@@ -84,8 +91,9 @@ async def call_ollama_chat_stream(prompt: str = "", system_prompt: str = "", mes
         messages.append({"role": "user", "content": prompt})
 
     url = f"{settings.OLLAMA_BASE_URL}/api/chat"
+    timeout = stage_timeout("/api/chat", 300.0)
     try:
-        async with httpx.AsyncClient(timeout=300.0) as client:
+        async with httpx.AsyncClient(timeout=timeout) as client:
             async with client.stream(
                 "POST",
                 url,
@@ -115,6 +123,8 @@ async def call_ollama_chat_stream(prompt: str = "", system_prompt: str = "", mes
     except httpx.ConnectError:
         raise OllamaConnectionError("Ollama 서버에 연결할 수 없습니다.")
     except httpx.TimeoutException:
+        if deadline_expired():
+            raise DeadlineExceeded("/api/chat")
         raise OllamaConnectionError("Ollama 서버 응답 시간 초과.")
 
 
@@ -143,7 +153,7 @@ async def call_ollama_embedding(texts: List[str]) -> List[List[float]]:
                     data = response.json()
                     embeddings.append(data["embeddings"][0])
                     break
-                except (OllamaConnectionError, OllamaModelError):
+                except (OllamaConnectionError, OllamaModelError, DeadlineExceeded):
                     raise
                 except Exception as e:
                     retry_count += 1
@@ -152,6 +162,7 @@ async def call_ollama_embedding(texts: List[str]) -> List[List[float]]:
                         raise
                     logger.warning(f"임베딩 재시도 {retry_count}/{max_retries}: {e}")
                     await asyncio.sleep(1)
+                    check_deadline("/api/embed")
 
     return embeddings
 
@@ -1,14 +1,29 @@
 """
 RAG Service - 질문응답 파이프라인
 """
+import time
+import asyncio
 import logging
-from typing import AsyncGenerator
+from collections import deque
+from contextlib import aclosing
+from typing import AsyncGenerator, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, text
-from app.models.document import Document, DocumentChunk, ChatSession, ChatMessage
+from sqlalchemy import Float, String, bindparam, or_, select, text, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from app.models.document import ChatSession, ChatMessage
 from app.services.llm_service import call_ollama_chat, call_ollama_chat_stream, call_ollama_embedding
+from app.services.generation_queue import GenerationTicket, QueueRejected, get_scheduler
+from app.services.history_cache import CachedHistory, get_history_cache, notify_session_changed
 from app.rag.retriever import retrieve_relevant_chunks
+from app.rag.lexical_index import search_lexical
+from app.rag.tokenizer import tokenize
+from app.rag.scope import SearchScope, scope_filter
+from app.database import async_session
 from app.config import get_settings
+from app.core.deadline import (
+    DeadlineExceeded, apply_statement_timeout, current_deadline, deadline_expired,
+    is_statement_timeout, request_deadline, stage_timeout,
+)
 
 settings = get_settings()
 logger = logging.getLogger("baikal.rag")
@@ -25,106 +40,180 @@ SYSTEM_PROMPT = """당신은 BAIKAL Private AI 시스템의 기업 내부 문서
 7. 답변 마지막에 "📄 출처: [문서명]" 형식으로 참고 문서를 명시하세요.
 8. 질문이 모호하면 어떤 의도인지 되묻되, 가능한 해석이 하나라면 그대로 답변하세요."""
 
-MAX_HISTORY_TURNS = 5  # 컨텍스트에 포함할 최대 대화 턴 수
-
-
-async def _get_chat_history(session_id: str, db: AsyncSession) -> list[dict]:
-    """세션의 최근 대화 히스토리를 가져옴"""
-    result = await db.execute(
-        select(ChatMessage)
-        .where(ChatMessage.session_id == session_id)
-        .order_by(ChatMessage.created_at.desc())
-        .limit(MAX_HISTORY_TURNS * 2)  # user+assistant 쌍
+MAX_HISTORY_TURNS = 5  # 요약 이후 대화 중 조회할 최대 턴 수
+RRF_K = 60  # Reciprocal Rank Fusion 상수
+
+DEADLINE_MESSAGE = "요청 처리 시간이 초과되었습니다. 잠시 후 다시 시도하거나 질문 범위를 좁혀 주세요."
+
+SUMMARY_PROMPT = """다음은 사내 문서 질의응답 대화입니다. 이전 요약과 이어진 대화를 합쳐 이후 질문에
+필요한 맥락(사용자가 물은 주제, 답변에서 확인된 사실과 수치, 참조한 문서명, 미해결 질문)만
+한국어로 간결하게 요약하세요. 요약문만 출력하고 {max_chars}자를 넘기지 마세요."""
+SUMMARY_BATCH_MESSAGES = 40  # 요약 1회에 반영할 최대 메시지 수
+SUMMARY_MESSAGE_CHARS = 1500  # 요약 입력에서 메시지당 최대 글자 수
+
+_background_tasks: set[asyncio.Task] = set()
+_summarizing: set[str] = set()  # 요약 갱신 중인 세션
+
+
+async def _get_chat_history(chat_session: ChatSession, db: AsyncSession) -> CachedHistory:
+    """세션의 롤링 요약 + 요약 이후 최근 메시지 조회 (한도 + 1행으로 더 오래된 미요약 대화 확인)"""
+    limit = MAX_HISTORY_TURNS * 2
+    query = select(ChatMessage.role, ChatMessage.content).where(ChatMessage.session_id == chat_session.id)
+    if chat_session.summarized_until is not None:
+        query = query.where(ChatMessage.created_at > chat_session.summarized_until)
+    rows = (await db.execute(
+        query.order_by(ChatMessage.created_at.desc()).limit(limit + 1)
+    )).all()
+    return CachedHistory(
+        user_id=chat_session.user_id,
+        summary=chat_session.summary,
+        summarized_until=chat_session.summarized_until,
+        messages=deque(reversed(rows[:limit]), maxlen=limit),
+        has_older=len(rows) > limit,
     )
-    messages = result.scalars().all()
-    # 시간순 정렬 (오래된 것부터)
-    messages = list(reversed(messages))
-    return [{"role": m.role, "content": m.content} for m in messages]
 
 
-async def ask_question(
-    question: str, session_id: str, user_id: str, db: AsyncSession
-) -> dict:
-    """RAG 기반 질문응답"""
-
-    # 1. 세션 확인
-    result = await db.execute(
-        select(ChatSession).where(
-            ChatSession.id == session_id, ChatSession.user_id == user_id
+def _build_history(session_id: str, cached: CachedHistory) -> list[dict]:
+    """LLM 히스토리 = 롤링 요약 + 요약 이후 대화
+
+    최근 HISTORY_RECENT_TURNS 턴은 항상 원문으로 넣고, 그 이전의 요약되지 않은 대화는
+    HISTORY_SUMMARY_TRIGGER_CHARS 안에서만 원문으로 넣습니다. 예산을 넘거나 조회 한도 밖에
+    요약되지 않은 대화가 남아 있으면 백그라운드에서 요약을 갱신하므로, 긴 세션에서도
+    프롬프트 길이가 거의 일정하게 유지됩니다 (짧은 대화가 몇 턴 쌓인 것만으로는 요약하지 않음).
+    """
+    # 최신순 → 예산 안의 이전 대화만 남긴 뒤 시간순 정렬
+    messages = list(reversed(cached.messages))
+    recent_count = settings.HISTORY_RECENT_TURNS * 2
+    kept = messages[:recent_count]
+    used = 0
+    over_budget = cached.has_older  # 한도 밖 대화는 요약하지 않으면 맥락에서 빠짐
+    for role, content in messages[recent_count:]:
+        used += len(content)
+        if used > settings.HISTORY_SUMMARY_TRIGGER_CHARS:
+            over_budget = True
+            break
+        kept.append((role, content))
+    if over_budget and len(messages) > recent_count:
+        _schedule_summary(session_id, cached.user_id)
+
+    history = [{"role": role, "content": content} for role, content in reversed(kept)]
+    if cached.summary:
+        history.insert(0, {"role": "system", "content": f"이전 대화 요약:\n{cached.summary}"})
+    return history
+
+
+async def _timed(name: str, coro, timings: dict):
+    """코루틴 실행 시간(ms)을 timings[name]에 기록"""
+    started = time.perf_counter()
+    try:
+        return await coro
+    finally:
+        timings[name] = (time.perf_counter() - started) * 1000
+
+
+def _log_timings(timings: dict) -> None:
+    logger.info("질문 처리 단계별 시간: " + ", ".join(f"{k} {v:.0f}ms" for k, v in timings.items()))
+
+
+async def _load_history(session_id: str, user_id: str) -> Optional[list[dict]]:
+    """세션 소유 확인 + 대화 히스토리 (캐시 미스 시 별도 세션, 세션이 없으면 None)"""
+    cache = get_history_cache()
+    cached = cache.get(session_id)
+    if cached is None:
+        version = cache.version(session_id)
+        async with async_session() as db:
+            chat_session = await _get_owned_session(session_id, user_id, db)
+            if chat_session is None:
+                return None
+            cached = await _get_chat_history(chat_session, db)
+        cache.store(session_id, version, cached)
+    elif cached.user_id != user_id:
+        return None
+    return _build_history(session_id, cached)
+
+
+async def _retrieve_context(question: str, scope: Optional[SearchScope]) -> tuple[str, list]:
+    """RAG 검색 (별도 세션)"""
+    async with async_session() as db:
+        return await _build_rag_context(question, db, scope=scope)
+
+
+async def _prepare_ask(
+    question: str, session_id: str, user_id: str,
+    scope: Optional[SearchScope], timings: dict,
+) -> Optional[tuple[list[dict], list]]:
+    """세션 확인/히스토리 조회와 RAG 검색(질문 임베딩 포함)을 동시에 실행
+
+    두 단계는 서로 독립적이므로 각자 짧은 세션에서 병렬로 수행하고,
+    LLM 호출 전에 연결을 모두 반환합니다. 세션이 없으면 None.
+    """
+    try:
+        history, (context, sources) = await asyncio.gather(
+            _timed("history", _load_history(session_id, user_id), timings),
+            _timed("retrieval", _retrieve_context(question, scope), timings),
         )
-    )
-    session = result.scalar_one_or_none()
-    if session is None:
-        raise ValueError("채팅 세션을 찾을 수 없습니다")
-
-    # 2. Vector 유사도 검색 (retriever 사용)
-    chunks = await retrieve_relevant_chunks(question, db)
-
-    # 3. 컨텍스트 생성
-    context_parts = []
-    sources = []
-    seen_docs = set()
+    except Exception as e:
+        # statement_timeout 취소 등 기한 초과로 인한 실패는 DeadlineExceeded로 통일
+        if not isinstance(e, DeadlineExceeded) and deadline_expired():
+            raise DeadlineExceeded("search") from e
+        raise
+    if history is None:
+        return None
+    return _build_messages(history, context, question), sources
 
-    for chunk in chunks:
-        context_parts.append(f"[{chunk['filename']} - 청크 {chunk['chunk_index'] + 1}]\n{chunk['content']}")
 
-        if chunk['document_id'] not in seen_docs:
-            sources.append({
-                "document_id": chunk['document_id'],
-                "filename": chunk['filename'],
-                "relevance_score": chunk['score'],
-            })
-            seen_docs.add(chunk['document_id'])
-
-    context = "\n\n---\n\n".join(context_parts) if context_parts else "관련 문서를 찾을 수 없습니다."
-
-    # 4. 대화 히스토리 가져오기
-    history = await _get_chat_history(session_id, db)
-
-    # 5. LLM 메시지 구성 (시스템 + 히스토리 + 현재 질문)
-    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
-    messages.extend(history)
-    messages.append({
-        "role": "user",
-        "content": f"참고 문서:\n{context}\n\n질문: {question}\n\n위 문서 내용을 기반으로 답변해주세요."
-    })
-
-    # 6. LLM 호출
-    answer = await call_ollama_chat(messages=messages)
-
-    # 7. 메시지 저장
-    user_msg = ChatMessage(
-        session_id=session_id,
-        role="user",
-        content=question,
-    )
-    db.add(user_msg)
-
-    assistant_msg = ChatMessage(
-        session_id=session_id,
-        role="assistant",
-        content=answer,
-        sources={"documents": sources},
+async def ask_question(
+    question: str, session_id: str, user_id: str,
+    scope: Optional[SearchScope] = None,
+    ticket: Optional[GenerationTicket] = None,
+) -> dict:
+    """RAG 기반 질문응답
+
+    ticket이 있으면 검색 후 생성 슬롯 차례를 기다렸다가 LLM을 호출합니다.
+    요청 처리 기한을 넘기면 즉시 degraded 응답을 반환합니다 (메시지 저장 안 함).
+    """
+    timings: dict[str, float] = {}
+    started = time.perf_counter()
+
+    try:
+        # 1~2. 세션 확인/히스토리 + RAG 검색 (동시 실행)
+        prepared = await _prepare_ask(question, session_id, user_id, scope, timings)
+        if prepared is None:
+            raise ValueError("채팅 세션을 찾을 수 없습니다")
+        messages, sources = prepared
+        timings["prepare"] = (time.perf_counter() - started) * 1000
+
+        # 3. 생성 슬롯 대기 + LLM 호출 (DB 연결 없음, 남은 기한으로 타임아웃)
+        if ticket is not None:
+            await _timed("queue", _acquire_slot(ticket), timings)
+        answer = await _timed("llm", call_ollama_chat(messages=messages), timings)
+        if ticket is not None:
+            ticket.release()
+    except DeadlineExceeded as e:
+        timings["total"] = (time.perf_counter() - started) * 1000
+        logger.warning(f"질문응답 기한 초과: {e.stage}")
+        _log_timings(timings)
+        return {"answer": DEADLINE_MESSAGE, "sources": [], "message_id": None, "degraded": True}
+
+    # 4. 메시지 저장 (새 트랜잭션)
+    message_id = await _timed(
+        "save", _save_exchange(session_id, question, answer, sources), timings
     )
-    db.add(assistant_msg)
-
-    # 세션 제목 업데이트 (첫 질문이면)
-    if session.title == "새 대화":
-        session.title = question[:50] + ("..." if len(question) > 50 else "")
-
-    await db.commit()
-    await db.refresh(assistant_msg)
+    timings["total"] = (time.perf_counter() - started) * 1000
+    _log_timings(timings)
 
     return {
         "answer": answer,
         "sources": sources,
-        "message_id": assistant_msg.id,
+        "message_id": message_id,
     }
 
 
-async def _build_rag_context(question: str, db: AsyncSession) -> tuple[str, list]:
+async def _build_rag_context(
+    question: str, db: AsyncSession, scope: Optional[SearchScope] = None
+) -> tuple[str, list]:
     """질문에 대한 RAG 컨텍스트 생성 (retriever 사용)"""
-    chunks = await retrieve_relevant_chunks(question, db)
+    chunks = await retrieve_relevant_chunks(question, db, scope=scope)
 
     context_parts = []
     sources = []
@@ -146,119 +235,473 @@ async def _build_rag_context(question: str, db: AsyncSession) -> tuple[str, list
 
 
 async def ask_question_stream(
-    question: str, session_id: str, user_id: str, db: AsyncSession
+    question: str, session_id: str, user_id: str,
+    scope: Optional[SearchScope] = None,
+    ticket: Optional[GenerationTicket] = None,
 ) -> AsyncGenerator[dict, None]:
-    """RAG 기반 질문응답 (스트리밍)"""
+    """RAG 기반 질문응답 (스트리밍)
+
+    LLM 토큰이 흐르는 동안(10~60초) DB 연결을 잡고 있지 않도록,
+    준비(세션 확인/검색/히스토리)와 저장은 각각 짧은 세션으로 수행합니다.
+    ticket이 있으면 생성 슬롯 대기 순번을 queue 이벤트로 보냅니다 (검색 전 1회 + 변경 시).
+    """
+    timings: dict[str, float] = {}
+    started = time.perf_counter()
+
+    if ticket is not None and not ticket.granted:
+        ahead, wait = ticket.position()
+        yield {"type": "queue", "position": ahead, "estimated_wait": wait}
+
+    # 세션 확인/히스토리 + RAG 검색 (동시 실행, 조회 후 연결 반환)
+    try:
+        prepared = await _prepare_ask(question, session_id, user_id, scope, timings)
+    except DeadlineExceeded as e:
+        logger.warning(f"질문응답 기한 초과: {e.stage}")
+        yield {"type": "error", "content": DEADLINE_MESSAGE, "reason": "deadline"}
+        return
+    if prepared is None:
+        yield {"type": "error", "content": "채팅 세션을 찾을 수 없습니다"}
+        return
+    messages, sources = prepared
+    timings["prepare"] = (time.perf_counter() - started) * 1000
 
-    # 세션 확인
+    # 소스 먼저 전송
+    yield {"type": "sources", "sources": sources}
+
+    # 생성 슬롯 대기 (검색과 겹쳐 이미 차례가 왔으면 바로 통과)
+    deadline = current_deadline()
+    if ticket is not None:
+        queue_started = time.perf_counter()
+        try:
+            async with asyncio.timeout(deadline.remaining() if deadline else None):
+                async with aclosing(ticket.wait_turn()) as turns:
+                    async for ahead, wait in turns:
+                        yield {"type": "queue", "position": ahead, "estimated_wait": wait}
+        except TimeoutError:
+            logger.warning("질문응답 기한 초과: 생성 대기열")
+            yield {"type": "error", "content": DEADLINE_MESSAGE, "reason": "deadline"}
+            return
+        timings["queue"] = (time.perf_counter() - queue_started) * 1000
+
+    # LLM 스트리밍 호출 (DB 연결 없음)
+    # 클라이언트 연결이 끊기면 이 제너레이터가 닫히거나 취소되고, aclosing이 Ollama
+    # httpx 스트림까지 즉시 닫아 생성을 중단시킵니다. 부분 답변은 중단 표시로 저장합니다.
+    # 요청 처리 기한에 도달하면 생성을 끊고 그때까지의 답변을 degraded 완료로 보냅니다.
+    full_answer = ""
+    llm_started = time.perf_counter()
+    try:
+        async with asyncio.timeout(deadline.remaining() if deadline else None):
+            try:
+                async with aclosing(call_ollama_chat_stream(messages=messages)) as stream:
+                    async for chunk in stream:
+                        if not full_answer:
+                            timings["first_token"] = (time.perf_counter() - started) * 1000
+                        full_answer += chunk
+                        yield {"type": "token", "content": chunk}
+            except (asyncio.CancelledError, GeneratorExit):
+                logger.info(f"스트림 중단: 답변 {len(full_answer)}자에서 생성 취소")
+                _save_in_background(session_id, question, full_answer, sources, interrupted=True)
+                raise
+    except TimeoutError:
+        # 취소 경로에서 부분 답변이 이미 중단 표시로 저장됨
+        logger.warning(f"질문응답 기한 초과: LLM 생성 중 ({len(full_answer)}자)")
+        yield {"type": "done", "content": full_answer, "degraded": True}
+        return
+    except DeadlineExceeded:
+        # Ollama 요청 타임아웃 (취소 경로를 거치지 않았으므로 여기서 저장)
+        logger.warning(f"질문응답 기한 초과: LLM 응답 대기 중 ({len(full_answer)}자)")
+        _save_in_background(session_id, question, full_answer, sources, interrupted=True)
+        yield {"type": "done", "content": full_answer, "degraded": True}
+        return
+    timings["llm"] = (time.perf_counter() - llm_started) * 1000
+    if ticket is not None:
+        ticket.release()
+
+    # 메시지 저장 (새 트랜잭션, 완료 신호 전에 저장하여 직후 연결이 끊겨도 유실 없음)
+    save = asyncio.ensure_future(_save_exchange(session_id, question, full_answer, sources))
+    await _timed("save", asyncio.shield(save), timings)
+    timings["total"] = (time.perf_counter() - started) * 1000
+    _log_timings(timings)
+
+    # 완료 신호
+    yield {"type": "done", "content": full_answer}
+
+
+async def _acquire_slot(ticket: GenerationTicket) -> None:
+    """남은 기한 안에 생성 슬롯을 얻지 못하면 DeadlineExceeded"""
+    deadline = current_deadline()
+    try:
+        async with asyncio.timeout(deadline.remaining() if deadline else None):
+            await ticket.acquire()
+    except TimeoutError:
+        raise DeadlineExceeded("queue")
+
+
+async def _get_owned_session(
+    session_id: str, user_id: str, db: AsyncSession
+) -> Optional[ChatSession]:
     result = await db.execute(
         select(ChatSession).where(
             ChatSession.id == session_id, ChatSession.user_id == user_id
         )
     )
-    session = result.scalar_one_or_none()
-    if session is None:
-        yield {"type": "error", "content": "채팅 세션을 찾을 수 없습니다"}
-        return
+    return result.scalar_one_or_none()
 
-    # RAG 컨텍스트 생성
-    context, sources = await _build_rag_context(question, db)
-
-    # 소스 먼저 전송
-    yield {"type": "sources", "sources": sources}
 
-    # 대화 히스토리 가져오기
-    history = await _get_chat_history(session_id, db)
-
-    # LLM 메시지 구성 (시스템 + 히스토리 + 현재 질문)
+def _build_messages(history: list[dict], context: str, question: str) -> list[dict]:
+    """LLM 메시지 구성 (시스템 + 히스토리 + 현재 질문)"""
     messages = [{"role": "system", "content": SYSTEM_PROMPT}]
     messages.extend(history)
     messages.append({
         "role": "user",
         "content": f"참고 문서:\n{context}\n\n질문: {question}\n\n위 문서 내용을 기반으로 답변해주세요."
     })
+    return messages
+
+
+async def _save_exchange(
+    session_id: str, question: str, answer: str, sources: list,
+    interrupted: bool = False,
+) -> str:
+    """질문/답변 메시지 저장 + 첫 질문이면 세션 제목 갱신 (짧은 별도 트랜잭션)
+
+    Returns:
+        저장된 assistant 메시지 id
+    """
+    async with async_session() as db:
+        db.add(ChatMessage(session_id=session_id, role="user", content=question))
+        assistant_msg = ChatMessage(
+            session_id=session_id,
+            role="assistant",
+            content=answer,
+            sources={"documents": sources},
+            interrupted=interrupted,
+        )
+        db.add(assistant_msg)
+        await db.execute(
+            update(ChatSession)
+            .where(ChatSession.id == session_id, ChatSession.title == "새 대화")
+            .values(title=question[:50] + ("..." if len(question) > 50 else ""))
+        )
+        await notify_session_changed(db, session_id)
+        # 커밋 전에 변경 표시 - 커밋과 겹친 조회 결과가 캐시에 들어가 중복 추가되지 않도록
+        since = get_history_cache().mark_changed(session_id)
+        await db.commit()
+    get_history_cache().append(session_id, since, ("user", question), ("assistant", answer))
+    return assistant_msg.id
 
-    # LLM 스트리밍 호출
-    full_answer = ""
-    async for chunk in call_ollama_chat_stream(messages=messages):
-        full_answer += chunk
-        yield {"type": "token", "content": chunk}
 
-    # 완료 신호
-    yield {"type": "done", "content": full_answer}
+def _save_in_background(*args, **kwargs) -> None:
+    """취소 중인 요청과 무관하게 메시지 저장 (태스크 참조를 보관해 GC 방지)"""
+    task = asyncio.create_task(_save_exchange(*args, **kwargs))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    task.add_done_callback(_log_background_failure)
+
+
+def _log_background_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"백그라운드 작업 실패 ({task.get_name()}): {task.exception()}")
 
-    # 메시지 저장
-    user_msg = ChatMessage(session_id=session_id, role="user", content=question)
-    db.add(user_msg)
 
-    assistant_msg = ChatMessage(
-        session_id=session_id,
-        role="assistant",
-        content=full_answer,
-        sources={"documents": sources},
+def _schedule_summary(session_id: str, user_id: str) -> None:
+    """롤링 요약 갱신 예약 (세션당 1개, 생성 대기열이 가득 차면 다음 턴에 재시도)"""
+    if session_id in _summarizing:
+        return
+    try:
+        ticket = get_scheduler().admit(user_id)
+    except QueueRejected:
+        return
+    _summarizing.add(session_id)
+    task = asyncio.create_task(_refresh_summary(session_id, ticket), name=f"summary:{session_id}")
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    task.add_done_callback(lambda _: _summarizing.discard(session_id))
+    task.add_done_callback(_log_background_failure)
+
+
+async def _refresh_summary(session_id: str, ticket: GenerationTicket) -> None:
+    """최근 턴을 제외한 미요약 대화를 기존 요약에 합쳐 새 요약 저장
+
+    Ollama 호출은 사용자 생성 대기열을 거치며, 요청 처리 기한은 적용하지 않습니다.
+    """
+    with ticket, request_deadline(None):
+        async with async_session() as db:
+            chat_session = await db.get(ChatSession, session_id)
+            if chat_session is None:
+                return
+            previous, until = chat_session.summary, chat_session.summarized_until
+            query = select(ChatMessage).where(ChatMessage.session_id == session_id)
+            if until is not None:
+                query = query.where(ChatMessage.created_at > until)
+            result = await db.execute(
+                query.order_by(ChatMessage.created_at).limit(SUMMARY_BATCH_MESSAGES)
+            )
+            messages = result.scalars().all()
+
+        fold = messages[: len(messages) - settings.HISTORY_RECENT_TURNS * 2]
+        if not fold:
+            return
+        transcript = "\n".join(
+            f"{'사용자' if m.role == 'user' else 'AI'}: {m.content[:SUMMARY_MESSAGE_CHARS]}"
+            for m in fold
+        )
+        await ticket.acquire()
+        summary = await call_ollama_chat(
+            system_prompt=SUMMARY_PROMPT.format(max_chars=settings.HISTORY_SUMMARY_MAX_CHARS),
+            prompt=f"이전 요약:\n{previous or '없음'}\n\n이어진 대화:\n{transcript}",
+        )
+        ticket.release()
+
+        # 다른 워커가 먼저 더 최신까지 요약했으면 덮어쓰지 않음
+        async with async_session() as db:
+            await db.execute(
+                update(ChatSession)
+                .where(
+                    ChatSession.id == session_id,
+                    or_(ChatSession.summarized_until.is_(None), ChatSession.summarized_until < fold[-1].created_at),
+                )
+                .values(
+                    summary=summary.strip()[: settings.HISTORY_SUMMARY_MAX_CHARS * 2],
+                    summarized_until=fold[-1].created_at,
+                )
+            )
+            await notify_session_changed(db, session_id)
+            await db.commit()
+        get_history_cache().invalidate(session_id)
+        logger.info(f"대화 요약 갱신: session={session_id}, 메시지 {len(fold)}개 반영")
+
+
+_KEYWORD_SEARCH_SQL = """
+    WITH content_hits AS (
+        SELECT dc.document_id, d.filename, dc.content,
+               word_similarity(:q, dc.content) AS score
+        FROM document_chunks dc
+        JOIN documents d ON d.id = dc.document_id
+        WHERE dc.content ILIKE :pattern ESCAPE '\\'
+          AND dc.searchable
+          {scope_filter}
+        ORDER BY score DESC
+        LIMIT :scan_limit
+    ),
+    filename_hits AS (
+        SELECT d.id AS document_id, d.filename, dc.content,
+               similarity(d.filename, :q) AS score
+        FROM documents d
+        JOIN document_chunks dc ON dc.document_id = d.id AND dc.chunk_index = 0
+        WHERE d.filename ILIKE :pattern ESCAPE '\\'
+          AND d.status = 'completed'
+          {scope_filter}
+        ORDER BY score DESC
+        LIMIT :limit
+    ),
+    ranked AS (
+        SELECT DISTINCT ON (document_id) document_id, filename, content, score
+        FROM (
+            SELECT * FROM content_hits
+            UNION ALL
+            SELECT * FROM filename_hits
+        ) hits
+        ORDER BY document_id, score DESC
     )
-    db.add(assistant_msg)
+    SELECT r.document_id, r.filename, r.score,
+           CASE
+               WHEN p.pos > 0 THEN substr(
+                   r.content,
+                   GREATEST(p.pos - 100, 1),
+                   p.pos + length(:q) + 100 - GREATEST(p.pos - 100, 1)
+               )
+               ELSE left(r.content, 200)
+           END AS snippet
+    FROM ranked r
+    CROSS JOIN LATERAL (SELECT strpos(lower(r.content), lower(:q)) AS pos) p
+    ORDER BY r.score DESC
+    LIMIT :limit
+"""
+
 
-    if session.title == "새 대화":
-        session.title = question[:50] + ("..." if len(question) > 50 else "")
+# 3글자 미만 검색어는 trigram이 없어 pg_trgm GIN 인덱스를 쓰지 못하므로 2-gram 어휘 색인으로 검색
+TRIGRAM_MIN_CHARS = 3
 
-    await db.commit()
+_SHORT_KEYWORD_SEARCH_SQL = """
+    WITH ranked AS (
+        SELECT DISTINCT ON (dc.document_id) dc.document_id, d.filename, dc.content, h.score
+        FROM unnest(:chunk_ids, :scores) AS h(chunk_id, score)
+        JOIN document_chunks dc ON dc.id = h.chunk_id
+        JOIN documents d ON d.id = dc.document_id
+        ORDER BY dc.document_id, h.score DESC
+    )
+    SELECT r.document_id, r.filename, r.score,
+           CASE
+               WHEN p.pos > 0 THEN substr(
+                   r.content,
+                   GREATEST(p.pos - 100, 1),
+                   p.pos + length(:q) + 100 - GREATEST(p.pos - 100, 1)
+               )
+               ELSE left(r.content, 200)
+           END AS snippet
+    FROM ranked r
+    CROSS JOIN LATERAL (SELECT strpos(lower(r.content), lower(:q)) AS pos) p
+    ORDER BY r.score DESC
+    LIMIT :limit
+"""
 
 
-async def search_documents(query: str, db: AsyncSession, mode: str = "hybrid") -> list:
-    """문서 검색 (키워드 + 벡터 하이브리드)"""
-    results = []
-    seen = set()
+def _escape_like(value: str) -> str:
+    """LIKE 패턴 특수문자 이스케이프"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
-    # 1. 벡터 검색 (시맨틱)
-    if mode in ("vector", "hybrid"):
-        try:
-            chunks = await retrieve_relevant_chunks(query, db, top_k=5)
-            for chunk in chunks:
-                if chunk['document_id'] not in seen:
-                    # 검색어 주변 snippet 추출
-                    content = chunk['content']
-                    snippet = content[:200] if len(content) > 200 else content
-                    results.append({
-                        "document_id": chunk['document_id'],
-                        "filename": chunk['filename'],
-                        "content_snippet": snippet,
-                        "score": chunk['score'],
-                    })
-                    seen.add(chunk['document_id'])
-        except Exception as e:
-            logger.warning(f"벡터 검색 실패 (키워드 검색으로 폴백): {e}")
-
-    # 2. 키워드 검색 (파일명 + 내용)
-    if mode in ("keyword", "hybrid"):
-        keyword_query = select(
-            DocumentChunk.document_id,
-            DocumentChunk.content,
-            Document.filename,
-        ).join(Document).where(
-            (Document.filename.ilike(f"%{query}%")) |
-            (DocumentChunk.content.ilike(f"%{query}%"))
-        ).where(Document.status == "completed").limit(10)
-
-        result = await db.execute(keyword_query)
-        rows = result.fetchall()
-
-        for doc_id, content, filename in rows:
-            if doc_id not in seen:
-                # 검색어 주변 snippet 추출
-                idx = content.lower().find(query.lower())
-                if idx >= 0:
-                    start = max(0, idx - 100)
-                    end = min(len(content), idx + len(query) + 100)
-                    snippet = content[start:end]
-                else:
-                    snippet = content[:200]
-
-                results.append({
-                    "document_id": doc_id,
-                    "filename": filename,
-                    "content_snippet": snippet,
-                })
-                seen.add(doc_id)
-
-    return results
+
+async def _keyword_search(
+    query: str, db: AsyncSession, limit: int = 10, scope: Optional[SearchScope] = None
+) -> list:
+    """키워드 검색 (pg_trgm GIN 인덱스 기반, 관련도 순)
+
+    snippet은 DB에서 계산한 검색어 위치 기준으로 잘라서 반환합니다.
+    TRIGRAM_MIN_CHARS 미만 검색어는 trigram 인덱스를 쓸 수 없어(ILIKE 전체 스캔)
+    BM25 어휘 색인의 2-gram으로 검색하며, 이때 score는 BM25 점수이고 파일명은
+    검색하지 않습니다. 한 글자 한글 검색어는 색인 토큰이 없어 결과가 없습니다.
+    """
+    if len(query.strip()) < TRIGRAM_MIN_CHARS:
+        return await _short_keyword_search(query.strip(), db, limit, scope)
+
+    filter_sql, params = scope_filter(scope)
+    result = await db.execute(
+        text(_KEYWORD_SEARCH_SQL.format(scope_filter=filter_sql)),
+        {
+            "q": query,
+            "pattern": f"%{_escape_like(query)}%",
+            "limit": limit,
+            "scan_limit": limit * 5,
+            **params,
+        },
+    )
+    return _keyword_rows(result.fetchall())
+
+
+async def _short_keyword_search(
+    query: str, db: AsyncSession, limit: int, scope: Optional[SearchScope]
+) -> list:
+    """짧은 검색어: 어휘 색인(chunk_terms) 상위 청크를 문서 단위로 묶어 반환"""
+    hits = await search_lexical(tokenize(query), db, top_k=limit * 5, scope=scope)
+    if not hits:
+        return []
+    result = await db.execute(
+        text(_SHORT_KEYWORD_SEARCH_SQL).bindparams(
+            bindparam("chunk_ids", type_=ARRAY(String)),
+            bindparam("scores", type_=ARRAY(Float)),
+        ),
+        {
+            "q": query,
+            "chunk_ids": [chunk_id for chunk_id, _ in hits],
+            "scores": [score for _, score in hits],
+            "limit": limit,
+        },
+    )
+    return _keyword_rows(result.fetchall())
+
+
+def _keyword_rows(rows) -> list:
+    return [
+        {
+            "document_id": doc_id,
+            "filename": filename,
+            "content_snippet": snippet,
+            "score": round(float(score), 4),
+        }
+        for doc_id, filename, score, snippet in rows
+    ]
+
+
+async def _vector_search_hits(
+    query: str, db: AsyncSession, top_k: int = 5, scope: Optional[SearchScope] = None
+) -> list:
+    """벡터 검색 결과를 검색 API 형식으로 변환 (문서당 점수가 가장 높은 청크 하나)"""
+    chunks = await retrieve_relevant_chunks(query, db, top_k=top_k, scope=scope)
+    best = {}
+    for chunk in chunks:
+        kept = best.get(chunk['document_id'])
+        if kept is None or chunk['score'] > kept['score']:
+            best[chunk['document_id']] = chunk
+    return [
+        {
+            "document_id": chunk['document_id'],
+            "filename": chunk['filename'],
+            "content_snippet": chunk['content'][:200],
+            "score": chunk['score'],
+        }
+        for chunk in sorted(best.values(), key=lambda c: c['score'], reverse=True)
+    ]
+
+
+async def _run_search_leg(
+    name: str, leg, query: str, scope: Optional[SearchScope], swallow_errors: bool = True
+) -> list:
+    """검색 레그를 독립 세션 + 타임아웃으로 실행 (지연 시 빈 결과)
+
+    타임아웃은 레그별 상한과 요청 처리 기한 중 짧은 쪽을 사용합니다.
+    swallow_errors=False면 타임아웃 외 오류는 그대로 올립니다 (단일 모드 검색).
+    """
+    try:
+        timeout = stage_timeout(name, settings.SEARCH_LEG_TIMEOUT)
+        async with async_session() as leg_db:
+            await apply_statement_timeout(leg_db, name)
+            return await asyncio.wait_for(leg(query, leg_db, scope=scope), timeout=timeout)
+    except (asyncio.TimeoutError, DeadlineExceeded):
+        logger.warning(f"{name} 검색 시간 초과 - 빈 결과로 대체")
+    except Exception as e:
+        if is_statement_timeout(e):
+            logger.warning(f"{name} 검색 시간 초과 (statement_timeout) - 빈 결과로 대체")
+            return []
+        if not swallow_errors:
+            raise
+        logger.warning(f"{name} 검색 실패 - 빈 결과로 대체: {e}")
+    return []
+
+
+def _reciprocal_rank_fusion(result_lists: list[list], k: int = RRF_K) -> list:
+    """Reciprocal Rank Fusion (문서 단위 중복 제거)
+
+    정렬은 RRF 점수로 하고, 노출용 score와 snippet은 가장 높은 순위를 준 레그의 값을 사용합니다.
+    """
+    fused: dict[str, dict] = {}
+    rrf_scores: dict[str, float] = {}
+    best_rank: dict[str, int] = {}
+
+    for hits in result_lists:
+        rank = 0
+        seen = set()
+        for hit in hits:
+            doc_id = hit["document_id"]
+            if doc_id in seen:
+                continue
+            seen.add(doc_id)
+            rank += 1
+            rrf_scores[doc_id] = rrf_scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+            if doc_id not in fused or rank < best_rank[doc_id]:
+                fused[doc_id] = dict(hit)
+                best_rank[doc_id] = rank
+
+    return sorted(fused.values(), key=lambda h: rrf_scores[h["document_id"]], reverse=True)
+
+
+async def search_documents(
+    query: str, mode: str = "hybrid", scope: Optional[SearchScope] = None
+) -> list:
+    """문서 검색 (키워드 + 벡터 하이브리드)
+
+    hybrid 모드는 벡터/키워드 검색을 각각의 풀 연결에서 동시에 실행하고
+    RRF로 병합하므로, 지연 시간은 두 레그 중 느린 쪽에 맞춰집니다.
+    단일 모드도 같은 레그 실행기를 거쳐 레그 타임아웃/요청 기한/statement_timeout을 적용하되,
+    시간 초과만 빈 결과로 대체하고 그 밖의 오류는 그대로 올립니다.
+    """
+    if mode == "vector":
+        return await _run_search_leg("벡터", _vector_search_hits, query, scope, swallow_errors=False)
+    if mode == "keyword":
+        return await _run_search_leg("키워드", _keyword_search, query, scope, swallow_errors=False)
+
+    vector_hits, keyword_hits = await asyncio.gather(
+        _run_search_leg("벡터", _vector_search_hits, query, scope),
+        _run_search_leg("키워드", _keyword_search, query, scope),
+    )
+    return _reciprocal_rank_fusion([vector_hits, keyword_hits])
@@ -0,0 +1,182 @@
+"""
+Stream Service - 재개 가능한 답변 스트림 (워커 메모리 내 재전송 버퍼)
+
+답변 생성은 HTTP 연결과 분리된 producer 태스크에서 실행되고, 이벤트는 스트림별
+제한된 버퍼에 순번(seq)과 함께 보관됩니다. 연결이 끊긴 클라이언트는
+`Last-Event-ID: {stream_id}:{seq}` 로 다시 연결해 같은 생성의 나머지를 받습니다.
+
+- 구독자가 모두 끊기고 STREAM_RESUME_GRACE 초 안에 재연결이 없으면 생성을 취소
+  (Ollama 생성 중단 + 부분 답변은 중단 표시로 저장). 첫 구독 전에 연결이 끊긴 경우도
+  같도록 유예 타이머는 스트림 시작 시점부터 돌고, 구독이 붙으면 해제됩니다.
+- 사용자가 중지하면 cancel_answer_stream()으로 유예 없이 바로 취소
+- 완료된 스트림은 STREAM_RETENTION 초 후 버퍼에서 제거
+- 버퍼는 워커 프로세스 메모리에 있으므로 재연결은 같은 워커로 라우팅되어야 합니다
+"""
+import asyncio
+import logging
+import uuid
+from collections import deque
+from contextlib import aclosing
+from typing import AsyncGenerator, AsyncIterator, Dict, Optional, Tuple
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger("baikal.stream")
+
+
+class AnswerStream:
+    """생성 중/완료된 답변 스트림 1개"""
+
+    def __init__(self, user_id: str):
+        self.stream_id = str(uuid.uuid4())
+        self.user_id = user_id
+        self.events: deque[Tuple[int, dict]] = deque(maxlen=settings.STREAM_BUFFER_EVENTS)
+        self.last_seq = 0
+        self.answer = ""  # 버퍼에서 밀려난 토큰 복구용 누적 답변
+        self.done = False
+        self.subscribers = 0
+        self._updated = asyncio.Event()
+        self._producer: Optional[asyncio.Task] = None
+        self._cancel_handle: Optional[asyncio.TimerHandle] = None
+
+    def publish(self, event: dict) -> None:
+        self.last_seq += 1
+        self.events.append((self.last_seq, event))
+        if event.get("type") == "token":
+            self.answer += event["content"]
+        self._notify()
+
+    def finish(self) -> None:
+        self.done = True
+        self._notify()
+
+    def _notify(self) -> None:
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    def attach(self) -> None:
+        self.subscribers += 1
+        if self._cancel_handle is not None:
+            self._cancel_handle.cancel()
+            self._cancel_handle = None
+
+    def detach(self) -> None:
+        self.subscribers -= 1
+        if self.subscribers == 0:
+            self._start_grace()
+
+    def _start_grace(self) -> None:
+        """구독자가 없는 동안 재연결 유예 타이머 시작"""
+        if self.done or self._cancel_handle is not None:
+            return
+        self._cancel_handle = asyncio.get_running_loop().call_later(
+            settings.STREAM_RESUME_GRACE, self._cancel_producer
+        )
+
+    def _cancel_producer(self) -> None:
+        self._cancel_handle = None
+        if self.subscribers == 0 and self._producer is not None and not self._producer.done():
+            logger.info(f"재연결 없음 - 답변 생성 취소: stream={self.stream_id}")
+            self._producer.cancel()
+
+    def cancel(self) -> None:
+        """사용자 중지 - 유예 없이 생성 취소 (슬롯은 producer 종료 시 반환)"""
+        if self._cancel_handle is not None:
+            self._cancel_handle.cancel()
+            self._cancel_handle = None
+        if self._producer is not None and not self._producer.done():
+            logger.info(f"사용자 중지 - 답변 생성 취소: stream={self.stream_id}")
+            # 시작 직후라면 producer의 첫 단계(생성기 진입 → 슬롯 반환 보장)가 먼저 실행되도록 다음 루프 차례에 취소
+            asyncio.get_running_loop().call_soon(self._producer.cancel)
+
+    async def subscribe(self, after_seq: int = 0) -> AsyncGenerator[Tuple[int, dict], None]:
+        """after_seq 이후 이벤트를 순서대로 전달 (완료될 때까지 대기)
+
+        요청한 이벤트가 이미 버퍼에서 밀려났으면 그때까지의 누적 답변을
+        snapshot 이벤트로 먼저 보냅니다.
+        """
+        self.attach()
+        try:
+            oldest = self.events[0][0] if self.events else self.last_seq + 1
+            if after_seq + 1 < oldest:
+                after_seq = oldest - 1
+                yield after_seq, {"type": "snapshot", "content": self._answer_before(oldest)}
+
+            while True:
+                updated = self._updated
+                for seq, event in list(self.events):
+                    if seq > after_seq:
+                        yield seq, event
+                        after_seq = seq
+                if self.done and after_seq >= self.last_seq:
+                    return
+                await updated.wait()
+        finally:
+            self.detach()
+
+    def _answer_before(self, seq: int) -> str:
+        """seq 이전까지의 누적 답변 (버퍼에 남은 토큰을 뒤에서 제외)"""
+        buffered = "".join(
+            event["content"] for s, event in self.events
+            if s >= seq and event.get("type") == "token"
+        )
+        return self.answer[: len(self.answer) - len(buffered)]
+
+
+_streams: Dict[str, AnswerStream] = {}
+
+
+def start_answer_stream(user_id: str, events: AsyncIterator[dict]) -> AnswerStream:
+    """답변 생성을 HTTP 연결과 분리된 태스크로 시작하고 스트림 등록"""
+    stream = AnswerStream(user_id)
+    stream.publish({"type": "stream", "stream_id": stream.stream_id})
+    _streams[stream.stream_id] = stream
+    stream._producer = asyncio.create_task(_produce(stream, events))
+    # 응답이 시작되기 전에 연결이 끊겨 subscribe()가 호출되지 않아도 생성이 정리되도록
+    stream._start_grace()
+    return stream
+
+
+async def _produce(stream: AnswerStream, events: AsyncIterator[dict]) -> None:
+    try:
+        async with aclosing(events):
+            async for event in events:
+                stream.publish(event)
+    except asyncio.CancelledError:
+        stream.publish({"type": "error", "content": "답변 생성이 취소되었습니다"})
+    except Exception as e:
+        logger.error(f"답변 스트림 오류: {e}", exc_info=True)
+        stream.publish({"type": "error", "content": str(e)})
+    finally:
+        stream.finish()
+        asyncio.get_running_loop().call_later(
+            settings.STREAM_RETENTION, _streams.pop, stream.stream_id, None
+        )
+
+
+def get_answer_stream(stream_id: str, user_id: str) -> Optional[AnswerStream]:
+    """재연결 대상 스트림 (본인 스트림만)"""
+    stream = _streams.get(stream_id)
+    if stream is None or stream.user_id != user_id:
+        return None
+    return stream
+
+
+def cancel_answer_stream(stream_id: str, user_id: str) -> bool:
+    """본인 스트림 생성 중지 (스트림이 없으면 False)"""
+    stream = get_answer_stream(stream_id, user_id)
+    if stream is None:
+        return False
+    stream.cancel()
+    return True
+
+
+def parse_last_event_id(value: Optional[str]) -> Tuple[Optional[str], int]:
+    """`{stream_id}:{seq}` 형식의 Last-Event-ID 파싱"""
+    if not value:
+        return None, 0
+    stream_id, _, seq = value.rpartition(":")
+    try:
+        return stream_id or None, int(seq)
+    except ValueError:
+        return None, 0
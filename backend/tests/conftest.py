@@ -0,0 +1,15 @@
+"""
+테스트 공통 설정 - DB 테스트는 일회용 테스트 DB(TEST_DATABASE_URL)에서만 실행
+
+init_db()는 청크 테이블 해시 파티션 전환, 인덱스/외래키 삭제 같은 되돌릴 수 없는
+마이그레이션을 수행하므로, 개발/운영 DATABASE_URL로는 실행하지 않습니다.
+
+    TEST_DATABASE_URL=postgresql+asyncpg://.../baikal_test python -m pytest tests
+"""
+import os
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+if TEST_DATABASE_URL:
+    # app 모듈이 엔진을 만들기 전에 테스트 DB로 교체
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
@@ -0,0 +1,115 @@
+"""
+벡터 검색 실행 계획 회귀 테스트 - 검색 쿼리가 HNSW 부분 인덱스를 사용하는지 EXPLAIN으로 확인
+
+일회용 테스트 PostgreSQL(pgvector)이 필요합니다 (TEST_DATABASE_URL, conftest.py 참고).
+설정되지 않았거나 연결할 수 없으면 건너뜁니다. 플래너 설정(enable_seqscan 등)은 건드리지
+않고, 부분 인덱스 조건(WHERE searchable)이 쿼리와 맞아 플래너가 스스로 인덱스를 고르는지 봅니다.
+시드 데이터는 트랜잭션 안에서만 만들고 롤백하므로 DB에 남지 않습니다.
+
+    cd backend && TEST_DATABASE_URL=... python -m pytest tests
+"""
+import asyncio
+import json
+import os
+import uuid
+
+import numpy as np
+import pytest
+from sqlalchemy import text as sql_text
+
+from app.config import get_settings
+from app.database import async_session, chunk_partition_tables, engine, init_db
+from app.models.document import Document, DocumentChunk
+from app.models.user import User
+from app.rag.retriever import _CANDIDATE_COLUMNS, _apply_hnsw_settings, _vector_search_sql
+from app.rag.scope import SearchScope, scope_filter
+
+settings = get_settings()
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL 미설정 (일회용 테스트 DB 필요)"
+)
+
+SEED_CHUNKS = 5000  # 순차 스캔 + 정렬보다 인덱스 스캔이 싸지는 규모
+
+
+def _expected_index() -> str:
+    # 파티션 테이블은 파티션별 로컬 인덱스(document_chunks_pN_embedding_idx)를 사용
+    return "_embedding_idx" if chunk_partition_tables() else "idx_chunk_embedding_searchable"
+
+
+async def _explain(scope) -> list:
+    rng = np.random.default_rng(0)
+    async with async_session() as db:
+        user = User(id=str(uuid.uuid4()), username=f"plan-{uuid.uuid4().hex[:12]}",
+                    password_hash="-", department="qa")
+        document = Document(
+            id=str(uuid.uuid4()), filename="plan.txt", filepath="/tmp/plan.txt",
+            file_type="txt", file_size=1, status="completed", uploaded_by=user.id,
+        )
+        db.add_all([user, document])
+        await db.flush()
+        db.add_all([
+            DocumentChunk(
+                document_id=document.id, chunk_index=i, content=f"chunk {i}",
+                embedding=rng.standard_normal(settings.EMBEDDING_DIMENSION).astype(np.float32),
+                owner_id=user.id,
+            )
+            for i in range(SEED_CHUNKS)
+        ])
+        await db.flush()
+        await db.execute(sql_text("ANALYZE document_chunks"))
+
+        filter_sql, params = scope_filter(scope(user))
+        await _apply_hnsw_settings(db, settings.MAX_CANDIDATE_K)
+        result = await db.execute(
+            sql_text(
+                "EXPLAIN (FORMAT JSON) "
+                + _CANDIDATE_COLUMNS.format(table="document_chunks")
+                + _vector_search_sql(filter_sql)
+            ),
+            {
+                "embedding": np.zeros(settings.EMBEDDING_DIMENSION, dtype=np.float32),
+                "top_k": settings.MAX_CANDIDATE_K,
+                **params,
+            },
+        )
+        plan = result.scalar()
+        await db.rollback()
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+
+def _plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def _run(scope) -> list:
+    async def main():
+        try:
+            await init_db()
+        except Exception as e:  # DB 없는 환경
+            await engine.dispose()
+            pytest.skip(f"PostgreSQL 연결 불가: {e}")
+        try:
+            return await _explain(scope)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("scope", [
+    pytest.param(lambda user: None, id="unrestricted"),
+    pytest.param(lambda user: SearchScope.for_user(user), id="user-scope"),
+])
+def test_vector_search_uses_hnsw_index(scope):
+    plan = _run(scope)
+    nodes = list(_plan_nodes(plan[0]["Plan"]))
+    seq_scans = [
+        n for n in nodes
+        if n["Node Type"] == "Seq Scan" and n.get("Relation Name", "").startswith("document_chunks")
+    ]
+    assert not seq_scans, json.dumps(plan, indent=2)
+    assert any(_expected_index() in n.get("Index Name", "") for n in nodes), json.dumps(plan, indent=2)
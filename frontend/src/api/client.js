@@ -94,7 +94,26 @@ export const usersAPI = {
 
 // ---- Documents API ----
 export const documentsAPI = {
-  list: () => client.get('/documents'),
+  // 커서 페이지 + 필터 (status, file_type, uploaded_by, filename_prefix, include_total)
+  list: (params) => client.get('/documents', { params }),
+  // 상태별 문서 수 - 목록을 모두 불러오지 않았을 때 통계 카드용 (큰 값은 서버 추정치, approximate 표시)
+  statusCounts: async () => {
+    const count = async (status) => {
+      const res = await client.get('/documents', { params: { status, limit: 1, include_total: true } });
+      return {
+        value: Number(res.headers['x-total-count'] || 0),
+        estimated: res.headers['x-total-count-estimated'] === 'true',
+      };
+    };
+    const results = await Promise.all(
+      [undefined, 'completed', 'uploading', 'processing', 'failed'].map(count),
+    );
+    const [total, completed, uploading, processing, failed] = results.map((r) => r.value);
+    return {
+      total, completed, processing: uploading + processing, failed,
+      approximate: results.some((r) => r.estimated),
+    };
+  },
   upload: (file, onProgress) => {
     const formData = new FormData();
     formData.append('file', file);
@@ -110,54 +129,111 @@ export const documentsAPI = {
 };
 
 // ---- Chat API ----
+const STREAM_RESUME_RETRIES = 3;
+
 export const chatAPI = {
-  sessions: () => client.get('/chat/sessions'),
+  // 목록은 커서 페이지 - 다음 페이지 커서는 X-Next-Cursor 응답 헤더
+  sessions: (cursor) => client.get('/chat/sessions', { params: { cursor } }),
   createSession: (title) =>
     client.post('/chat/sessions', { title: title || '새 대화' }),
-  messages: (sessionId) => client.get(`/chat/sessions/${sessionId}/messages`),
+  // 목록은 sources 없이 조회 (has_sources만) - 출처는 펼칠 때 메시지별로 조회
+  messages: (sessionId, before) =>
+    client.get(`/chat/sessions/${sessionId}/messages`, { params: { before } }),
+  sources: (sessionId, messageId) =>
+    client.get(`/chat/sessions/${sessionId}/messages/${messageId}/sources`),
   ask: (sessionId, question) =>
     client.post('/chat/ask', { session_id: sessionId, question }),
   deleteSession: (id) => client.delete(`/chat/sessions/${id}`),
 
-  // 스트리밍 질문응답
-  askStream: async function* (sessionId, question) {
+  // 답변 생성 중지 - 탭을 닫는 중에도 전송되도록 keepalive fetch 사용
+  cancelStream: (streamId) =>
+    fetch(`${API_BASE}/chat/ask/stream/${streamId}`, {
+      method: 'DELETE',
+      headers: { Authorization: `Bearer ${localStorage.getItem('access_token')}` },
+      keepalive: true,
+    }).catch(() => {}),
+
+  // 스트리밍 질문응답 (연결이 끊기면 Last-Event-ID로 같은 답변 스트림에 재연결)
+  // signal이 abort되면 재연결하지 않고 서버 생성도 즉시 중지
+  askStream: async function* (sessionId, question, signal) {
     const token = localStorage.getItem('access_token');
-    const response = await fetch(`${API_BASE}/chat/ask/stream`, {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-        Authorization: `Bearer ${token}`,
-      },
-      body: JSON.stringify({ session_id: sessionId, question }),
-    });
+    const headers = {
+      'Content-Type': 'application/json',
+      Authorization: `Bearer ${token}`,
+    };
+    let streamId = null;
+    let lastEventId = null;
+    let finished = false;
+    const onAbort = () => {
+      if (streamId && !finished) chatAPI.cancelStream(streamId);
+    };
+    signal?.addEventListener('abort', onAbort);
+
+    try {
+      for (let attempt = 0; attempt <= STREAM_RESUME_RETRIES; attempt++) {
+        const response = streamId
+          ? await fetch(`${API_BASE}/chat/ask/stream/${streamId}`, {
+              headers: { ...headers, 'Last-Event-ID': lastEventId || '' },
+              signal,
+            })
+          : await fetch(`${API_BASE}/chat/ask/stream`, {
+              method: 'POST',
+              headers,
+              body: JSON.stringify({ session_id: sessionId, question }),
+              signal,
+            });
+
+        if (!response.ok) {
+          const err = await response.json().catch(() => ({ detail: '스트리밍 요청 실패' }));
+          const error = new Error(err.detail || '스트리밍 요청 실패');
+          error.status = response.status;
+          throw error;
+        }
 
-    if (!response.ok) {
-      const err = await response.json().catch(() => ({ detail: '스트리밍 요청 실패' }));
-      throw new Error(err.detail || '스트리밍 요청 실패');
-    }
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
 
-    const reader = response.body.getReader();
-    const decoder = new TextDecoder();
-    let buffer = '';
-
-    while (true) {
-      const { done, value } = await reader.read();
-      if (done) break;
-
-      buffer += decoder.decode(value, { stream: true });
-      const lines = buffer.split('\n');
-      buffer = lines.pop() || '';
-
-      for (const line of lines) {
-        if (line.startsWith('data: ')) {
-          try {
-            const data = JSON.parse(line.slice(6));
-            yield data;
-          } catch {
-            // JSON 파싱 실패 무시
+        try {
+          while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop() || '';
+
+            for (const line of lines) {
+              if (line.startsWith('id: ')) {
+                lastEventId = line.slice(4);
+              } else if (line.startsWith('data: ')) {
+                try {
+                  const data = JSON.parse(line.slice(6));
+                  if (data.type === 'stream') {
+                    streamId = data.stream_id;
+                    continue;
+                  }
+                  if (data.type === 'done' || data.type === 'error') finished = true;
+                  yield data;
+                } catch {
+                  // JSON 파싱 실패 무시
+                }
+              }
+            }
           }
+        } catch (err) {
+          // 네트워크 끊김 - 스트림 id가 있으면 재연결 (사용자 중지는 제외)
+          if (signal?.aborted || !streamId || attempt === STREAM_RESUME_RETRIES) throw err;
         }
+
+        if (finished) return;
+        if (!streamId) throw new Error('스트리밍 연결이 끊어졌습니다');
+        await new Promise((resolve) => setTimeout(resolve, 1000 * (attempt + 1)));
+        if (signal?.aborted) throw new DOMException('Aborted', 'AbortError');
       }
+      throw new Error('스트리밍 연결이 끊어졌습니다');
+    } finally {
+      signal?.removeEventListener('abort', onAbort);
     }
   },
 };
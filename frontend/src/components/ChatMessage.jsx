@@ -1,12 +1,30 @@
 /**
  * ChatMessage - 다크 테마 Perplexity-스타일 메시지
  */
-import React from 'react';
+import React, { useState } from 'react';
 import ReactMarkdown from 'react-markdown';
 import { HiOutlineDocumentText } from 'react-icons/hi2';
+import toast from 'react-hot-toast';
+import { chatAPI } from '../api/client';
 
 export default function ChatMessage({ message }) {
   const isUser = message.role === 'user';
+  // 불러온 이전 메시지는 sources 없이 오므로(has_sources) 펼칠 때 조회
+  const [loadedSources, setLoadedSources] = useState(null);
+  const [loadingSources, setLoadingSources] = useState(false);
+  const sources = message.sources || loadedSources;
+
+  const loadSources = async () => {
+    setLoadingSources(true);
+    try {
+      const res = await chatAPI.sources(message.session_id, message.id);
+      setLoadedSources(res.data.sources || { documents: [] });
+    } catch {
+      toast.error('참고 문서 로드 실패');
+    } finally {
+      setLoadingSources(false);
+    }
+  };
 
   if (isUser) {
     return (
@@ -33,12 +51,23 @@ export default function ChatMessage({ message }) {
         <ReactMarkdown>{message.content}</ReactMarkdown>
       </div>
 
-      {/* 참고 문서 */}
-      {message.sources?.documents?.length > 0 && (
+      {/* 참고 문서 (이전 메시지는 펼칠 때 조회) */}
+      {!sources && message.has_sources && (
+        <div className="pl-7 mt-3 pt-2.5 border-t border-white/[0.05]">
+          <button
+            onClick={loadSources}
+            disabled={loadingSources}
+            className="text-[9px] font-semibold text-gray-600 hover:text-gray-400 uppercase tracking-widest disabled:opacity-50"
+          >
+            {loadingSources ? '참고 문서 불러오는 중...' : '참고 문서 보기'}
+          </button>
+        </div>
+      )}
+      {sources?.documents?.length > 0 && (
         <div className="pl-7 mt-3 pt-2.5 border-t border-white/[0.05]">
           <p className="text-[9px] font-semibold text-gray-600 uppercase tracking-widest mb-2">참고 문서</p>
           <div className="flex flex-wrap gap-1.5">
-            {message.sources.documents.map((src, idx) => (
+            {sources.documents.map((src, idx) => (
               <span key={idx} className="inline-flex items-center gap-1 px-2 py-1 rounded-md text-[10px] font-medium bg-white/[0.04] text-gray-400 border border-white/[0.06]">
                 <HiOutlineDocumentText className="w-3 h-3 text-gray-500" />
                 {src.filename}
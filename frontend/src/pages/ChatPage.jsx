@@ -17,6 +17,7 @@ import {
   HiOutlineChevronLeft,
   HiOutlineMagnifyingGlass,
   HiOutlineArrowPath,
+  HiOutlineStop,
 } from 'react-icons/hi2';
 
 export default function ChatPage() {
@@ -28,22 +29,57 @@ export default function ChatPage() {
   const messagesEndRef = useRef(null);
   const inputRef = useRef(null);
   const [showSessions, setShowSessions] = useState(false);
+  const [sessionsCursor, setSessionsCursor] = useState(null);
+  const [messagesCursor, setMessagesCursor] = useState(null);
+  const keepScrollRef = useRef(false);
+  const abortRef = useRef(null);
 
   useEffect(() => { loadSessions(); }, []);
+  useEffect(() => {
+    // 페이지 이동/탭 닫기 시 진행 중인 생성 중지 (재연결 유예를 기다리지 않음)
+    const stop = () => abortRef.current?.abort();
+    window.addEventListener('pagehide', stop);
+    return () => { window.removeEventListener('pagehide', stop); stop(); };
+  }, []);
   useEffect(() => { if (activeSession) loadMessages(activeSession); }, [activeSession]);
-  useEffect(() => { messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' }); }, [messages]);
+  useEffect(() => {
+    // 이전 메시지를 앞에 붙일 때는 스크롤 위치 유지
+    if (keepScrollRef.current) { keepScrollRef.current = false; return; }
+    messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
+  }, [messages]);
 
   const loadSessions = async () => {
     try {
       const res = await chatAPI.sessions();
       setSessions(res.data);
+      setSessionsCursor(res.headers['x-next-cursor'] || null);
       if (res.data.length > 0 && !activeSession) setActiveSession(res.data[0].id);
     } catch { toast.error('세션 로드 실패'); }
   };
 
+  const loadMoreSessions = async () => {
+    try {
+      const res = await chatAPI.sessions(sessionsCursor);
+      setSessions((prev) => [...prev, ...res.data]);
+      setSessionsCursor(res.headers['x-next-cursor'] || null);
+    } catch { toast.error('세션 로드 실패'); }
+  };
+
   const loadMessages = async (sessionId) => {
-    try { const res = await chatAPI.messages(sessionId); setMessages(res.data); }
-    catch { toast.error('메시지 로드 실패'); }
+    try {
+      const res = await chatAPI.messages(sessionId);
+      setMessages(res.data);
+      setMessagesCursor(res.headers['x-next-cursor'] || null);
+    } catch { toast.error('메시지 로드 실패'); }
+  };
+
+  const loadOlderMessages = async () => {
+    try {
+      const res = await chatAPI.messages(activeSession, messagesCursor);
+      keepScrollRef.current = true;
+      setMessages((prev) => [...res.data, ...prev]);
+      setMessagesCursor(res.headers['x-next-cursor'] || null);
+    } catch { toast.error('메시지 로드 실패'); }
   };
 
   const createSession = async () => {
@@ -52,6 +88,7 @@ export default function ChatPage() {
       setSessions([res.data, ...sessions]);
       setActiveSession(res.data.id);
       setMessages([]);
+      setMessagesCursor(null);
     } catch { toast.error('세션 생성 실패'); }
   };
 
@@ -60,7 +97,7 @@ export default function ChatPage() {
       await chatAPI.deleteSession(id);
       const updated = sessions.filter((s) => s.id !== id);
       setSessions(updated);
-      if (activeSession === id) { setActiveSession(updated.length > 0 ? updated[0].id : null); setMessages([]); }
+      if (activeSession === id) { setActiveSession(updated.length > 0 ? updated[0].id : null); setMessages([]); setMessagesCursor(null); }
     } catch { toast.error('세션 삭제 실패'); }
   };
 
@@ -87,12 +124,24 @@ export default function ChatPage() {
     const streamingMsgId = 'streaming-' + Date.now();
     let fullAnswer = '';
     let sources = [];
+    const controller = new AbortController();
+    abortRef.current = controller;
 
     try {
       setMessages((prev) => [...prev, { role: 'assistant', content: '', sources: null, id: streamingMsgId }]);
-      for await (const event of chatAPI.askStream(sessionId, q)) {
-        if (event.type === 'sources') { sources = event.sources || []; }
-        else if (event.type === 'token') {
+      for await (const event of chatAPI.askStream(sessionId, q, controller.signal)) {
+        if (event.type === 'queue') {
+          // 생성 대기열 순번 - 첫 토큰 전까지 안내 문구 표시
+          const notice = event.position > 0
+            ? `답변 대기 중입니다 (앞에 ${event.position}건, 약 ${event.estimated_wait}초)`
+            : '';
+          setMessages((prev) => prev.map((m) => m.id === streamingMsgId && !fullAnswer ? { ...m, content: notice } : m));
+        } else if (event.type === 'sources') { sources = event.sources || []; }
+        else if (event.type === 'snapshot') {
+          // 재연결 시 버퍼에서 밀려난 구간 - 누적 답변으로 교체
+          fullAnswer = event.content;
+          setMessages((prev) => prev.map((m) => m.id === streamingMsgId ? { ...m, content: fullAnswer } : m));
+        } else if (event.type === 'token') {
           fullAnswer += event.content;
           setMessages((prev) => prev.map((m) => m.id === streamingMsgId ? { ...m, content: fullAnswer } : m));
         } else if (event.type === 'done') {
@@ -104,7 +153,19 @@ export default function ChatPage() {
       }
       loadSessions();
     } catch (err) {
+      if (controller.signal.aborted) {
+        // 사용자 중지 - 받은 부분까지만 표시 (서버에는 중단 표시로 저장됨)
+        setMessages((prev) => fullAnswer
+          ? prev.map((m) => m.id === streamingMsgId ? { ...m, content: fullAnswer, sources: { documents: sources } } : m)
+          : prev.filter((m) => m.id !== streamingMsgId));
+        return;
+      }
       setMessages((prev) => prev.filter((m) => m.id !== streamingMsgId));
+      if (err.status === 429) {
+        // 대기열 초과 - 비스트리밍 재시도도 같은 한도에 걸리므로 안내만 표시
+        toast.error(err.message);
+        return;
+      }
       try {
         const res = await chatAPI.ask(sessionId, q);
         setMessages((prev) => [...prev, { role: 'assistant', content: res.data.answer, sources: { documents: res.data.sources }, id: res.data.message_id }]);
@@ -112,9 +173,14 @@ export default function ChatPage() {
       } catch (fallbackErr) {
         toast.error(fallbackErr.response?.data?.detail || fallbackErr.message || 'AI 답변 생성 실패');
       }
-    } finally { setLoading(false); }
+    } finally {
+      if (abortRef.current === controller) abortRef.current = null;
+      setLoading(false);
+    }
   };
 
+  const stopAnswer = () => abortRef.current?.abort();
+
   const handleQuickQuestion = (q) => {
     setQuestion(q);
     inputRef.current?.focus();
@@ -176,6 +242,14 @@ export default function ChatPage() {
               </div>
             );
           })}
+          {sessionsCursor && (
+            <button
+              onClick={loadMoreSessions}
+              className="w-full px-2.5 py-2 text-[11px] text-gray-600 hover:text-gray-300 rounded-lg hover:bg-white/[0.03] transition-colors"
+            >
+              이전 대화 더 보기
+            </button>
+          )}
           {sessions.length === 0 && (
             <div className="px-3 py-10 text-center">
               <HiOutlineChatBubbleLeftRight className="w-6 h-6 text-gray-700 mx-auto mb-2" />
@@ -243,6 +317,16 @@ export default function ChatPage() {
             </div>
           ) : (
             <div className="max-w-3xl mx-auto w-full px-4 sm:px-6 pt-5">
+              {messagesCursor && (
+                <div className="flex justify-center pb-3">
+                  <button
+                    onClick={loadOlderMessages}
+                    className="px-3 py-1.5 rounded-full text-[11px] text-gray-500 border border-white/[0.06] hover:text-gray-300 hover:border-white/[0.12] transition-colors"
+                  >
+                    이전 메시지 더 보기
+                  </button>
+                </div>
+              )}
               {messages.map((msg, idx) => (
                 <ChatMessage key={msg.id || idx} message={msg} />
               ))}
@@ -284,13 +368,24 @@ export default function ChatPage() {
                 className="w-full pl-4 pr-12 py-3 bg-white/[0.04] border border-white/[0.06] rounded-xl text-[14px] text-gray-200 placeholder:text-gray-600 focus:outline-none focus:bg-white/[0.06] focus:border-baikal-500/40 focus:ring-2 focus:ring-baikal-500/10 transition-all duration-200"
                 disabled={loading}
               />
-              <button
-                type="submit"
-                disabled={loading || !question.trim()}
-                className="absolute right-1.5 p-2 rounded-lg bg-baikal-600 text-white hover:bg-baikal-500 disabled:opacity-30 disabled:cursor-not-allowed transition-all duration-200"
-              >
-                <HiOutlinePaperAirplane className="w-4 h-4" />
-              </button>
+              {loading ? (
+                <button
+                  type="button"
+                  onClick={stopAnswer}
+                  title="답변 중지"
+                  className="absolute right-1.5 p-2 rounded-lg bg-white/[0.08] text-gray-300 hover:bg-white/[0.14] transition-all duration-200"
+                >
+                  <HiOutlineStop className="w-4 h-4" />
+                </button>
+              ) : (
+                <button
+                  type="submit"
+                  disabled={!question.trim()}
+                  className="absolute right-1.5 p-2 rounded-lg bg-baikal-600 text-white hover:bg-baikal-500 disabled:opacity-30 disabled:cursor-not-allowed transition-all duration-200"
+                >
+                  <HiOutlinePaperAirplane className="w-4 h-4" />
+                </button>
+              )}
             </div>
             <p className="text-center text-[10px] text-gray-600 mt-2 font-medium">
               BAIKAL AI · 문서 기반 RAG 답변 · 정확하지 않을 수 있습니다
@@ -21,6 +21,10 @@ const STATUS_MAP = {
   failed: { label: '실패', dot: 'bg-red-400', bg: 'bg-red-500/15 text-red-400' },
 };
 
+const PAGE_SIZE = 50;
+
+const isPending = (d) => d.status === 'uploading' || d.status === 'processing';
+
 function formatBytes(bytes) {
   if (bytes === 0) return '0 B';
   const k = 1024;
@@ -32,21 +36,67 @@ function formatBytes(bytes) {
 export default function DocumentsPage() {
   const [documents, setDocuments] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [cursor, setCursor] = useState(null);
+  const [counts, setCounts] = useState(null);
 
+  // 첫 페이지부터 다시 조회. 다음 페이지가 있으면 통계는 서버 집계를 한 번 조회
   const loadDocuments = useCallback(async () => {
-    try { const res = await documentsAPI.list(); setDocuments(res.data); }
+    try {
+      const res = await documentsAPI.list({ limit: PAGE_SIZE });
+      const next = res.headers['x-next-cursor'] || null;
+      setDocuments(res.data);
+      setCursor(next);
+      setCounts(next ? await documentsAPI.statusCounts() : null);
+    }
     catch { toast.error('문서 목록 로드 실패'); }
     finally { setLoading(false); }
   }, []);
 
+  // 서버 집계를 쓰는 중일 때만 통계 다시 조회 (전부 불러왔으면 목록에서 계산)
+  const refreshCounts = useCallback(async () => {
+    if (!counts) return;
+    try { setCounts(await documentsAPI.statusCounts()); } catch { /* 다음 갱신 때 재시도 */ }
+  }, [counts]);
+
+  const loadMore = async () => {
+    try {
+      const res = await documentsAPI.list({ limit: PAGE_SIZE, cursor });
+      setDocuments((prev) => [...prev, ...res.data]);
+      setCursor(res.headers['x-next-cursor'] || null);
+    } catch { toast.error('문서 목록 로드 실패'); }
+  };
+
+  // 새로 올라온 문서만 목록 앞에 추가 (이미 불러온 이후 페이지는 유지)
+  const loadNewest = async () => {
+    try {
+      const res = await documentsAPI.list({ limit: PAGE_SIZE });
+      setDocuments((prev) => {
+        const known = new Set(prev.map((d) => d.id));
+        return [...res.data.filter((d) => !known.has(d.id)), ...prev];
+      });
+      refreshCounts();
+    } catch { toast.error('문서 목록 로드 실패'); }
+  };
+
   useEffect(() => { loadDocuments(); }, [loadDocuments]);
 
+  // 처리 중인 문서만 상태 조회 (목록 전체를 다시 불러오지 않음)
+  const pendingIds = documents.filter(isPending).map((d) => d.id).join(',');
   useEffect(() => {
-    const processing = documents.filter((d) => d.status === 'uploading' || d.status === 'processing');
-    if (processing.length === 0) return;
-    const interval = setInterval(() => { loadDocuments(); }, 3000);
+    if (!pendingIds) return;
+    const ids = pendingIds.split(',');
+    const interval = setInterval(async () => {
+      const updates = (await Promise.all(
+        ids.map((id) => documentsAPI.status(id).then((res) => res.data).catch(() => null)),
+      )).filter(Boolean);
+      const byId = Object.fromEntries(updates.map((u) => [u.id, u]));
+      setDocuments((prev) => prev.map((d) => (byId[d.id] && byId[d.id].status !== d.status
+        ? { ...d, status: byId[d.id].status, error_message: byId[d.id].error_message }
+        : d)));
+      if (updates.some((u) => !isPending(u))) refreshCounts();
+    }, 3000);
     return () => clearInterval(interval);
-  }, [documents, loadDocuments]);
+  }, [pendingIds, refreshCounts]);
 
   const handleDownload = async (doc) => {
     try {
@@ -57,7 +107,8 @@ export default function DocumentsPage() {
     } catch { toast.error('다운로드 실패'); }
   };
 
-  const stats = {
+  const approx = counts?.approximate ? '~' : '';
+  const stats = counts || {
     total: documents.length,
     completed: documents.filter((d) => d.status === 'completed').length,
     processing: documents.filter((d) => d.status === 'processing' || d.status === 'uploading').length,
@@ -72,7 +123,7 @@ export default function DocumentsPage() {
             <h1 className="text-xl sm:text-[28px] font-extrabold text-gray-100 tracking-tight">문서 관리</h1>
             <p className="text-sm text-gray-500 mt-1 font-medium">문서를 업로드하고 AI 분석을 시작하세요</p>
           </div>
-          <button onClick={loadDocuments} className="p-2.5 text-gray-500 hover:text-baikal-400 hover:bg-white/[0.04] rounded-lg transition-all" title="새로고침">
+          <button onClick={() => loadDocuments()} className="p-2.5 text-gray-500 hover:text-baikal-400 hover:bg-white/[0.04] rounded-lg transition-all" title="새로고침">
             <HiOutlineArrowPath className="w-5 h-5" />
           </button>
         </div>
@@ -80,9 +131,9 @@ export default function DocumentsPage() {
         {/* 통계 카드 */}
         <div className="grid grid-cols-1 sm:grid-cols-3 gap-3 sm:gap-4 mb-6 sm:mb-8">
           {[
-            { label: '전체 문서', value: stats.total, icon: HiOutlineCircleStack, gradient: 'from-baikal-600 to-blue-600' },
-            { label: '분석 완료', value: stats.completed, icon: HiOutlineCheckCircle, gradient: 'from-emerald-600 to-teal-600' },
-            { label: '처리 중', value: stats.processing, icon: HiOutlineClock, gradient: 'from-amber-500 to-orange-500' },
+            { label: '전체 문서', value: `${approx}${stats.total}`, icon: HiOutlineCircleStack, gradient: 'from-baikal-600 to-blue-600' },
+            { label: '분석 완료', value: `${approx}${stats.completed}`, icon: HiOutlineCheckCircle, gradient: 'from-emerald-600 to-teal-600' },
+            { label: '처리 중', value: `${approx}${stats.processing}`, icon: HiOutlineClock, gradient: 'from-amber-500 to-orange-500' },
           ].map((stat) => (
             <div key={stat.label} className="bg-white/[0.03] rounded-xl border border-white/[0.06] p-4 hover:bg-white/[0.04] transition-all duration-150">
               <div className="flex items-center justify-between mb-3">
@@ -98,7 +149,7 @@ export default function DocumentsPage() {
 
         {/* 업로드 */}
         <div className="mb-6 sm:mb-8">
-          <DocumentUpload onUploaded={loadDocuments} />
+          <DocumentUpload onUploaded={loadNewest} />
         </div>
 
         {/* 문서 목록 */}
@@ -106,7 +157,7 @@ export default function DocumentsPage() {
           <div className="px-6 py-4 border-b border-white/[0.04]">
             <div className="flex items-center gap-3">
               <h2 className="text-[15px] font-bold text-gray-200">문서 목록</h2>
-              <span className="px-2 py-0.5 rounded-lg bg-white/[0.06] text-[11px] font-bold text-gray-400">{documents.length}</span>
+              <span className="px-2 py-0.5 rounded-lg bg-white/[0.06] text-[11px] font-bold text-gray-400">{approx}{stats.total}</span>
             </div>
           </div>
 
@@ -175,6 +226,16 @@ export default function DocumentsPage() {
                 })}
               </tbody>
             </table>
+            {cursor && (
+              <div className="px-6 py-3 border-t border-white/[0.04] text-center">
+                <button
+                  onClick={loadMore}
+                  className="px-3 py-1.5 rounded-lg text-[12px] font-medium text-gray-400 hover:text-gray-200 hover:bg-white/[0.04] transition-colors"
+                >
+                  더 보기 ({documents.length} / {approx}{stats.total})
+                </button>
+              </div>
+            )}
             </div>
           )}
         </div>
@@ -22,6 +22,8 @@ const STATUS_MAP = {
   failed: { label: '실패', dot: 'bg-red-400', bg: 'bg-red-500/15 text-red-400' },
 };
 
+const PAGE_SIZE = 50;
+
 function formatBytes(bytes) {
   if (bytes === 0) return '0 B';
   const k = 1024;
@@ -33,18 +35,46 @@ function formatBytes(bytes) {
 export default function AdminDocumentsPage() {
   const [documents, setDocuments] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [cursor, setCursor] = useState(null);
+  const [counts, setCounts] = useState(null);
 
+  // 첫 페이지부터 다시 조회. 다음 페이지가 있으면 통계는 서버 집계를 한 번 조회
   const loadDocuments = useCallback(async () => {
-    try { const res = await documentsAPI.list(); setDocuments(res.data); }
+    try {
+      const res = await documentsAPI.list({ limit: PAGE_SIZE });
+      const next = res.headers['x-next-cursor'] || null;
+      setDocuments(res.data);
+      setCursor(next);
+      setCounts(next ? await documentsAPI.statusCounts() : null);
+    }
     catch { toast.error('문서 목록 로드 실패'); }
     finally { setLoading(false); }
   }, []);
 
+  // 서버 집계를 쓰는 중일 때만 통계 다시 조회 (전부 불러왔으면 목록에서 계산)
+  const refreshCounts = useCallback(async () => {
+    if (!counts) return;
+    try { setCounts(await documentsAPI.statusCounts()); } catch { /* 다음 갱신 때 재시도 */ }
+  }, [counts]);
+
+  const loadMore = async () => {
+    try {
+      const res = await documentsAPI.list({ limit: PAGE_SIZE, cursor });
+      setDocuments((prev) => [...prev, ...res.data]);
+      setCursor(res.headers['x-next-cursor'] || null);
+    } catch { toast.error('문서 목록 로드 실패'); }
+  };
+
   useEffect(() => { loadDocuments(); }, [loadDocuments]);
 
   const handleDelete = async (doc) => {
     if (!window.confirm(`"${doc.filename}" 문서를 삭제하시겠습니까?`)) return;
-    try { await documentsAPI.delete(doc.id); toast.success('문서 삭제 완료'); loadDocuments(); }
+    try {
+      await documentsAPI.delete(doc.id);
+      toast.success('문서 삭제 완료');
+      setDocuments((prev) => prev.filter((d) => d.id !== doc.id));
+      refreshCounts();
+    }
     catch (err) { toast.error(err.response?.data?.detail || '삭제 실패'); }
   };
 
@@ -57,7 +87,8 @@ export default function AdminDocumentsPage() {
     } catch { toast.error('다운로드 실패'); }
   };
 
-  const stats = {
+  const approx = counts?.approximate ? '~' : '';
+  const stats = counts || {
     total: documents.length,
     completed: documents.filter((d) => d.status === 'completed').length,
     processing: documents.filter((d) => d.status === 'processing' || d.status === 'uploading').length,
@@ -73,7 +104,7 @@ export default function AdminDocumentsPage() {
             <h1 className="text-xl sm:text-[28px] font-extrabold text-gray-100 tracking-tight">문서 관리</h1>
             <p className="text-sm text-gray-500 mt-1 font-medium">전체 시스템 문서 관리 (관리자)</p>
           </div>
-          <button onClick={loadDocuments} className="p-2.5 text-gray-500 hover:text-baikal-400 hover:bg-white/[0.04] rounded-lg transition-all" title="새로고침">
+          <button onClick={() => loadDocuments()} className="p-2.5 text-gray-500 hover:text-baikal-400 hover:bg-white/[0.04] rounded-lg transition-all" title="새로고침">
             <HiOutlineArrowPath className="w-5 h-5" />
           </button>
         </div>
@@ -81,10 +112,10 @@ export default function AdminDocumentsPage() {
         {/* 통계 */}
         <div className="grid grid-cols-2 sm:grid-cols-4 gap-3 sm:gap-4 mb-6 sm:mb-8">
           {[
-            { label: '전체', value: stats.total, icon: HiOutlineCircleStack, gradient: 'from-baikal-600 to-blue-600' },
-            { label: '완료', value: stats.completed, icon: HiOutlineCheckCircle, gradient: 'from-emerald-600 to-teal-600' },
-            { label: '처리중', value: stats.processing, icon: HiOutlineClock, gradient: 'from-blue-500 to-indigo-600' },
-            { label: '실패', value: stats.failed, icon: HiOutlineExclamationTriangle, gradient: 'from-red-500 to-rose-600' },
+            { label: '전체', value: `${approx}${stats.total}`, icon: HiOutlineCircleStack, gradient: 'from-baikal-600 to-blue-600' },
+            { label: '완료', value: `${approx}${stats.completed}`, icon: HiOutlineCheckCircle, gradient: 'from-emerald-600 to-teal-600' },
+            { label: '처리중', value: `${approx}${stats.processing}`, icon: HiOutlineClock, gradient: 'from-blue-500 to-indigo-600' },
+            { label: '실패', value: `${approx}${stats.failed}`, icon: HiOutlineExclamationTriangle, gradient: 'from-red-500 to-rose-600' },
           ].map((stat) => (
             <div key={stat.label} className="bg-white/[0.03] rounded-xl border border-white/[0.06] p-4 hover:bg-white/[0.04] transition-all duration-150">
               <div className="flex items-center justify-between mb-3">
@@ -103,7 +134,7 @@ export default function AdminDocumentsPage() {
           <div className="px-6 py-4 border-b border-white/[0.04]">
             <div className="flex items-center gap-3">
               <h2 className="text-[15px] font-bold text-gray-200">문서 목록</h2>
-              <span className="px-2 py-0.5 rounded-lg bg-white/[0.06] text-[11px] font-bold text-gray-400">{documents.length}</span>
+              <span className="px-2 py-0.5 rounded-lg bg-white/[0.06] text-[11px] font-bold text-gray-400">{approx}{stats.total}</span>
             </div>
           </div>
 
@@ -172,6 +203,16 @@ export default function AdminDocumentsPage() {
                 })}
               </tbody>
             </table>
+            {cursor && (
+              <div className="px-6 py-3 border-t border-white/[0.04] text-center">
+                <button
+                  onClick={loadMore}
+                  className="px-3 py-1.5 rounded-lg text-[12px] font-medium text-gray-400 hover:text-gray-200 hover:bg-white/[0.04] transition-colors"
+                >
+                  더 보기 ({documents.length} / {approx}{stats.total})
+                </button>
+              </div>
+            )}
             </div>
           )}
         </div>
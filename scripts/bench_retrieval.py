@@ -0,0 +1,166 @@
+"""
+BAIKAL Private AI - 벡터 검색 벤치마크 스크립트
+실행: cd backend && python ../scripts/bench_retrieval.py [--seed] [--cleanup] [--coarse]
+
+합성 문서/청크(랜덤 임베딩)를 생성한 뒤, 열람 가능한 문서 수가 다른 사용자별로
+검색 지연 시간과 선택된 전략(정확 검색 / HNSW)을 측정합니다.
+--coarse 지정 시 단일 단계 검색과 coarse-to-fine(문서 대표 벡터 → 청크) 검색을 비교합니다.
+Ollama 없이 DB 검색 경로만 측정합니다.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from sqlalchemy import delete, insert, select, text  # noqa: E402
+from app.config import get_settings  # noqa: E402
+from app.database import async_session, init_db  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.document import Document, DocumentChunk  # noqa: E402
+from app.rag.scope import SearchScope, scope_filter, VISIBILITY_PRIVATE  # noqa: E402
+from app.rag.retriever import search_by_embedding, _estimate_scope_rows  # noqa: E402
+
+settings = get_settings()
+
+BENCH_PREFIX = "bench_"
+# 사용자명 → 본인 전용(private) 문서 수
+BENCH_USERS = {
+    "bench_small": 10,
+    "bench_large": 10_000,
+}
+CHUNKS_PER_DOC = 3
+QUERIES = 30
+CANDIDATE_K = 20
+
+
+def _random_embedding(rng: np.random.Generator) -> list:
+    vec = rng.standard_normal(settings.EMBEDDING_DIMENSION).astype(np.float32)
+    return (vec / np.linalg.norm(vec)).tolist()
+
+
+async def seed(rng: np.random.Generator):
+    """벤치마크용 사용자/문서/청크 생성"""
+    async with async_session() as db:
+        for username, doc_count in BENCH_USERS.items():
+            user = User(username=username, password_hash="-", role="user")
+            db.add(user)
+            await db.flush()
+
+            for start in range(0, doc_count, 500):
+                docs, chunks = [], []
+                for _ in range(start, min(start + 500, doc_count)):
+                    doc_id = str(uuid.uuid4())
+                    embeddings = [_random_embedding(rng) for _ in range(CHUNKS_PER_DOC)]
+                    docs.append({
+                        "id": doc_id, "filename": f"{BENCH_PREFIX}{doc_id}.pdf",
+                        "filepath": "-", "file_type": "pdf", "file_size": 0,
+                        "status": "completed", "uploaded_by": user.id,
+                        "visibility": VISIBILITY_PRIVATE,
+                        "embedding": np.mean(embeddings, axis=0).tolist(),
+                    })
+                    for i, embedding in enumerate(embeddings):
+                        chunks.append({
+                            "id": str(uuid.uuid4()), "document_id": doc_id,
+                            "chunk_index": i, "content": f"benchmark chunk {i}",
+                            "embedding": embedding,
+                            "token_count": 3, "term_freqs": {},
+                            "searchable": True, "owner_id": user.id,
+                            "visibility": VISIBILITY_PRIVATE,
+                        })
+                await db.execute(insert(Document), docs)
+                await db.execute(insert(DocumentChunk), chunks)
+                await db.commit()
+            print(f"[SEED] {username}: 문서 {doc_count}개, 청크 {doc_count * CHUNKS_PER_DOC}개")
+
+        await db.execute(text("ANALYZE documents"))
+        await db.execute(text("ANALYZE document_chunks"))
+        await db.commit()
+
+
+async def cleanup():
+    """벤치마크 데이터 삭제"""
+    async with async_session() as db:
+        users = (await db.execute(
+            select(User.id).where(User.username.in_(BENCH_USERS))
+        )).scalars().all()
+        if users:
+            await db.execute(delete(Document).where(Document.uploaded_by.in_(users)))
+            await db.execute(delete(User).where(User.id.in_(users)))
+            await db.commit()
+    print("[CLEANUP] 벤치마크 데이터 삭제 완료")
+
+
+async def run(rng: np.random.Generator, coarse: bool = False):
+    if coarse:
+        for enabled in (False, True):
+            settings.COARSE_TO_FINE_ENABLED = enabled
+            print(
+                f"--- coarse-to-fine {'ON' if enabled else 'OFF'}"
+                + (f" (상위 {settings.COARSE_TOP_DOCUMENTS}개 문서)" if enabled else "")
+                + " ---"
+            )
+            await _run_once(rng)
+    else:
+        await _run_once(rng)
+
+
+async def _run_once(rng: np.random.Generator):
+    async with async_session() as db:
+        for username in BENCH_USERS:
+            user = (await db.execute(
+                select(User).where(User.username == username)
+            )).scalar_one_or_none()
+            if user is None:
+                print(f"[SKIP] {username} 없음 (--seed 로 생성)")
+                continue
+
+            scope = SearchScope.for_user(user)
+            filter_sql, params = scope_filter(scope)
+            estimated = await _estimate_scope_rows(db, filter_sql, params)
+            if settings.COARSE_TO_FINE_ENABLED:
+                strategy = "문서 선별 → " + ("정확 검색" if settings.COARSE_FINE_EXACT else "HNSW")
+            else:
+                strategy = "정확 검색" if estimated <= settings.EXACT_SEARCH_MAX_ROWS else "HNSW"
+
+            latencies = []
+            for _ in range(QUERIES):
+                query_embedding = np.asarray(_random_embedding(rng), dtype=np.float32)
+                started = time.perf_counter()
+                rows = await search_by_embedding(query_embedding, db, CANDIDATE_K, scope)
+                latencies.append((time.perf_counter() - started) * 1000)
+                await db.rollback()
+
+            latencies.sort()
+            print(
+                f"{username:<12} 추정 {estimated:>7}행 [{strategy}] "
+                f"결과 {len(rows):>2}개 | p50 {statistics.median(latencies):7.2f}ms "
+                f"p95 {latencies[int(len(latencies) * 0.95) - 1]:7.2f}ms"
+            )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="BAIKAL 벡터 검색 벤치마크")
+    parser.add_argument("--seed", action="store_true", help="합성 데이터 생성")
+    parser.add_argument("--cleanup", action="store_true", help="합성 데이터 삭제 후 종료")
+    parser.add_argument("--coarse", action="store_true", help="coarse-to-fine 검색과 비교")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    await init_db()
+    if args.cleanup:
+        await cleanup()
+        return
+    if args.seed:
+        await seed(rng)
+    await run(rng, coarse=args.coarse)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+"""
+BAIKAL Private AI - 스트리밍 동시성 부하 테스트
+실행: python scripts/load_test_stream.py --url http://localhost:8000 --streams 60
+
+실행 중인 서버에 SSE 질문 스트림을 동시에 여러 개 열고, 스트림이 흐르는 동안
+다른 API(/api/chat/sessions)의 응답 시간을 측정합니다.
+스트림 수가 DB 풀 크기(pool_size + max_overflow = 30)를 넘어도 모든 스트림이 완료되고
+다른 API가 막히지 않아야 합니다.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def _login(client: httpx.AsyncClient, username: str, password: str) -> dict:
+    response = await client.post("/api/auth/login", json={"username": username, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def _stream(client: httpx.AsyncClient, headers: dict, question: str) -> tuple[bool, float, int]:
+    """질문 스트림 1개 (성공 여부, 첫 토큰까지 시간, 토큰 수)"""
+    session = await client.post("/api/chat/sessions", json={}, headers=headers)
+    session.raise_for_status()
+
+    started = time.perf_counter()
+    first_token = None
+    tokens = 0
+    ok = False
+    async with client.stream(
+        "POST", "/api/chat/ask/stream", headers=headers,
+        json={"session_id": session.json()["id"], "question": question},
+    ) as response:
+        async for line in response.aiter_lines():
+            if '"type": "token"' in line:
+                tokens += 1
+                if first_token is None:
+                    first_token = time.perf_counter() - started
+            elif '"type": "done"' in line:
+                ok = True
+            elif '"type": "error"' in line:
+                break
+    return ok, first_token or 0.0, tokens
+
+
+async def _probe(client: httpx.AsyncClient, headers: dict, stop: asyncio.Event) -> list:
+    """스트림 진행 중 다른 API 응답 시간 측정"""
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get("/api/chat/sessions", headers=headers)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.5)
+    return latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="BAIKAL 스트리밍 동시성 부하 테스트")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin1234")
+    parser.add_argument("--streams", type=int, default=60, help="동시 스트림 수")
+    parser.add_argument("--question", default="연차 휴가 규정을 알려주세요")
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=args.streams + 10)
+    async with httpx.AsyncClient(base_url=args.url, timeout=600.0, limits=limits) as client:
+        headers = await _login(client, args.username, args.password)
+
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe(client, headers, stop))
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(_stream(client, headers, args.question) for _ in range(args.streams)),
+            return_exceptions=True,
+        )
+        elapsed = time.perf_counter() - started
+        stop.set()
+        probe_latencies = await probe
+
+    succeeded = [r for r in results if not isinstance(r, Exception) and r[0]]
+    failed = len(results) - len(succeeded)
+    print(f"스트림 {args.streams}개: 성공 {len(succeeded)}개, 실패 {failed}개 ({elapsed:.1f}s)")
+    if succeeded:
+        ttft = sorted(r[1] for r in succeeded)
+        print(f"첫 토큰: p50 {statistics.median(ttft):.2f}s, 최대 {ttft[-1]:.2f}s")
+    if probe_latencies:
+        probe_latencies.sort()
+        print(
+            f"스트림 중 /api/chat/sessions: p50 {statistics.median(probe_latencies):.0f}ms, "
+            f"최대 {probe_latencies[-1]:.0f}ms ({len(probe_latencies)}회)"
+        )
+    for r in results:
+        if isinstance(r, Exception):
+            print(f"[ERROR] {r!r}")
+            break
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
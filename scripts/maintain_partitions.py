@@ -0,0 +1,63 @@
+"""
+BAIKAL Private AI - 청크 파티션 유지보수 스크립트
+실행: cd backend && python ../scripts/maintain_partitions.py [--reindex] [--vacuum] [--partition N]
+
+document_chunks 해시 파티션(CHUNK_PARTITIONS > 0)을 하나씩 VACUUM ANALYZE /
+HNSW 인덱스 REINDEX CONCURRENTLY 합니다. 작업 중인 파티션 외에는 잠금이 걸리지 않으므로
+다른 파티션으로의 문서 적재는 계속 진행됩니다.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from sqlalchemy import text  # noqa: E402
+from app.database import engine, chunk_partition_tables  # noqa: E402
+
+
+async def _embedding_indexes(conn, table: str) -> list:
+    result = await conn.execute(text("""
+        SELECT indexname FROM pg_indexes
+        WHERE tablename = :table AND indexdef ILIKE '%USING hnsw%'
+    """), {"table": table})
+    return result.scalars().all()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="BAIKAL 청크 파티션 유지보수")
+    parser.add_argument("--reindex", action="store_true", help="HNSW 인덱스 REINDEX CONCURRENTLY")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM (ANALYZE)")
+    parser.add_argument("--partition", type=int, help="지정한 파티션 번호만 처리")
+    args = parser.parse_args()
+
+    partitions = chunk_partition_tables()
+    if not partitions:
+        print("[SKIP] CHUNK_PARTITIONS=0 (파티션 미사용)")
+        return
+    if args.partition is not None:
+        if not 0 <= args.partition < len(partitions):
+            parser.error(f"--partition 은 0 ~ {len(partitions) - 1} 사이여야 합니다")
+        partitions = [partitions[args.partition]]
+    if not (args.reindex or args.vacuum):
+        args.vacuum = True
+
+    # VACUUM / REINDEX CONCURRENTLY는 트랜잭션 밖에서 실행해야 함
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for table in partitions:
+            started = time.perf_counter()
+            if args.vacuum:
+                await conn.execute(text(f"VACUUM (ANALYZE) {table}"))
+            if args.reindex:
+                for index in await _embedding_indexes(conn, table):
+                    await conn.execute(text(f"REINDEX INDEX CONCURRENTLY {index}"))
+            print(f"[OK] {table} ({time.perf_counter() - started:.1f}s)")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())